@@ -0,0 +1,265 @@
+"""Scalable versions of the bundled examples.
+
+Each case builds its nodes from the model functions in examples/<case> and
+returns the run object together with the root and leaf nodes, so that the
+harness can read the iteration counts and step times after the run.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+from pathlib import Path
+import random
+import sys
+
+import pyomo.environ as pyo
+
+from pyodsp.dec.node.dec_node import DecNodeRoot, DecNodeLeaf, DecNodeInner
+from pyodsp.dec.bd.alg_root_bm import BdAlgRootBm
+from pyodsp.dec.bd.alg_leaf_pyomo import BdAlgLeafPyomo
+from pyodsp.dec.bd.run import BdRun
+from pyodsp.dec.dd.run import DdRun
+from pyodsp.dec.sddp.run import SddpRun
+from pyodsp.dec.generator import (
+    generate_two_stage,
+    generate_block_angular,
+    generate_lattice,
+)
+from pyodsp.solver.pyomo_solver import PyomoSolver, SolverConfig
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+@dataclass
+class Instance:
+    run: Any
+    root: DecNodeRoot
+    leaves: List[DecNodeLeaf] = field(default_factory=list)
+
+
+def _use_example(name: str) -> None:
+    # the examples are scripts importing their sibling modules by name
+    sys.path.insert(0, str(EXAMPLES_DIR / name))
+
+
+def build_uc(
+    filedir: Path,
+    num_gens: int,
+    num_day: int = 1,
+    num_seg: int = 3,
+    max_iteration: int = 100,
+):
+    _use_example("uc")
+    from params import create_random
+    from dd import create_master, create_sub
+
+    num_time, demand, params = create_random(num_day, num_gens, num_seg)
+    root = create_master(num_time, num_gens, demand, params, pbm=False)
+    # the cutting plane master converges slowly on this example
+    root.alg_root.bm.max_iteration = max_iteration
+    leaves = []
+    for k in range(1, num_gens + 1):
+        leaves.append(create_sub(k, num_time, params))
+        root.add_child(k)
+    return Instance(DdRun([root, *leaves], filedir), root, leaves)
+
+
+def build_sslp(filedir: Path, num_scenarios: int, nI: int = 50, nJ: int = 10):
+    _use_example("sslp")
+    from dd import create_master, create_sub
+
+    root = create_master(nJ, num_scenarios)
+    leaves = []
+    for s in range(num_scenarios):
+        leaves.append(create_sub(s, nI, nJ, num_scenarios))
+        root.add_child(s + 1)
+    return Instance(DdRun([root, *leaves], filedir), root, leaves)
+
+
+def build_mcsp(filedir: Path, num_patterns: int, num_rolls: int = 5):
+    _use_example("mcsp")
+    from params import create_random
+    from dd import create_master, create_sub
+
+    param = create_random(num_rolls, num_patterns)
+    root = create_master(param.N, param.P, param.d)
+    leaves = []
+    for k in range(len(param.N)):
+        leaves.append(
+            create_sub(k, param.N[k], param.P, param.L[k], param.c[k], param.l)
+        )
+        root.add_child(k + 1)
+    return Instance(DdRun([root, *leaves], filedir), root, leaves)
+
+
+CROPS = ["WHEAT", "CORN", "BEETS"]
+PLANTING_COST = {"WHEAT": 150.0, "CORN": 230.0, "BEETS": 260.0}
+AVERAGE_YIELD = {"WHEAT": 2.5, "CORN": 3.0, "BEETS": 20.0}
+
+
+def _farmer_scenario(yield_factor: float) -> pyo.ConcreteModel:
+    block = pyo.ConcreteModel()
+    quota = {"WHEAT": 100000.0, "CORN": 100000.0, "BEETS": 6000.0}
+    sub_quota_price = {"WHEAT": 170.0, "CORN": 150.0, "BEETS": 36.0}
+    super_quota_price = {"WHEAT": 0.0, "CORN": 0.0, "BEETS": 10.0}
+    feed = {"WHEAT": 200.0, "CORN": 240.0, "BEETS": 0.0}
+    purchase_price = {"WHEAT": 238.0, "CORN": 210.0, "BEETS": 100000.0}
+
+    block.sub_quota_sold = pyo.Var(CROPS, domain=pyo.NonNegativeReals)
+    block.super_quota_sold = pyo.Var(CROPS, domain=pyo.NonNegativeReals)
+    block.remainder = pyo.Var(CROPS, domain=pyo.NonNegativeReals)
+    block.purchased = pyo.Var(CROPS, domain=pyo.NonNegativeReals)
+    block.acreage = pyo.Var(CROPS, domain=pyo.Reals)
+
+    def selling_rule(b, crop):
+        return (
+            b.sub_quota_sold[crop] + b.super_quota_sold[crop] + b.remainder[crop]
+            == yield_factor * AVERAGE_YIELD[crop] * b.acreage[crop]
+        )
+
+    block.selling = pyo.Constraint(CROPS, rule=selling_rule)
+    block.feed = pyo.Constraint(
+        CROPS, rule=lambda b, crop: b.remainder[crop] + b.purchased[crop] >= feed[crop]
+    )
+    block.quota = pyo.Constraint(
+        CROPS, rule=lambda b, crop: b.sub_quota_sold[crop] <= quota[crop]
+    )
+    block.objective = pyo.Objective(
+        expr=sum(
+            sub_quota_price[crop] * block.sub_quota_sold[crop]
+            + super_quota_price[crop] * block.super_quota_sold[crop]
+            - purchase_price[crop] * block.purchased[crop]
+            for crop in CROPS
+        ),
+        sense=pyo.maximize,
+    )
+    return block
+
+
+def build_farmer(filedir: Path, num_scenarios: int, seed: int = 42):
+    config = SolverConfig(solver_name="appsi_highs")
+
+    model = pyo.ConcreteModel()
+    model.acreage = pyo.Var(CROPS, domain=pyo.NonNegativeReals)
+    model.land = pyo.Constraint(expr=sum(model.acreage[crop] for crop in CROPS) <= 500)
+    model.objective = pyo.Objective(
+        expr=-sum(PLANTING_COST[crop] * model.acreage[crop] for crop in CROPS),
+        sense=pyo.maximize,
+    )
+    root_solver = PyomoSolver(model, config, [model.acreage[crop] for crop in CROPS])
+    root = DecNodeRoot(0, BdAlgRootBm(root_solver))
+
+    rng = random.Random(seed)
+    leaves = []
+    for s in range(1, num_scenarios + 1):
+        block = _farmer_scenario(rng.uniform(0.8, 1.2))
+        solver = PyomoSolver(block, config, [block.acreage[crop] for crop in CROPS])
+        leaf = DecNodeLeaf(s, BdAlgLeafPyomo(solver))
+        leaf.set_bound(1000000.0)
+        root.add_child(s, multiplier=1 / num_scenarios)
+        leaves.append(leaf)
+    return Instance(BdRun([root, *leaves], filedir), root, leaves)
+
+
+def build_aircon(filedir: Path, num_stages: int, demands: Tuple[float, ...] = (1, 3)):
+    _use_example("aircon")
+    from aircon import first_stage, mid_stage, last_stage
+
+    config = SolverConfig(solver_name="appsi_highs")
+    multiplier = 1 / len(demands)
+
+    model = pyo.ConcreteModel()
+    first_stage(model, demands[0])
+    root_solver = PyomoSolver(model, config, [model.next_inventory])
+    root = DecNodeRoot(0, BdAlgRootBm(root_solver))
+    nodes: List[List[Any]] = [[root]]
+    parents = [root]
+    idx = 1
+    for stage in range(1, num_stages):
+        is_last = stage == num_stages - 1
+        stage_nodes = []
+        for demand in demands:
+            model = pyo.ConcreteModel()
+            model.prev_inventory = pyo.Var()
+            if is_last:
+                last_stage(model, model.prev_inventory, demand)
+            else:
+                mid_stage(model, model.prev_inventory, demand)
+            model.obj = pyo.Objective(expr=model.obj_expr, sense=pyo.minimize)
+            alg_leaf = BdAlgLeafPyomo(
+                PyomoSolver(model, config, [model.prev_inventory])
+            )
+            if is_last:
+                node = DecNodeLeaf(idx, alg_leaf)
+            else:
+                solver_root = PyomoSolver(model, config, [model.next_inventory])
+                alg_root = BdAlgRootBm(solver_root, max_iteration=1)
+                node = DecNodeInner(idx, alg_root, alg_leaf, log_level=0)
+            node.set_bound(0)
+            for parent in parents:
+                parent.add_child(idx, multiplier=multiplier)
+            stage_nodes.append(node)
+            idx += 1
+        nodes.append(stage_nodes)
+        parents = stage_nodes
+    return Instance(SddpRun(nodes, filedir), root, nodes[-1])
+
+
+def build_two_stage(filedir: Path, num_scenarios: int, **kwargs):
+    nodes = generate_two_stage(num_scenarios, **kwargs)
+    return Instance(BdRun(nodes, filedir), nodes[0], nodes[1:])
+
+
+def build_block_angular(filedir: Path, num_blocks: int, **kwargs):
+    nodes = generate_block_angular(num_blocks, **kwargs)
+    return Instance(DdRun(nodes, filedir), nodes[0], nodes[1:])
+
+
+def build_lattice(filedir: Path, num_stages: int, num_nodes: int, **kwargs):
+    nodes = generate_lattice(num_stages, num_nodes, **kwargs)
+    return Instance(SddpRun(nodes, filedir), nodes[0][0], nodes[-1])
+
+
+CASES: Dict[str, Callable[..., Instance]] = {
+    "uc": build_uc,
+    "sslp": build_sslp,
+    "mcsp": build_mcsp,
+    "farmer": build_farmer,
+    "aircon": build_aircon,
+    "two_stage": build_two_stage,
+    "block_angular": build_block_angular,
+    "lattice": build_lattice,
+}
+
+# scaled parameter of each case, by scale
+SCALES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "small": {
+        "uc": {"num_gens": 3, "max_iteration": 20},
+        "sslp": {"num_scenarios": 3, "nI": 10},
+        "mcsp": {"num_patterns": 4},
+        "farmer": {"num_scenarios": 3},
+        "aircon": {"num_stages": 3},
+        "two_stage": {"num_scenarios": 10, "infeasibility_rate": 0.2},
+        "block_angular": {"num_blocks": 10},
+        "lattice": {"num_stages": 3, "num_nodes": 2},
+    },
+    "medium": {
+        "uc": {"num_gens": 10},
+        "sslp": {"num_scenarios": 5},
+        "mcsp": {"num_patterns": 8},
+        "farmer": {"num_scenarios": 30},
+        "aircon": {"num_stages": 5},
+        "two_stage": {"num_scenarios": 1000, "infeasibility_rate": 0.2},
+        "block_angular": {"num_blocks": 1000},
+        "lattice": {"num_stages": 5, "num_nodes": 10},
+    },
+    "large": {
+        "uc": {"num_gens": 20},
+        "sslp": {"num_scenarios": 20},
+        "mcsp": {"num_patterns": 12},
+        "farmer": {"num_scenarios": 300},
+        "aircon": {"num_stages": 8},
+        "two_stage": {"num_scenarios": 10000, "infeasibility_rate": 0.2},
+        "block_angular": {"num_blocks": 10000},
+        "lattice": {"num_stages": 10, "num_nodes": 20},
+    },
+}
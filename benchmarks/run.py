@@ -0,0 +1,160 @@
+"""Benchmark harness over the bundled examples.
+
+Every case runs in its own process, so that the peak RSS is that of the case
+alone. The results are written as JSON and compared against a stored baseline:
+
+    python benchmarks/run.py --scales small medium
+    python benchmarks/run.py --scales small --update-baseline
+"""
+
+from typing import Any, Dict, List
+from pathlib import Path
+import argparse
+import datetime
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+RESULT_PREFIX = "BENCHMARK_RESULT "
+
+# metrics compared against the baseline, relative increases above the tolerance
+# are reported as regressions
+COMPARED_METRICS = ["wall_time", "peak_rss_mb", "iterations"]
+
+
+def run_case(case: str, scale: str) -> Dict[str, Any]:
+    sys.path.insert(0, str(BENCHMARK_DIR))
+    from cases import CASES, SCALES
+    from pyodsp.dec.graph.sampling import relative_gap
+
+    params = SCALES[scale][case]
+    with tempfile.TemporaryDirectory() as filedir:
+        start = time.time()
+        instance = CASES[case](Path(filedir), **params)
+        build_time = time.time() - start
+
+        start = time.time()
+        instance.run.run()
+        instance.run.graph.results.wait()
+        wall_time = time.time() - start
+
+    bm = instance.root.alg_root.bm
+    gap = None
+    for bound, value in zip(reversed(bm.obj_bound), reversed(bm.obj_val)):
+        if bound is not None and value is not None:
+            gap = relative_gap(value, bound)
+            break
+
+    return {
+        "case": case,
+        "scale": scale,
+        "params": params,
+        "build_time": build_time,
+        "wall_time": wall_time,
+        "iterations": len(bm.obj_bound),
+        "master_time": sum(instance.root.alg_root.step_time),
+        "leaf_time": sum(sum(leaf.alg_leaf.step_time) for leaf in instance.leaves),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "final_gap": gap,
+    }
+
+
+def run_case_in_subprocess(case: str, scale: str) -> Dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, __file__, "--worker", case, scale],
+        capture_output=True,
+        text=True,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX) :])
+    raise RuntimeError(f"Benchmark {case} ({scale}) failed:\n{result.stderr}")
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """Returns a description of every metric that regressed beyond the tolerance."""
+    reference = {(entry["case"], entry["scale"]): entry for entry in baseline}
+    regressions = []
+    for result in results:
+        entry = reference.get((result["case"], result["scale"]))
+        if entry is None or entry["params"] != result["params"]:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = entry[metric], result[metric]
+            if old > 0 and new > old * (1 + tolerance):
+                regressions.append(
+                    f"{result['case']} ({result['scale']}): {metric} "
+                    f"{old:.4g} -> {new:.4g}"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="pyodsp benchmarks")
+    parser.add_argument("--cases", nargs="+", default=None)
+    parser.add_argument("--scales", nargs="+", default=["small"])
+    parser.add_argument(
+        "--output", type=Path, default=BENCHMARK_DIR / "output" / "results.json"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, default=BENCHMARK_DIR / "baseline.json"
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--worker", nargs=2, metavar=("CASE", "SCALE"))
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(RESULT_PREFIX + json.dumps(run_case(*args.worker)))
+        return 0
+
+    sys.path.insert(0, str(BENCHMARK_DIR))
+    from cases import CASES
+
+    cases = args.cases if args.cases is not None else list(CASES.keys())
+    results = []
+    for scale in args.scales:
+        for case in cases:
+            result = run_case_in_subprocess(case, scale)
+            print(
+                f"{case} ({scale}): {result['wall_time']:.2f}s, "
+                f"{result['iterations']} iterations, "
+                f"{result['peak_rss_mb']:.0f} MB"
+            )
+            results.append(result)
+
+    report = {
+        "created": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        return 0
+
+    if not args.baseline.exists():
+        print(f"Baseline {args.baseline} not found, nothing to compare.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
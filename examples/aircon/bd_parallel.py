@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from bd import create_root, create_inner, create_leaf
+from utils import get_args, assert_approximately_equal
+
+from pyodsp.dec.bd.run import BdRun
+
+"""
+The three-level tree of bd.py with the final leaf fixings solved by two workers,
+compared with a serial run
+"""
+
+
+def create_nodes(solver):
+    demand = [1, 1, 3, 1, 3, 1, 3]
+    nodes = []
+    for idx in range(7):
+        if idx == 0:
+            node = create_root(idx, demand[idx], solver, True)
+        elif idx <= 2:
+            node = create_inner(idx, demand[idx], solver, True)
+        else:
+            node = create_leaf(idx, demand[idx], solver)
+        nodes.append(node)
+    return nodes
+
+
+def main():
+    args = get_args()
+
+    serial_nodes = create_nodes(args.solver)
+    BdRun(serial_nodes, Path("output/aircon/bd_serial")).run()
+
+    # the leaves of both inner nodes are fixed by the same workers
+    nodes = create_nodes(args.solver)
+    BdRun(nodes, Path("output/aircon/bd_parallel"), num_workers=2).run()
+
+    assert_approximately_equal(nodes[0].alg_root.bm.obj_bound[-1], 6.25)
+    for serial_leaf, leaf in zip(serial_nodes[3:], nodes[3:]):
+        serial_model = serial_leaf.alg_leaf.solver.model
+        model = leaf.alg_leaf.solver.model
+        assert_approximately_equal(
+            model.prev_inventory.value, serial_model.prev_inventory.value
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from sddp import create_root, create_inner, create_leaf
+from utils import get_args, assert_approximately_equal
+
+from pyodsp.dec.sddp.run import SddpRun
+
+"""
+The lattice of sddp.py solved by two worker processes, compared with a serial run
+"""
+
+
+def create_nodes(solver):
+    demand = [[1], [1, 3], [1, 3]]
+    return [
+        [create_root(0, demand[0][0], solver, True)],
+        [
+            create_inner(1, demand[1][0], solver, True),
+            create_inner(2, demand[1][1], solver, True),
+        ],
+        [create_leaf(3, demand[2][0], solver), create_leaf(4, demand[2][1], solver)],
+    ]
+
+
+def main():
+    args = get_args()
+
+    serial_nodes = create_nodes(args.solver)
+    SddpRun(serial_nodes, Path("output/aircon/sddp_serial")).run()
+
+    nodes = create_nodes(args.solver)
+    SddpRun(nodes, Path("output/aircon/sddp_parallel"), num_workers=2).run()
+
+    serial_bound = serial_nodes[0][0].alg_root.bm.obj_bound
+    bound = nodes[0][0].alg_root.bm.obj_bound
+    assert len(bound) == len(serial_bound)
+    assert_approximately_equal(bound[-1], 6.25)
+
+    # the leaf solves of the workers are reported back to the parent
+    for serial_stage, stage in zip(serial_nodes[1:], nodes[1:]):
+        for serial_node, node in zip(serial_stage, stage):
+            serial_cache = serial_node.alg_leaf.cache
+            cache = node.alg_leaf.cache
+            assert cache.hits + cache.misses >= serial_cache.hits + serial_cache.misses
+            assert len(node.alg_leaf.step_time) >= len(serial_node.alg_leaf.step_time)
+
+
+if __name__ == "__main__":
+    main()
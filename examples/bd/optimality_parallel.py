@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from pyodsp.dec.bd.run import BdRun
+
+from optimality import create_root_node, create_leaf_node, p
+from utils import get_args, assert_approximately_equal
+
+"""
+The problem of optimality.py with the final leaf fixings solved by two workers
+"""
+
+
+def create_nodes(solver):
+    root_node = create_root_node(solver)
+    leaf_nodes = [create_leaf_node(i, solver) for i in (1, 2)]
+    for i in (1, 2):
+        root_node.add_child(i, multiplier=p[i])
+    root_node.set_groups([[1, 2]])
+    return [root_node, *leaf_nodes]
+
+
+def main():
+    args = get_args()
+
+    serial_nodes = create_nodes(args.solver)
+    BdRun(serial_nodes, Path("output/bd/optimality_serial")).run()
+
+    nodes = create_nodes(args.solver)
+    BdRun(nodes, Path("output/bd/optimality_parallel"), num_workers=2).run()
+
+    assert_approximately_equal(nodes[0].alg_root.bm.obj_bound[-1], -855.83333333333)
+    # the final solutions of the workers are restored in the parent
+    for serial_leaf, leaf in zip(serial_nodes[1:], nodes[1:]):
+        serial_model = serial_leaf.alg_leaf.solver.model
+        model = leaf.alg_leaf.solver.model
+        for var in ("y1", "y2"):
+            assert_approximately_equal(
+                getattr(model, var).value, getattr(serial_model, var).value
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from optimality import create_root_node, create_leaf_node, p
+from pyodsp.dec.bd.run import BdRun
+
+from utils import get_args, assert_approximately_equal
+
+
+def create_nodes(solver: str):
+    root_node = create_root_node(solver)
+    leaf_node_1 = create_leaf_node(1, solver)
+    leaf_node_2 = create_leaf_node(2, solver)
+
+    root_node.add_child(1, multiplier=p[1])
+    root_node.add_child(2, multiplier=p[2])
+
+    root_node.set_groups([[1, 2]])
+    return root_node, leaf_node_1, leaf_node_2
+
+
+def main():
+    args = get_args()
+    filedir = Path("output/bd/optimality_resume")
+
+    # uninterrupted run for reference
+    full_nodes = create_nodes(args.solver)
+    BdRun(list(full_nodes), filedir / "full").run()
+    full_bm = full_nodes[0].alg_root.bm
+
+    # run stopped after the first steps, with a checkpoint at every step
+    nodes = create_nodes(args.solver)
+    nodes[0].alg_root.bm.max_iteration = 2
+    bd_run = BdRun(list(nodes), filedir, checkpoint_frequency=1)
+    bd_run.run()
+    assert nodes[0].alg_root.bm.iteration < full_bm.iteration
+
+    # continue from the checkpoint of the stopped run with freshly built nodes
+    nodes = create_nodes(args.solver)
+    bd_run = BdRun(list(nodes), filedir / "resumed")
+    bd_run.resume(filedir / "checkpoint.pkl")
+
+    bm = nodes[0].alg_root.bm
+    assert bm.iteration == full_bm.iteration
+    assert_approximately_equal(bm.obj_bound[-1], full_bm.obj_bound[-1])
+    assert_approximately_equal(bm.obj_bound[-1], -855.83333333333)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,14 +12,14 @@ from pyodsp.dec.dd.run import DdRun
 from utils import get_args, assert_approximately_equal
 
 
-def create_master(solver="appsi_highs", pbm=False) -> DecNodeRoot:
+def create_master(solver="appsi_highs", pbm=False, rhs=17.0) -> DecNodeRoot:
     block = pyo.ConcreteModel()
     block.x1 = pyo.Var(within=pyo.Reals)
     block.x2 = pyo.Var(within=pyo.Reals)
     block.x3 = pyo.Var(within=pyo.Reals)
     vars_dn = {1: [block.x1], 2: [block.x2], 3: [block.x3]}
 
-    block.c1 = pyo.Constraint(expr=3 * block.x1 + 2 * block.x2 + 4 * block.x3 == 17)
+    block.c1 = pyo.Constraint(expr=3 * block.x1 + 2 * block.x2 + 4 * block.x3 == rhs)
 
     if pbm:
         alg_config = SolverConfig(solver_name="ipopt")
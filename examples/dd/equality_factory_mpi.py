@@ -0,0 +1,38 @@
+from pathlib import Path
+from mpi4py import MPI
+
+from equality import create_master, create_sub
+from pyodsp.dec.dd.run_mpi import DdRunMpi
+from pyodsp.dec.node.factory import NodeFactory
+
+from utils import get_args, assert_approximately_equal
+
+"""
+mpiexec -n 2 python equality_factory_mpi.py
+"""
+
+
+def main():
+    args = get_args()
+
+    leaf_ids = [1, 2, 3]
+
+    def create_root():
+        node = create_master(args.solver)
+        for idx in leaf_ids:
+            node.add_child(idx)
+        return node
+
+    factory = NodeFactory(
+        create_root, lambda idx: create_sub(idx, args.solver), leaf_ids
+    )
+    dd_run = DdRunMpi.from_factory(factory, Path("output/dd/equality_factory_mpi"))
+    dd_run.run()
+
+    if MPI.COMM_WORLD.Get_rank() == 0:
+        root = dd_run.graph.root
+        assert_approximately_equal(root.alg_root.bm.obj_bound[-1], -21.5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from pathlib import Path
+import shutil
+
+from equality import create_master, create_sub
+from pyodsp.alg.bm.cut_library import CutLibrary
+from pyodsp.dec.dd.run import DdRun
+
+from utils import get_args, assert_approximately_equal
+
+
+def run(solver: str, rhs: float, library: CutLibrary | None, filedir: Path):
+    master = create_master(solver, rhs=rhs)
+    subs = [create_sub(i, solver) for i in (1, 2, 3)]
+    for i in (1, 2, 3):
+        master.add_child(i)
+    master.set_cut_library(library)
+
+    dd_run = DdRun([master, *subs], filedir)
+    dd_run.run()
+    return master.alg_root.bm
+
+
+def main():
+    args = get_args()
+    filedir = Path("output/dd/equality_library")
+    shutil.rmtree(filedir / "library", ignore_errors=True)
+    library = CutLibrary(filedir / "library")
+
+    # fill the library
+    bm = run(args.solver, 17.0, library, filedir / "first")
+    assert_approximately_equal(bm.obj_bound[-1], -21.5)
+
+    # the subproblems are unchanged, only the right-hand side of the master
+    cold = run(args.solver, 16.0, None, filedir / "cold")
+    warm = run(args.solver, 16.0, library, filedir / "warm")
+    assert_approximately_equal(warm.obj_bound[-1], cold.obj_bound[-1])
+    assert warm.iteration <= cold.iteration
+
+
+if __name__ == "__main__":
+    main()
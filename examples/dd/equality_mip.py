@@ -13,7 +13,9 @@ from pyodsp.dec.dd.mip_heuristic_root import MipHeuristicRoot
 from utils import get_args, assert_approximately_equal
 
 
-def create_master(solver="appsi_highs", pbm=False) -> DecNodeRoot:
+def create_master(
+    solver="appsi_highs", pbm=False, heuristic=None, heuristic_frequency=0
+) -> DecNodeRoot:
     block = pyo.ConcreteModel()
     block.x1 = pyo.Var(within=pyo.NonNegativeIntegers)
     block.x2 = pyo.Var(within=pyo.NonNegativeIntegers)
@@ -22,16 +24,29 @@ def create_master(solver="appsi_highs", pbm=False) -> DecNodeRoot:
 
     block.c1 = pyo.Constraint(expr=3 * block.x1 + 2 * block.x2 + 4 * block.x3 == 15)
 
-    final_config = SolverConfig(solver_name=solver)
-    heuristic = MipHeuristicRoot(final_config)
+    if heuristic is None:
+        heuristic = MipHeuristicRoot(SolverConfig(solver_name=solver))
     if pbm:
         alg_config = SolverConfig(solver_name="ipopt")
         root_alg = DdAlgRootBm(
-            block, True, alg_config, vars_dn, heuristic, mode="proximal"
+            block,
+            True,
+            alg_config,
+            vars_dn,
+            heuristic,
+            mode="proximal",
+            heuristic_frequency=heuristic_frequency,
         )
     else:
         alg_config = SolverConfig(solver_name=solver)
-        root_alg = DdAlgRootBm(block, True, alg_config, vars_dn, heuristic)
+        root_alg = DdAlgRootBm(
+            block,
+            True,
+            alg_config,
+            vars_dn,
+            heuristic,
+            heuristic_frequency=heuristic_frequency,
+        )
     root_node = DecNodeRoot(0, root_alg)
     return root_node
 
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from equality_mip import create_master, create_sub
+from pyodsp.dec.dd.run import DdRun
+from pyodsp.dec.dd.mip_heuristic_root import MipHeuristicRoot
+from pyodsp.solver.pyomo_solver import SolverConfig
+
+from utils import get_args, assert_approximately_equal
+
+"""
+The heuristic of equality_mip.py solved after every root step, each time with
+the columns found since the previous solve
+"""
+
+
+class CountingHeuristicRoot(MipHeuristicRoot):
+    def __init__(self, solver_config: SolverConfig):
+        super().__init__(solver_config)
+        self.num_columns = []
+
+    def run_init(self):
+        self.num_columns.append(sum(pool.num_columns for pool in self.pools))
+        return super().run_init()
+
+
+def main():
+    args = get_args()
+
+    heuristic = CountingHeuristicRoot(SolverConfig(solver_name=args.solver))
+    master = create_master(args.solver, heuristic=heuristic, heuristic_frequency=1)
+    subs = [create_sub(i, args.solver) for i in [1, 2, 3]]
+    for sub in subs:
+        master.add_child(sub.get_idx())
+
+    DdRun([master] + subs, Path("output/dd/equality_mip_incremental")).run()
+
+    # the master is built once and solved again as columns arrive
+    assert len(heuristic.num_columns) > 1
+    assert heuristic.num_columns == sorted(heuristic.num_columns)
+    for sub, expected in zip(subs, [1.0, 2.0, 2.0]):
+        assert_approximately_equal(sub.alg_leaf.solver.get_solution()[0], expected)
+
+
+if __name__ == "__main__":
+    main()
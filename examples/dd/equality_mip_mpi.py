@@ -30,7 +30,8 @@ def main():
     if rank == 3:
         node = create_sub(3, args.solver)
 
-    dd_run = DdRunMpi([node], Path("output/dd/equality_mip_mpi"))
+    # the ranks are not forked, their leaves are finalized serially
+    dd_run = DdRunMpi([node], Path("output/dd/equality_mip_mpi"), num_workers=2)
     dd_run.run()
 
     if rank == 0:
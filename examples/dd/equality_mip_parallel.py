@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from equality_mip import create_master, create_sub
+from pyodsp.dec.dd.run import DdRun
+
+from utils import get_args, assert_approximately_equal
+
+"""
+The leaves of equality_mip.py fixed to the heuristic solution by two worker
+processes, compared with a serial run
+"""
+
+
+def create_nodes(solver):
+    master = create_master(solver)
+    subs = [create_sub(i, solver) for i in [1, 2, 3]]
+    for sub in subs:
+        master.add_child(sub.get_idx())
+    return master, subs
+
+
+def main():
+    args = get_args()
+
+    serial_master, serial_subs = create_nodes(args.solver)
+    DdRun([serial_master] + serial_subs, Path("output/dd/equality_mip_serial")).run()
+
+    master, subs = create_nodes(args.solver)
+    DdRun([master] + subs, Path("output/dd/equality_mip_parallel"), num_workers=2).run()
+
+    assert_approximately_equal(master.alg_root.bm.obj_bound[-1], -19.666666666)
+    # the final states of the workers are restored on the leaves of the parent
+    for serial_sub, sub, expected in zip(serial_subs, subs, [1.0, 2.0, 2.0]):
+        solution = sub.alg_leaf.solver.get_solution()[0]
+        assert_approximately_equal(solution, expected)
+        assert_approximately_equal(
+            solution, serial_sub.alg_leaf.solver.get_solution()[0]
+        )
+
+
+if __name__ == "__main__":
+    main()
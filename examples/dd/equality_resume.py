@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from equality import create_master, create_sub
+from pyodsp.dec.dd.run import DdRun
+
+from utils import get_args, assert_approximately_equal
+
+
+def create_nodes(solver: str):
+    master = create_master(solver)
+    sub_1 = create_sub(1, solver)
+    sub_2 = create_sub(2, solver)
+    sub_3 = create_sub(3, solver)
+
+    master.add_child(1)
+    master.add_child(2)
+    master.add_child(3)
+    return master, sub_1, sub_2, sub_3
+
+
+def main():
+    args = get_args()
+    filedir = Path("output/dd/equality_resume")
+
+    # uninterrupted run for reference
+    full_nodes = create_nodes(args.solver)
+    DdRun(list(full_nodes), filedir / "full").run()
+    full_bm = full_nodes[0].alg_root.bm
+
+    # run stopped after the first steps, with a checkpoint at every step
+    nodes = create_nodes(args.solver)
+    nodes[0].alg_root.bm.max_iteration = 2
+    dd_run = DdRun(list(nodes), filedir, checkpoint_frequency=1)
+    dd_run.run()
+    assert nodes[0].alg_root.bm.iteration < full_bm.iteration
+
+    # continue from the checkpoint of the stopped run with freshly built nodes
+    nodes = create_nodes(args.solver)
+    dd_run = DdRun(list(nodes), filedir / "resumed")
+    dd_run.resume(filedir / "checkpoint.pkl")
+
+    bm = nodes[0].alg_root.bm
+    assert bm.iteration == full_bm.iteration
+    assert_approximately_equal(bm.obj_bound[-1], full_bm.obj_bound[-1])
+    assert_approximately_equal(bm.obj_bound[-1], -21.5)
+
+
+if __name__ == "__main__":
+    main()
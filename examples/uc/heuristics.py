@@ -15,6 +15,7 @@ from pyomo.environ import (
     value,
 )
 from pyodsp.solver.pyomo_solver import PyomoSolver, SolverConfig
+from pyodsp.alg.bm.cuts import CutList
 from pyodsp.alg.bm.cuts_manager import CutInfo
 from pyodsp.dec.dd.message import DdFinalDnMessage, DdFinalUpMessage
 from pyodsp.dec.dd.mip_heuristic_root import (
@@ -41,6 +42,9 @@ class UcHeuristicRoot(IMipHeuristicRoot):
             model._dd_obj = Objective(expr=0.0, sense=maximize)
         return PyomoSolver(model, solver_config, [])
 
+    def update(self, cuts_list: List[CutList]) -> None:
+        pass
+
     def build(self, **kwargs) -> None:
         self.groups: List[List[int]] = kwargs["groups"]
         coupling_model: ConcreteModel = kwargs["coupling_model"]
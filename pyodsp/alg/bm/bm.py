@@ -1,21 +1,19 @@
-from typing import List, Tuple
-from pathlib import Path
+from typing import Any, Dict, List, Tuple
 import time
 import logging
 
-import pandas as pd
-
 from pyomo.environ import Var, ScalarVar, Reals, RangeSet
 
 from pyodsp.solver.pyomo_solver import PyomoSolver
 from pyodsp.solver.pyomo_utils import add_terms_to_objective
 
 from .cuts import CutList
-from .cuts_manager import CutInfo
+from .cuts_manager import CutInfo, SharedCutStore
 from .logger import BmLogger
 from .cp import CuttingPlaneMethod
 from ..params import BM_ABS_TOLERANCE, BM_REL_TOLERANCE, BM_PURGE_FREQ, BM_TIME_LIMIT
 from ..const import *
+from pyodsp.results import NodeResults
 
 
 class BundleMethod:
@@ -91,6 +89,15 @@ class BundleMethod:
     def is_minimize(self) -> bool:
         return self.cpm.is_minimize()
 
+    def set_cut_store(self, store: SharedCutStore | None) -> None:
+        self.cpm.set_cut_store(store)
+
+    def pop_cut_changes(self) -> Dict[str, Any]:
+        return self.cpm.pop_cut_changes()
+
+    def apply_cut_changes(self, changes: Dict[str, Any]) -> None:
+        self.cpm.apply_cut_changes(changes)
+
     def get_cuts(self) -> List[List[CutInfo]]:
         return self.cpm.get_cuts()
 
@@ -124,9 +131,15 @@ class BundleMethod:
         else:
             ub = f"{ub:.4f}"
         self.logger.log_info(
-            f"Iteration: {self.iteration}\tLB: {lb}\t UB: {ub}\t NumCuts: {numcuts}\t Elapsed: {elapsed:.2f}"
+            "Iteration: %s\tLB: %s\t UB: %s\t NumCuts: %s\t Elapsed: %.2f",
+            self.iteration,
+            lb,
+            ub,
+            numcuts,
+            elapsed,
         )
-        self.logger.log_debug(f"\tsolution: {self.cpm.get_current_solution()}")
+        if self.logger.is_debug_enabled():
+            self.logger.log_debug("\tsolution: %s", self.cpm.get_current_solution())
 
     def _termination_check(self) -> bool:
         if self.iteration >= self.max_iteration:
@@ -162,11 +175,30 @@ class BundleMethod:
 
         return False
 
-    def save(self, dir: Path) -> None:
-        path = dir / "bm.csv"
-        df = pd.DataFrame({"obj_bound": self.obj_bound, "obj_val": self.obj_val})
-        df.to_csv(path)
-        self.cpm.save(dir)
+    def save(self, results: NodeResults) -> None:
+        results.add(
+            "bundle",
+            {
+                "iteration": list(range(len(self.obj_bound))),
+                "obj_bound": self.obj_bound,
+                "obj_val": self.obj_val,
+            },
+        )
+        self.cpm.save(results)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "iteration": self.iteration,
+            "obj_bound": list(self.obj_bound),
+            "obj_val": list(self.obj_val),
+            "cpm": self.cpm.get_state(),
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.reset_iteration(state["iteration"])
+        self.obj_bound = list(state["obj_bound"])
+        self.obj_val = list(state["obj_val"])
+        self.cpm.set_state(state["cpm"])
 
     def add_cuts(self, cuts_list: List[CutList]) -> Tuple[bool, bool, float | None]:
         return self.cpm.add_cuts(cuts_list)
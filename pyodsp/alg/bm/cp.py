@@ -1,12 +1,14 @@
-from pathlib import Path
+from typing import Any, Dict
 
 from pyomo.environ import ScalarVar, Constraint
 
 from pyodsp.solver.pyomo_solver import PyomoSolver
-from .cuts_manager import CutsManager, CutInfo
-from .cuts import CutList, OptimalityCut, FeasibilityCut
+from pyodsp.trace import span
+from .cuts_manager import CutsManager, CutInfo, SharedCutStore
+from .cuts import Cut, CutList, OptimalityCut, FeasibilityCut
 
 from ..params import BM_ABS_TOLERANCE
+from pyodsp.results import NodeResults
 
 
 class CuttingPlaneMethod:
@@ -14,6 +16,10 @@ class CuttingPlaneMethod:
         self.solver = solver
         self.cuts_manager = CutsManager()
         self.current_solution: list[float] = []
+        # cuts added and removed since the last pop_cut_changes, None until then
+        self.cut_changes: list[tuple] | None = None
+        # a replica follows the cut changes of the original and never purges
+        self.is_replica = False
 
     def is_minimize(self) -> bool:
         return self.solver.is_minimize()
@@ -43,11 +49,15 @@ class CuttingPlaneMethod:
         self.num_cuts = num_cuts
         self.cuts_manager.build(num_cuts)
 
+    def set_cut_store(self, store: SharedCutStore | None) -> None:
+        self.cuts_manager.set_shared_store(store)
+
     def is_infeasible(self):
         return self.solver.is_infeasible()
 
     def solve(self) -> None:
-        self.solver.solve()
+        with span("master_solve"):
+            self.solver.solve()
         self.current_solution = self.solver.get_solution()
 
     def get_current_solution(self) -> list[float]:
@@ -72,26 +82,25 @@ class CuttingPlaneMethod:
         found_cuts = [False for _ in range(self.num_cuts)]
         feasible = True
         obj_val = self.get_original_objective_value()
-        for idx, cuts in enumerate(cuts_list):
-            for cut in cuts:
-                found_cut = False
-                if isinstance(cut, OptimalityCut):
-                    found_cut = self._add_optimality_cut(idx, cut)
-                    if obj_val is not None:
-                        obj_val += cut.objective_value
-                elif isinstance(cut, FeasibilityCut):
-                    found_cut = self._add_feasibility_cut(idx, cut)
-                    feasible = False
-                found_cuts[idx] = found_cut or found_cuts[idx]
+        with span("add_cuts"):
+            for idx, cuts in enumerate(cuts_list):
+                for cut in cuts:
+                    found_cut = False
+                    if isinstance(cut, OptimalityCut):
+                        found_cut = self._add_optimality_cut(idx, cut)
+                        if obj_val is not None:
+                            obj_val += cut.objective_value
+                    elif isinstance(cut, FeasibilityCut):
+                        found_cut = self._add_feasibility_cut(idx, cut)
+                        feasible = False
+                    found_cuts[idx] = found_cut or found_cuts[idx]
 
         optimal = not any(found_cuts)
         return optimal, feasible, obj_val
 
     def _add_optimality_cut(self, idx: int, cut: OptimalityCut) -> bool:
-        theta = self.solver.model._theta[idx]
-        theta_val = theta.value
+        theta_val = self.solver.model._theta[idx].value
         cut_num = self.cuts_manager.get_num_optimality(idx)
-        vars = self.get_vars()
 
         if self.solver.is_minimize():
             # Minimization
@@ -101,11 +110,6 @@ class CuttingPlaneMethod:
             ):
                 # No need to add the cut
                 return False
-
-            constraint = Constraint(
-                expr=sum(coeff * vars[j] for j, coeff in cut.coeffs.items()) + theta
-                >= cut.rhs
-            )
         else:
             # Maximization
             if (
@@ -115,46 +119,124 @@ class CuttingPlaneMethod:
                 # No need to add the cut
                 return False
 
-            constraint = Constraint(
-                expr=sum(coeff * vars[j] for j, coeff in cut.coeffs.items()) + theta
-                <= cut.rhs
-            )
-
+        constraint = self._create_constraint(idx, cut)
         self.solver.model.add_component(f"_optimality_cut_{idx}_{cut_num}", constraint)
+        self.solver.bump_revision()
 
         self.cuts_manager.append_cut(
             CutInfo(constraint, cut, idx, self.current_solution, 0)
         )
+        self._record_cut(idx, cut, constraint)
 
         return True
 
     def _add_feasibility_cut(self, idx: int, cut: FeasibilityCut) -> bool:
         cut_num = self.cuts_manager.get_num_feasibility(idx)
-        vars = self.get_vars()
-
-        if self.solver.is_minimize():
-            # Minimization
-            constraint = Constraint(
-                expr=sum(coeff * vars[j] for j, coeff in cut.coeffs.items()) >= cut.rhs
-            )
-        else:
-            # Maximization
-            constraint = Constraint(
-                expr=sum(coeff * vars[j] for j, coeff in cut.coeffs.items()) <= cut.rhs
-            )
+        constraint = self._create_constraint(idx, cut)
         self.solver.model.add_component(f"_feasibility_cut_{idx}_{cut_num}", constraint)
+        self.solver.bump_revision()
 
         self.cuts_manager.append_cut(
             CutInfo(constraint, cut, idx, self.current_solution, 0)
         )
+        self._record_cut(idx, cut, constraint)
 
         return True
 
+    def _create_constraint(self, idx: int, cut: Cut) -> Constraint:
+        vars = self.get_vars()
+        expr = sum(
+            value * vars[j]
+            for j, value in zip(cut.indices.tolist(), cut.values.tolist())
+        )
+        if isinstance(cut, OptimalityCut):
+            expr = expr + self.solver.model._theta[idx]
+        if self.solver.is_minimize():
+            # Minimization
+            return Constraint(expr=expr >= cut.rhs)
+        # Maximization
+        return Constraint(expr=expr <= cut.rhs)
+
+    def get_state(self) -> Dict[str, Any]:
+        """Active cuts with their names, trial points and ages, and the last
+        solution of the master problem."""
+        cuts = [
+            [
+                (info.constraint.name, info.cut, info.trial_point, info.age)
+                for info in infos
+            ]
+            for infos in self.get_cuts()
+        ]
+        return {
+            "cuts": cuts,
+            "manager": self.cuts_manager.get_state(),
+            "current_solution": self.current_solution,
+            "solver": self.solver.get_state(),
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Adds the cuts of a checkpoint back to the freshly built model."""
+        self.cuts_manager.set_state(state["manager"])
+        for idx, cuts in enumerate(state["cuts"]):
+            for name, cut, trial_point, age in cuts:
+                constraint = self._create_constraint(idx, cut)
+                self.solver.model.add_component(name, constraint)
+                self.cuts_manager.restore_cut(
+                    CutInfo(constraint, cut, idx, trial_point, age)
+                )
+        self.current_solution = state["current_solution"]
+        self.solver.set_state(state["solver"])
+        self.solver.bump_revision()
+
     def increment_cuts(self) -> None:
-        self.cuts_manager.increment()
+        if len(self.current_solution) == 0:
+            # the master is not solved yet, e.g. after preloading library cuts
+            return
+        with span("age_cuts"):
+            self.cuts_manager.increment()
 
     def purge_cuts(self) -> None:
-        self.cuts_manager.purge(self.solver.model)
+        if self.is_replica:
+            return
+        with span("purge_cuts"):
+            removed = self.cuts_manager.purge(self.solver.model)
+        if len(removed) > 0:
+            self.solver.bump_revision()
+        if self.cut_changes is not None:
+            self.cut_changes.extend(("remove", name) for name in removed)
+
+    def _record_cut(self, idx: int, cut: Cut, constraint: Constraint) -> None:
+        # cuts deactivated as similar to an active one are not replicated
+        if self.cut_changes is not None and constraint.active:
+            self.cut_changes.append(
+                ("add", constraint.name, idx, cut, self.current_solution)
+            )
 
-    def save(self, dir: Path) -> None:
-        self.solver.save(dir)
+    def pop_cut_changes(self) -> Dict[str, Any]:
+        """Cuts added and removed since the last call, for the replicas of the
+        master. The first call only starts recording."""
+        changes = {
+            "cuts": [] if self.cut_changes is None else self.cut_changes,
+            "revision": self.solver.get_revision(),
+        }
+        self.cut_changes = []
+        return changes
+
+    def apply_cut_changes(self, changes: Dict[str, Any]) -> None:
+        """Replays the cut changes of the original master on this replica."""
+        self.is_replica = True
+        for change in changes["cuts"]:
+            if change[0] == "add":
+                _, name, idx, cut, trial_point = change
+                constraint = self._create_constraint(idx, cut)
+                self.solver.model.add_component(name, constraint)
+                self.cuts_manager.restore_cut(
+                    CutInfo(constraint, cut, idx, trial_point, 0)
+                )
+            else:
+                self.cuts_manager.remove_cut(change[1], self.solver.model)
+        # cache keys of the replica then match those of the original
+        self.solver.set_revision(changes["revision"])
+
+    def save(self, results: NodeResults) -> None:
+        self.solver.save(results)
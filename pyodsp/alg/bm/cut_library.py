@@ -0,0 +1,157 @@
+from typing import Any, Dict, List
+from pathlib import Path
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+from .cuts import Cut, CutList, OptimalityCut, FeasibilityCut
+from .cuts_manager import CutInfo
+
+CUT_LIBRARY_VERSION = 1
+
+
+def fingerprint(*items: Any) -> str:
+    """Hash of the repr of items, which must be deterministic across runs."""
+    return hashlib.sha256(repr(items).encode()).hexdigest()
+
+
+def _concatenate(arrays: List[np.ndarray], dtype: type) -> np.ndarray:
+    if len(arrays) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.concatenate(arrays).astype(dtype, copy=False)
+
+
+class CutLibrary:
+    """Cuts of past runs on disk, to warm-start masters of a similar structure.
+
+    The cuts of a master are stored under a key, a hash of the focus variables of
+    the master and of its groups of children. Each cut is tagged with the
+    fingerprint of its group, the hash of the data of the children it aggregates,
+    and is only loaded again when that fingerprint is unchanged.
+
+    Cuts are not checked against new data: any change to the data of a child,
+    even one that leaves its cuts valid, changes the fingerprint of its group and
+    drops all the cuts of that group. Only the groups whose children are
+    unchanged are warm-started.
+
+    Args:
+        dirpath: directory of the library, one file per key
+    """
+
+    def __init__(self, dirpath: Path) -> None:
+        self.dirpath = dirpath
+
+    def _get_path(self, key: str) -> Path:
+        return self.dirpath / f"{key}.pkl"
+
+    def load(
+        self, key: str, group_fingerprints: List[str], num_vars: int
+    ) -> List[CutList]:
+        """Cuts of the library for the groups of the master whose fingerprint is
+        unchanged, none for the other groups.
+
+        Args:
+            key: key of the master
+            group_fingerprints: current fingerprint of each group
+            num_vars: number of focus variables of the master
+        """
+        cuts_list: List[CutList] = [CutList() for _ in group_fingerprints]
+        path = self._get_path(key)
+        if not path.exists():
+            return cuts_list
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != CUT_LIBRARY_VERSION or data["num_vars"] != num_vars:
+            return cuts_list
+
+        # validity of all cuts at once, by their groups and coefficients
+        group_idx = {fp: idx for idx, fp in enumerate(group_fingerprints)}
+        groups = np.array([group_idx.get(fp, -1) for fp in data["groups"]], dtype=int)
+        valid = (groups >= 0) & np.isfinite(data["rhs"])
+        cut_ids, var_ids, vals = data["cut_ids"], data["var_ids"], data["vals"]
+        invalid_coeffs = ~np.isfinite(vals) | (var_ids < 0) | (var_ids >= num_vars)
+        valid[cut_ids[invalid_coeffs]] = False
+
+        # coefficients of each cut, as contiguous slices of the sorted entries
+        order = np.argsort(cut_ids, kind="stable")
+        bounds = np.searchsorted(cut_ids[order], np.arange(len(valid) + 1))
+        for i in np.flatnonzero(valid):
+            entries = order[bounds[i] : bounds[i + 1]]
+            indices, values = var_ids[entries], vals[entries]
+            rhs = float(data["rhs"][i])
+            info = data["infos"][i]
+            cut: Cut
+            if data["optimality"][i]:
+                cut = OptimalityCut(
+                    indices,
+                    values,
+                    rhs=rhs,
+                    objective_value=float(data["objective_values"][i]),
+                    info=info,
+                )
+            else:
+                cut = FeasibilityCut(indices, values, rhs=rhs, info=info)
+            cuts_list[groups[i]].append(cut)
+        return cuts_list
+
+    def store(
+        self,
+        key: str,
+        group_fingerprints: List[str],
+        cuts: List[List[CutInfo]],
+        num_vars: int,
+    ) -> None:
+        """Replaces the cuts of a master by its active cuts.
+
+        Args:
+            key: key of the master
+            group_fingerprints: fingerprint of each group
+            cuts: active cuts of each group
+            num_vars: number of focus variables of the master
+        """
+        groups: List[str] = []
+        rhs: List[float] = []
+        optimality: List[bool] = []
+        objective_values: List[float] = []
+        infos: List[Dict | None] = []
+        cut_ids: List[np.ndarray] = []
+        var_ids: List[np.ndarray] = []
+        vals: List[np.ndarray] = []
+        for fp, infos_group in zip(group_fingerprints, cuts):
+            for cut_info in infos_group:
+                cut = cut_info.cut
+                cut_ids.append(np.full(len(cut.indices), len(rhs), dtype=np.intp))
+                var_ids.append(cut.indices)
+                vals.append(cut.values)
+                groups.append(fp)
+                rhs.append(cut.rhs)
+                is_optimality = isinstance(cut, OptimalityCut)
+                optimality.append(is_optimality)
+                objective_values.append(
+                    cut.objective_value if is_optimality else np.nan
+                )
+                infos.append(cut.info)
+
+        self.dirpath.mkdir(parents=True, exist_ok=True)
+        path = self._get_path(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                {
+                    "version": CUT_LIBRARY_VERSION,
+                    "num_vars": num_vars,
+                    "groups": groups,
+                    "rhs": np.array(rhs, dtype=float),
+                    "optimality": np.array(optimality, dtype=bool),
+                    "objective_values": np.array(objective_values, dtype=float),
+                    "infos": infos,
+                    "cut_ids": _concatenate(cut_ids, np.intp),
+                    "var_ids": _concatenate(var_ids, np.intp),
+                    "vals": _concatenate(vals, np.float64),
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, path)
@@ -1,29 +1,59 @@
-from typing import List, Dict, TypeVar, Generic
-from dataclasses import dataclass
+from typing import Dict, TypeVar, Generic
+
+import numpy as np
 
 
-@dataclass
 class Cut:
-    """Base class for cuts."""
+    """Base class for cuts.
+
+    The coefficients are stored as the positions of the variables with a nonzero
+    coefficient, in increasing order, and the values of those coefficients.
+    """
+
+    __slots__ = ("indices", "values", "rhs", "info")
 
-    coeffs: Dict[int, float]
-    rhs: float
+    def __init__(
+        self,
+        indices: np.ndarray,
+        values: np.ndarray,
+        rhs: float,
+        info: Dict | None = None,
+    ) -> None:
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.rhs = rhs
+        self.info = info
 
-    info: Dict
+    @property
+    def coeffs(self) -> Dict[int, float]:
+        """Coefficients keyed by the position of the variable."""
+        return dict(zip(self.indices.tolist(), self.values.tolist()))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(coeffs={self.coeffs}, rhs={self.rhs})"
 
 
-@dataclass
 class OptimalityCut(Cut):
     """Class for optimality cuts."""
 
-    objective_value: float
+    __slots__ = ("objective_value",)
+
+    def __init__(
+        self,
+        indices: np.ndarray,
+        values: np.ndarray,
+        rhs: float,
+        objective_value: float,
+        info: Dict | None = None,
+    ) -> None:
+        super().__init__(indices, values, rhs, info)
+        self.objective_value = objective_value
 
 
-@dataclass
 class FeasibilityCut(Cut):
     """Class for feasibility cuts."""
 
-    pass
+    __slots__ = ()
 
 
 T = TypeVar("T", bound=Cut)
@@ -1,9 +1,10 @@
-from typing import List
+from typing import Any, List, Dict, Set
 from dataclasses import dataclass
 
+import numpy as np
 from pyomo.environ import ConcreteModel, Constraint
 
-from .cuts import Cut, FeasibilityCut, OptimalityCut
+from .cuts import Cut, CutList, FeasibilityCut, OptimalityCut
 from ..params import BM_SLACK_TOLERANCE, BM_MAX_CUT_AGE, BM_CUT_SIM_TOLERANCE
 
 
@@ -18,6 +19,99 @@ class CutInfo:
     age: int
 
 
+def is_similar_cut(cut: Cut, other: Cut) -> bool:
+    if np.array_equal(cut.indices, other.indices):
+        diff = cut.values - other.values
+    else:
+        # difference of the coefficients on the union of the indices
+        _, inverse = np.unique(
+            np.concatenate((cut.indices, other.indices)), return_inverse=True
+        )
+        diff = np.bincount(inverse, weights=np.concatenate((cut.values, -other.values)))
+    square = (cut.rhs - other.rhs) ** 2 + float(diff @ diff)
+    return square < BM_CUT_SIM_TOLERANCE
+
+
+class SharedCut:
+    """Cut of a SharedCutStore with the managers holding it as active."""
+
+    __slots__ = ("cut", "holders")
+
+    def __init__(self, cut: Cut) -> None:
+        self.cut = cut
+        self.holders: Set[int] = set()
+
+
+class SharedCutStore:
+    """Pool of cuts shared by nodes that receive identical aggregated cuts.
+
+    The cuts of a backward pass are registered once, and the similarity check
+    against the pool is done at registration and reused by every CutsManager
+    that refers to this store. A cut of the pool only makes a new cut similar
+    for the managers that hold it as active, and it leaves the pool once no
+    manager holds it.
+    """
+
+    def __init__(self) -> None:
+        self._cuts: List[List[SharedCut]] = []
+        self._by_id: Dict[int, SharedCut] = {}
+        self._similar: Dict[int, List[SharedCut]] = {}
+
+    def register(self, cuts_list: List[CutList]) -> None:
+        self._similar = {}
+        for idx, cuts in enumerate(cuts_list):
+            self._prune(idx)
+            for cut in cuts:
+                self._similar[id(cut)] = [
+                    shared
+                    for shared in self._cuts[idx]
+                    if is_similar_cut(cut, shared.cut)
+                ]
+                self._add(idx, cut)
+
+    def is_similar(self, cut: Cut, holder: int) -> bool | None:
+        """Returns whether cut is similar to an active cut of the holder, or
+        None if the cut is not registered."""
+        similar = self._similar.get(id(cut))
+        if similar is None:
+            return None
+        return any(holder in shared.holders for shared in similar)
+
+    def hold(self, idx: int, cut: Cut, holder: int) -> None:
+        shared = self._by_id.get(id(cut))
+        if shared is None:
+            # cut of a checkpoint or of a replicated master
+            shared = self._add(idx, cut)
+        shared.holders.add(holder)
+
+    def release(self, cut: Cut, holder: int) -> None:
+        shared = self._by_id.get(id(cut))
+        if shared is not None:
+            shared.holders.discard(holder)
+
+    def get_num_cuts(self) -> int:
+        return sum(len(cuts) for cuts in self._cuts)
+
+    def _add(self, idx: int, cut: Cut) -> SharedCut:
+        while len(self._cuts) <= idx:
+            self._cuts.append([])
+        shared = SharedCut(cut)
+        self._cuts[idx].append(shared)
+        self._by_id[id(cut)] = shared
+        return shared
+
+    def _prune(self, idx: int) -> None:
+        while len(self._cuts) <= idx:
+            self._cuts.append([])
+        held: List[SharedCut] = []
+        for shared in self._cuts[idx]:
+            if len(shared.holders) > 0:
+                held.append(shared)
+            else:
+                del self._by_id[id(shared.cut)]
+        self._cuts[idx] = held
+
+
 class CutsManager:
     def __init__(self) -> None:
         self._active_cuts: List[List[CutInfo]] = []
@@ -25,12 +119,17 @@ class CutsManager:
         self._num_optimality: List[int] = []
         self._num_feasibility: List[int] = []
 
+        self._shared_store: SharedCutStore | None = None
+
     def build(self, num_idx: int) -> None:
         for _ in range(num_idx):
             self._active_cuts.append([])
             self._num_optimality.append(0)
             self._num_feasibility.append(0)
 
+    def set_shared_store(self, store: SharedCutStore | None) -> None:
+        self._shared_store = store
+
     def get_num_optimality(self, idx: int) -> int:
         return self._num_optimality[idx]
 
@@ -48,20 +147,15 @@ class CutsManager:
         if self._is_similar(cut_info):
             cut_info.constraint.deactivate()
         else:
-            self._active_cuts[idx].append(cut_info)
+            self._hold(cut_info)
 
     def _is_similar(self, cut_info: CutInfo) -> bool:
+        if self._shared_store is not None:
+            similar = self._shared_store.is_similar(cut_info.cut, id(self))
+            if similar is not None:
+                return similar
         for cut in self._active_cuts[cut_info.idx]:
-            diff = cut_info.cut.coeffs.copy()
-            for j, val in cut.cut.coeffs.items():
-                if j in diff.keys():
-                    diff[j] -= val
-                else:
-                    diff[j] = -val
-            square = (cut_info.cut.rhs - cut.cut.rhs) ** 2
-            for val in diff.values():
-                square += val**2
-            if square < BM_CUT_SIM_TOLERANCE:
+            if is_similar_cut(cut_info.cut, cut.cut):
                 return True
         return False
 
@@ -76,19 +170,62 @@ class CutsManager:
                     else:
                         cut.age = 0
 
-    def purge(self, model: ConcreteModel) -> None:
+    def purge(self, model: ConcreteModel) -> List[str]:
+        """Removes the cuts that stayed inactive for too long.
+
+        Returns:
+            The names of the removed constraints.
+        """
+        removed: List[str] = []
+
         def below_max(cut: CutInfo) -> bool:
             below = cut.age < BM_MAX_CUT_AGE
             if not below:
-                cut.constraint.deactivate()
+                removed.append(cut.constraint.name)
+                self._release(cut)
                 model.del_component(cut.constraint.name)
             return below
 
         for cuts in self._active_cuts:
             cuts[:] = [cut for cut in cuts if below_max(cut)]
+        return removed
+
+    def remove_cut(self, name: str, model: ConcreteModel) -> None:
+        """Removes the active cut of a constraint."""
+        for cuts in self._active_cuts:
+            for cut in cuts:
+                if cut.constraint.name == name:
+                    self._release(cut)
+                    model.del_component(name)
+                    cuts.remove(cut)
+                    return
 
     def get_cuts(self) -> List[List[CutInfo]]:
         return self._active_cuts
 
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "num_optimality": list(self._num_optimality),
+            "num_feasibility": list(self._num_feasibility),
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self._num_optimality = list(state["num_optimality"])
+        self._num_feasibility = list(state["num_feasibility"])
+
+    def restore_cut(self, cut_info: CutInfo) -> None:
+        """Re-activates a cut of a checkpoint, which was already checked."""
+        self._hold(cut_info)
+
+    def _hold(self, cut_info: CutInfo) -> None:
+        self._active_cuts[cut_info.idx].append(cut_info)
+        if self._shared_store is not None:
+            self._shared_store.hold(cut_info.idx, cut_info.cut, id(self))
+
+    def _release(self, cut_info: CutInfo) -> None:
+        cut_info.constraint.deactivate()
+        if self._shared_store is not None:
+            self._shared_store.release(cut_info.cut, id(self))
+
     def get_num_cuts(self) -> int:
         return sum(len(cut_list) for cut_list in self._active_cuts)
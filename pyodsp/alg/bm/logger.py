@@ -1,5 +1,7 @@
 import logging
 
+from pyodsp.log import get_logger
+
 
 class BmLogger:
     def __init__(
@@ -8,48 +10,38 @@ class BmLogger:
         self.method = method
         self.node_id = node_id
         self.depth = depth
-        # Create a logger object
-        self.logger = logging.getLogger(f"{method} {node_id}")
-        self.logger.setLevel(level)
-
-        # Create a console handler and set its level to debug
-        ch = logging.StreamHandler()
-        ch.setLevel(logging.DEBUG)
-
-        # Create a formatter and set the format
-        formatter = logging.Formatter("%(levelname)s - %(message)s")
-        ch.setFormatter(formatter)
+        self.logger = get_logger(f"bm.{node_id}", level)
 
-        # Add the handler to the logger
-        self.logger.addHandler(ch)
+    def is_debug_enabled(self) -> bool:
+        return self.logger.isEnabledFor(logging.DEBUG)
 
     def log_initialization(self, **kwargs) -> None:
-        self.logger.info(f"Node: {self.node_id} - Starting {self.method}")
+        self.log_info("Starting %s", self.method)
         for key, var in kwargs.items():
-            self.logger.info(f"Node: {self.node_id} - {key}: {var}")
+            self.log_info("%s: %s", key, var)
 
-    def log_info(self, message: str) -> None:
-        self.logger.info(f"Node: {self.node_id} - {message}")
+    def log_info(self, message: str, *args) -> None:
+        self.logger.info("Node: %s - " + message, self.node_id, *args)
 
-    def log_debug(self, message: str) -> None:
-        self.logger.debug(f"Node: {self.node_id} - {message}")
+    def log_debug(self, message: str, *args) -> None:
+        self.logger.debug("Node: %s - " + message, self.node_id, *args)
 
     def log_sub_problem(self, idx, cut_type: str, coefficients, constant) -> None:
-        self.log_debug(f"\t{idx}\t{cut_type}\t{coefficients}\t{constant}")
+        self.log_debug("\t%s\t%s\t%s\t%s", idx, cut_type, coefficients, constant)
 
     def log_status_optimal(self) -> None:
-        self.log_info(f"{self.method} terminated by optimality")
+        self.log_info("%s terminated by optimality", self.method)
 
     def log_status_max_iter(self) -> None:
-        self.log_info(f"{self.method} terminated by max iteration reached")
+        self.log_info("%s terminated by max iteration reached", self.method)
 
     def log_status_time_limit(self) -> None:
-        self.log_info(f"{self.method} terminated by time limit")
+        self.log_info("%s terminated by time limit", self.method)
 
     def log_infeasible(self) -> None:
-        self.log_info(f"{self.method} terminated by infeasibility")
+        self.log_info("%s terminated by infeasibility", self.method)
 
     def log_completion(self, iteration: int, objective_value: float | None) -> None:
-        self.log_info(f"{self.method} completed")
-        self.log_info(f"Total iterations: {iteration}")
-        self.log_info(f"Final objective value: {objective_value}")
+        self.log_info("%s completed", self.method)
+        self.log_info("Total iterations: %s", iteration)
+        self.log_info("Final objective value: %s", objective_value)
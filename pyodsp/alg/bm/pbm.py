@@ -1,17 +1,15 @@
-from typing import List, Tuple
-from pathlib import Path
+from typing import Any, Dict, List, Tuple
 import time
 import logging
 
 import numpy as np
-import pandas as pd
 from pyomo.environ import Var, ScalarVar, Reals, RangeSet
 
 from pyodsp.alg.bm.cuts import CutList, OptimalityCut, FeasibilityCut
 
 from .logger import BmLogger
 from .cp import CuttingPlaneMethod
-from .cuts_manager import CutInfo
+from .cuts_manager import CutInfo, SharedCutStore
 from ..params import (
     BM_ABS_TOLERANCE,
     BM_REL_TOLERANCE,
@@ -28,6 +26,7 @@ from pyodsp.solver.pyomo_utils import (
     add_quad_terms_to_objective,
     update_quad_terms_in_objective,
 )
+from pyodsp.results import NodeResults
 
 """
 Kiwiel, K. C. (1990). 
@@ -156,9 +155,26 @@ class ProximalBundleMethod:
         else:
             ub = f"{ub:.4f}"
         self.logger.log_info(
-            f"Iteration: {self.iteration}\tLB: {lb}\t CB: {cb}\t UB: {ub}\t NumCuts: {numcuts}\t u: {self.penalty}\t Elapsed: {elapsed:.2f}"
+            "Iteration: %s\tLB: %s\t CB: %s\t UB: %s\t NumCuts: %s\t u: %s\t Elapsed: %.2f",
+            self.iteration,
+            lb,
+            cb,
+            ub,
+            numcuts,
+            self.penalty,
+            elapsed,
         )
-        self.logger.log_debug(f"\tsolution: {self.cpm.get_current_solution()}")
+        if self.logger.is_debug_enabled():
+            self.logger.log_debug("\tsolution: %s", self.cpm.get_current_solution())
+
+    def set_cut_store(self, store: SharedCutStore | None) -> None:
+        self.cpm.set_cut_store(store)
+
+    def pop_cut_changes(self) -> Dict[str, Any]:
+        return self.cpm.pop_cut_changes()
+
+    def apply_cut_changes(self, changes: Dict[str, Any]) -> None:
+        self.cpm.apply_cut_changes(changes)
 
     def get_cuts(self) -> List[List[CutInfo]]:
         return self.cpm.get_cuts()
@@ -207,17 +223,41 @@ class ProximalBundleMethod:
 
         return False
 
-    def save(self, dir: Path) -> None:
-        path = dir / "pbm.csv"
-        df = pd.DataFrame(
+    def save(self, results: NodeResults) -> None:
+        results.add(
+            "bundle",
             {
+                "iteration": list(range(len(self.obj_bound))),
                 "obj_bound": self.obj_bound,
                 "center_val": self.center_val,
                 "obj_val": self.obj_val,
-            }
+            },
         )
-        df.to_csv(path)
-        self.cpm.save(dir)
+        self.cpm.save(results)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "iteration": self.iteration,
+            "obj_bound": list(self.obj_bound),
+            "obj_val": list(self.obj_val),
+            "center": list(self.center),
+            "center_val": list(self.center_val),
+            "penalty": self.penalty,
+            "iter_since_update": self.iter_since_update,
+            "e_v": self.e_v,
+            "cpm": self.cpm.get_state(),
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.reset_iteration(state["iteration"])
+        self.obj_bound = list(state["obj_bound"])
+        self.obj_val = list(state["obj_val"])
+        self.center_val = list(state["center_val"])
+        self.penalty = state["penalty"]
+        self.iter_since_update = state["iter_since_update"]
+        self.e_v = state["e_v"]
+        self._update_center(list(state["center"]))
+        self.cpm.set_state(state["cpm"])
 
     def add_cuts(self, cuts_list: List[CutList]) -> Tuple[bool, bool, float | None]:
         return self.cpm.add_cuts(cuts_list)
@@ -307,12 +347,11 @@ class ProximalBundleMethod:
             return None
 
         d = np.array(self.cpm.get_current_solution()) - np.array(self.center)
-        grad = [0.0] * len(d)
+        grad = np.zeros(len(d))
         for idx, cuts in enumerate(cuts_list):
             for cut in cuts:
                 if isinstance(cut, OptimalityCut):
-                    for i, coeff in cut.coeffs.items():
-                        grad[i] += coeff
+                    grad[cut.indices] += cut.values
                 elif isinstance(cut, FeasibilityCut):
                     return None
         return center_val - obj_val + np.inner(grad, d)
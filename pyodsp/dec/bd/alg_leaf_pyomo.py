@@ -1,7 +1,6 @@
-from typing import List
-from pathlib import Path
+from typing import Any, List, Tuple
 import time
-import pandas as pd
+import numpy as np
 
 from pyomo.environ import Suffix
 from pyomo.core.base.constraint import ScalarConstraint
@@ -15,26 +14,30 @@ from .message import (
     BdUpMessage,
 )
 from ..node._alg import IAlgLeaf
-from ..utils import CouplingData, get_nonzero_coefficients_from_model
+from ..node.leaf_cache import LeafCache
+from ..utils import CouplingData, get_nonzero_coefficients_from_model, sparsify
 from pyodsp.alg.bm.cuts import Cut, OptimalityCut, FeasibilityCut
 from pyodsp.solver.pyomo_solver import PyomoSolver
-from pyodsp.alg.params import DEC_CUT_ABS_TOL
+from pyodsp.alg.params import DEC_CUT_ABS_TOL, LEAF_CACHE_SIZE
+from pyodsp.results import NodeResults
 
 
 class BdAlgLeafPyomo(IAlgLeaf):
-    def __init__(self, solver: PyomoSolver):
+    def __init__(self, solver: PyomoSolver, cache_size: int = LEAF_CACHE_SIZE):
         self.solver = solver
         self.solver.model.dual = Suffix(direction=Suffix.IMPORT)
         self.step_time: List[float] = []
+        self.num_popped_steps = 0
+        self.cache = LeafCache(cache_size)
 
     def build(self) -> None:
         coupling_vars = self.solver.vars
-        self.coupling_info: List[CouplingData] = get_nonzero_coefficients_from_model(
+        self.coupling_data: CouplingData = get_nonzero_coefficients_from_model(
             self.solver.model, coupling_vars
         )
-        self.coupling_constraints: List[ScalarConstraint] = [
-            coupling_data.constraint for coupling_data in self.coupling_info
-        ]
+        self.coupling_constraints: List[ScalarConstraint] = (
+            self.coupling_data.constraints
+        )
 
     def pass_init_dn_message(self, message: BdInitDnMessage) -> None:
         if self.is_minimize() != message.get_is_minimize():
@@ -43,6 +46,9 @@ class BdAlgLeafPyomo(IAlgLeaf):
     def get_init_up_message(self) -> BdInitUpMessage:
         return BdInitUpMessage()
 
+    def get_fingerprint(self) -> str:
+        return self.solver.get_fingerprint()
+
     def pass_dn_message(self, message: BdDnMessage) -> None:
         solution = message.get_solution()
         objective = message.get_objective()
@@ -53,11 +59,29 @@ class BdAlgLeafPyomo(IAlgLeaf):
         solution = message.get_solution()
         assert solution is not None
         self._fix_variables(solution)
-        self.get_up_message()
+        self._solve()
 
     def get_final_up_message(self) -> BdFinalUpMessage:
         return BdFinalUpMessage(self.solver.get_original_objective_value())
 
+    def pop_worker_stats(self) -> Tuple[List[float], Any]:
+        step_time = self.step_time[self.num_popped_steps :]
+        self.num_popped_steps = len(self.step_time)
+        return step_time, self.cache.pop_updates()
+
+    def add_worker_stats(self, stats: Tuple[List[float], Any]) -> None:
+        step_time, cache_updates = stats
+        self.step_time.extend(step_time)
+        self.cache.add_updates(cache_updates)
+
+    def get_final_state(self) -> Any:
+        return self.coupling_values, self.solver.get_values()
+
+    def set_final_state(self, state: Any) -> None:
+        coupling_values, values = state
+        self._fix_variables(coupling_values)
+        self.solver.set_values(values)
+
     def _fix_variables(self, coupling_values: List[float]) -> None:
         """Fix the variables to a specified value
 
@@ -73,18 +97,26 @@ class BdAlgLeafPyomo(IAlgLeaf):
         self.solver.set_parent_objective_value(objective)
 
     def get_up_message(self) -> BdUpMessage:
-        start = time.time()
-        self.solver.solve()
-        cut = self._get_subgradient_inner()
-        self.step_time.append(time.time() - start)
+        key = self.cache.get_key(self.coupling_values, self.solver.get_revision())
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self._solve()
+            self.cache.put(key, cached)
+        cut, original_objective = cached
         parent_objective = self.solver.get_parent_objective_value()
-        original_objective = self.solver.get_original_objective_value()
         if original_objective is None:
             sample_objective = None
         else:
             sample_objective = parent_objective + original_objective
         return BdUpMessage(cut, sample_objective)
 
+    def _solve(self) -> Tuple[Cut, float | None]:
+        start = time.time()
+        self.solver.solve()
+        cut = self._get_subgradient_inner()
+        self.step_time.append(time.time() - start)
+        return cut, self.solver.get_original_objective_value()
+
     def _get_subgradient_inner(self) -> Cut:
         if self.solver.is_optimal():
             cut = self._optimality_cut()
@@ -96,46 +128,32 @@ class BdAlgLeafPyomo(IAlgLeaf):
             raise ValueError("Unknown solver status")
 
     def _optimality_cut(self) -> OptimalityCut:
-        pi = self.solver.get_dual(self.coupling_constraints)
+        pi = np.asarray(self.solver.get_dual(self.coupling_constraints), dtype=float)
         objective = self.solver.get_objective_value()
-        coeff = [0.0 for _ in range(len(self.solver.vars))]
-        rhs = objective
-        for i, dual_var in enumerate(pi):
-            coupling_data = self.coupling_info[i]
-            for j, coefficients in coupling_data.coefficients.items():
-                temp = dual_var * coefficients
-                coeff[j] += temp
-                rhs += temp * self.coupling_values[j]
-        sparse_coeff = {
-            j: val for j, val in enumerate(coeff) if abs(val) > DEC_CUT_ABS_TOL
-        }
-        return OptimalityCut(
-            coeffs=sparse_coeff, rhs=rhs, objective_value=objective, info={}
-        )
+        coeff = self.coupling_data.transpose_dot(pi)
+        rhs = objective + float(coeff @ np.asarray(self.coupling_values, dtype=float))
+        indices, values = sparsify(coeff, DEC_CUT_ABS_TOL)
+        return OptimalityCut(indices, values, rhs=rhs, objective_value=objective)
 
     def _feasibility_cut(self) -> FeasibilityCut:
-        sigma = self.solver.get_dual_ray(self.coupling_constraints)
+        sigma = np.asarray(
+            self.solver.get_dual_ray(self.coupling_constraints), dtype=float
+        )
 
         objective = self.solver.get_infeasible_model_objective_value()
 
-        coeff = [0.0 for _ in range(len(self.solver.vars))]
-        rhs = objective
-        for i, dual_ray in enumerate(sigma):
-            coupling_data = self.coupling_info[i]
-            for j, coefficients in coupling_data.coefficients.items():
-                temp = dual_ray * coefficients
-                coeff[j] += temp
-                rhs += temp * self.coupling_values[j]
-        sparse_coeff = {
-            j: val for j, val in enumerate(coeff) if abs(val) > DEC_CUT_ABS_TOL
-        }
-        return FeasibilityCut(coeffs=sparse_coeff, rhs=rhs, info={})
-
-    def save(self, dir: Path) -> None:
-        self.solver.save(dir)
-        path = dir / "step_time.csv"
-        df = pd.DataFrame(self.step_time, columns=["step_time"])
-        df.to_csv(path, index=False)
+        coeff = self.coupling_data.transpose_dot(sigma)
+        rhs = objective + float(coeff @ np.asarray(self.coupling_values, dtype=float))
+        indices, values = sparsify(coeff, DEC_CUT_ABS_TOL)
+        return FeasibilityCut(indices, values, rhs=rhs)
+
+    def save(self, results: NodeResults) -> None:
+        self.solver.save(results)
+        results.add(
+            "step_time",
+            {"step": list(range(len(self.step_time))), "step_time": self.step_time},
+        )
+        self.cache.save(results)
 
     def is_minimize(self) -> bool:
         return self.solver.is_minimize()
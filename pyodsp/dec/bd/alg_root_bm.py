@@ -1,7 +1,5 @@
-from typing import List, Tuple
-from pathlib import Path
+from typing import Any, Dict, List, Tuple
 import time
-import pandas as pd
 import logging
 
 from pyomo.environ import ScalarVar
@@ -11,13 +9,17 @@ from ..node._alg import IAlgRoot
 from pyodsp.solver.pyomo_solver import PyomoSolver
 from pyodsp.alg.bm.bm import BundleMethod
 from pyodsp.alg.bm.cuts import CutList
+from pyodsp.alg.bm.cuts_manager import CutInfo, SharedCutStore
+from pyodsp.alg.bm.cut_library import fingerprint
 from pyodsp.dec.node._message import NodeIdx
+from pyodsp.results import NodeResults
 
 
 class BdAlgRootBm(IAlgRoot):
     def __init__(self, solver: PyomoSolver, max_iteration=1000) -> None:
         self.bm = BundleMethod(solver, max_iteration)
         self.step_time: List[float] = []
+        self.num_popped_steps = 0
 
     def get_vars(self) -> List[ScalarVar]:
         return self.bm.get_vars()
@@ -32,12 +34,47 @@ class BdAlgRootBm(IAlgRoot):
         self.step_time.append(time.time() - start)
         return status, BdDnMessage(solution, objective)
 
+    def get_children_to_solve(
+        self, message: BdDnMessage, children: List[NodeIdx]
+    ) -> List[NodeIdx]:
+        return children
+
     def add_cuts(self, cuts_list: List[CutList]) -> None:
         self.bm.add_cuts(cuts_list)
 
+    def get_cuts(self) -> List[List[CutInfo]]:
+        return self.bm.get_cuts()
+
+    def get_fingerprint(self) -> str:
+        return fingerprint([var.name for var in self.get_vars()])
+
+    def set_cut_store(self, store: SharedCutStore | None) -> None:
+        self.bm.set_cut_store(store)
+
+    def pop_cut_changes(self) -> Dict[str, Any]:
+        return self.bm.pop_cut_changes()
+
+    def apply_cut_changes(self, changes: Dict[str, Any]) -> None:
+        self.bm.apply_cut_changes(changes)
+
+    def pop_worker_stats(self) -> List[float]:
+        step_time = self.step_time[self.num_popped_steps :]
+        self.num_popped_steps = len(self.step_time)
+        return step_time
+
+    def add_worker_stats(self, stats: List[float]) -> None:
+        self.step_time.extend(stats)
+
     def reset_iteration(self) -> None:
         self.bm.reset_iteration()
 
+    def get_checkpoint_state(self) -> Dict[str, Any]:
+        return {"bm": self.bm.get_state(), "step_time": list(self.step_time)}
+
+    def set_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        self.bm.set_state(state["bm"])
+        self.step_time = list(state["step_time"])
+
     def get_final_dn_message(self, **kwargs) -> BdFinalDnMessage:
         return BdFinalDnMessage([var.value for var in self.get_vars()])
 
@@ -58,11 +95,12 @@ class BdAlgRootBm(IAlgRoot):
     def get_init_dn_message(self, **kwargs) -> BdInitDnMessage:
         return BdInitDnMessage(self.is_minimize())
 
-    def save(self, dir: Path) -> None:
-        self.bm.save(dir)
-        path = dir / "step_time.csv"
-        df = pd.DataFrame(self.step_time, columns=["step_time"])
-        df.to_csv(path, index=False)
+    def save(self, results: NodeResults) -> None:
+        self.bm.save(results)
+        results.add(
+            "step_time",
+            {"step": list(range(len(self.step_time))), "step_time": self.step_time},
+        )
 
     def is_minimize(self) -> bool:
         return self.bm.is_minimize()
@@ -11,8 +11,11 @@ from pyodsp.alg.bm.cuts import Cut
 
 
 class BdInitDnMessage(InitDnMessage):
+    __slots__ = ("is_minimize", "fingerprint_requested", "depth")
+
     def __init__(self, is_minimize: bool) -> None:
         self.is_minimize = is_minimize
+        self.fingerprint_requested = False
 
     def get_is_minimize(self) -> bool:
         return self.is_minimize
@@ -23,10 +26,19 @@ class BdInitDnMessage(InitDnMessage):
     def get_depth(self) -> int:
         return self.depth
 
+    def set_fingerprint_requested(self, requested: bool) -> None:
+        self.fingerprint_requested = requested
+
+    def is_fingerprint_requested(self) -> bool:
+        return self.fingerprint_requested
+
 
 class BdInitUpMessage(InitUpMessage):
+    __slots__ = ("bound", "fingerprint")
+
     def __init__(self) -> None:
         self.bound = None
+        self.fingerprint = None
 
     def set_bound(self, bound: float | None) -> None:
         self.bound = bound
@@ -34,8 +46,16 @@ class BdInitUpMessage(InitUpMessage):
     def get_bound(self) -> float | None:
         return self.bound
 
+    def set_fingerprint(self, fingerprint: str | None) -> None:
+        self.fingerprint = fingerprint
+
+    def get_fingerprint(self) -> str | None:
+        return self.fingerprint
+
 
 class BdUpMessage(UpMessage):
+    __slots__ = ("cut", "objective")
+
     def __init__(self, cut: Cut, objective: float) -> None:
         self.cut = cut
         self.objective = objective
@@ -48,6 +68,8 @@ class BdUpMessage(UpMessage):
 
 
 class BdDnMessage(DnMessage):
+    __slots__ = ("solution", "objective")
+
     def __init__(self, solution: List[float], objective: float = 0.0) -> None:
         self.solution = solution
         self.objective = objective
@@ -60,6 +82,8 @@ class BdDnMessage(DnMessage):
 
 
 class BdFinalDnMessage(FinalDnMessage):
+    __slots__ = ("solution",)
+
     def __init__(self, solution: List[float] | None) -> None:
         self.solution = solution
 
@@ -68,6 +92,8 @@ class BdFinalDnMessage(FinalDnMessage):
 
 
 class BdFinalUpMessage(FinalUpMessage):
+    __slots__ = ("objective",)
+
     def __init__(self, objective: float | None) -> None:
         self.objective = objective
 
@@ -5,13 +5,29 @@ import logging
 from .logger import BdLogger
 from .message import BdDnMessage
 from ..node._node import INode
+from ..checkpoint import load_checkpoint
 from ..graph.tree import Tree
 
 
 class BdRun:
-    def __init__(self, nodes: List[INode], filedir: Path, level: int = logging.INFO):
+    def __init__(
+        self,
+        nodes: List[INode],
+        filedir: Path,
+        level: int = logging.INFO,
+        num_workers: int = 1,
+        export_model: bool = False,
+        checkpoint_frequency: int = 0,
+    ):
         self.logger = BdLogger(level)
-        self.graph = Tree(nodes, self.logger, filedir)
+        self.graph = Tree(
+            nodes,
+            self.logger,
+            filedir,
+            num_workers=num_workers,
+            export_model=export_model,
+            checkpoint_frequency=checkpoint_frequency,
+        )
 
     def run(self, init_solution: List[float] | None = None) -> None:
         if init_solution is None:
@@ -20,3 +36,7 @@ class BdRun:
             dn_message = BdDnMessage(init_solution)
 
         self.graph.run(dn_message)
+
+    def resume(self, checkpoint_path: Path) -> None:
+        """Continues a run from a checkpoint written with checkpoint_frequency > 0."""
+        self.graph.run(checkpoint=load_checkpoint(checkpoint_path))
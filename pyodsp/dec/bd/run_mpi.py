@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, List
 from pathlib import Path
 from mpi4py import MPI
 import logging
@@ -6,17 +6,49 @@ import logging
 from .logger import BdLogger
 from .message import BdDnMessage
 from ..node._node import INode
+from ..node.factory import NodeFactory
+from ..checkpoint import load_checkpoint
 from ..graph.hub_and_spoke_mpi import HubAndSpokeMpi
 
 
 class BdRunMpi:
-    def __init__(self, nodes: List[INode], filedir: Path, level: int = logging.INFO):
+    def __init__(
+        self,
+        nodes: List[INode],
+        filedir: Path,
+        level: int = logging.INFO,
+        num_workers: int = 1,
+        export_model: bool = False,
+        checkpoint_frequency: int = 0,
+    ):
         self.logger = BdLogger(level)
-        self.graph = HubAndSpokeMpi(nodes, self.logger, filedir)
+        self.graph = HubAndSpokeMpi(
+            nodes,
+            self.logger,
+            filedir,
+            num_workers=num_workers,
+            export_model=export_model,
+            checkpoint_frequency=checkpoint_frequency,
+        )
 
         self.comm = MPI.COMM_WORLD
         self.rank = self.comm.Get_rank()
 
+    @classmethod
+    def from_factory(
+        cls, factory: NodeFactory, filedir: Path, **kwargs: Any
+    ) -> "BdRunMpi":
+        """Builds only the nodes of this rank, with the leaves balanced over ranks.
+
+        Args:
+            factory: builder of the root and of the leaves
+            filedir: directory of the results
+            kwargs: further arguments of BdRunMpi
+        """
+        comm = MPI.COMM_WORLD
+        nodes = factory.create_nodes(comm.Get_rank(), comm.Get_size())
+        return cls(nodes, filedir, **kwargs)
+
     def run(self, init_solution: List[float] | None = None) -> None:
         if self.rank == 0:
             if init_solution is None:
@@ -27,3 +59,10 @@ class BdRunMpi:
             self.graph.run(dn_message)
         else:
             self.graph.run()
+
+    def resume(self, checkpoint_path: Path) -> None:
+        """Continues a run from a checkpoint written with checkpoint_frequency > 0."""
+        if self.rank == 0:
+            self.graph.run(checkpoint=load_checkpoint(checkpoint_path))
+        else:
+            self.graph.run()
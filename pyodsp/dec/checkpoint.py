@@ -0,0 +1,54 @@
+from typing import Any, Dict, Iterable
+from pathlib import Path
+import os
+import pickle
+
+from .node._node import INode, INodeParent
+from .node._message import NodeIdx
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_FILE = "checkpoint.pkl"
+
+
+def save_checkpoint(path: Path, state: Dict[str, Any]) -> None:
+    """Pickles the state of a run.
+
+    The file is replaced atomically, so that a run preempted while writing keeps
+    its previous checkpoint.
+
+    Args:
+        path: The checkpoint file.
+        state: The state of the graph and its nodes.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(
+            {"version": CHECKPOINT_VERSION, **state},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: Path) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {state.get('version')}")
+    return state
+
+
+def get_node_states(nodes: Iterable[INode]) -> Dict[NodeIdx, Any]:
+    """Checkpoint state of every node holding a master problem."""
+    return {
+        node.get_idx(): node.get_checkpoint_state()
+        for node in nodes
+        if isinstance(node, INodeParent)
+    }
+
+
+def set_node_states(nodes: Dict[NodeIdx, INode], states: Dict[NodeIdx, Any]) -> None:
+    for idx, state in states.items():
+        node = nodes[idx]
+        assert isinstance(node, INodeParent)
+        node.set_checkpoint_state(state)
@@ -1,10 +1,9 @@
-from typing import List, Dict, Tuple
-from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Tuple
 import time
-import pandas as pd
+import numpy as np
 
 from pyodsp.alg.bm.cuts import OptimalityCut, FeasibilityCut
-from pyodsp.alg.params import DEC_CUT_ABS_TOL
+from pyodsp.alg.params import DEC_CUT_ABS_TOL, LEAF_CACHE_SIZE
 
 from .message import (
     DdInitDnMessage,
@@ -15,19 +14,27 @@ from .message import (
     DdUpMessage,
 )
 from ..node._alg import IAlgLeaf
+from ..node.leaf_cache import LeafCache
 from .coupling_manager import CouplingManager
+from ..utils import sparsify
 from pyodsp.solver.pyomo_solver import PyomoSolver
-from pyodsp.solver.pyomo_utils import update_linear_terms_in_objective
+from pyodsp.solver.pyomo_utils import set_linear_coefficients_in_objective
+from pyodsp.results import NodeResults
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
 
 
 class DdAlgLeafPyomo(IAlgLeaf):
-    def __init__(self, solver: PyomoSolver):
+    def __init__(self, solver: PyomoSolver, cache_size: int = LEAF_CACHE_SIZE):
         self.solver = solver
         self.step_time: List[float] = []
+        self.num_popped_steps = 0
+        self.cache = LeafCache(cache_size)
         self._is_minimize = self.solver.is_minimize()
         self.received_final_dn_message = False
 
-    def set_coupling_matrix(self, coupling_matrix: List[Dict[int, float]]) -> None:
+    def set_coupling_matrix(self, coupling_matrix: "csr_matrix") -> None:
         self.cm = CouplingManager(
             coupling_matrix, self.get_len_vars(), self.is_minimize()
         )
@@ -44,9 +51,14 @@ class DdAlgLeafPyomo(IAlgLeaf):
     def get_init_up_message(self) -> DdInitUpMessage:
         return DdInitUpMessage()
 
+    def get_fingerprint(self) -> str:
+        return self.solver.get_fingerprint()
+
     def pass_dn_message(self, message: DdDnMessage) -> None:
         solution = message.get_solution()
-        self._update_objective(solution)
+        self.primal_coeffs = self.cm.dual_times_matrix(solution)
+        # the objective is only rebuilt when the coefficients miss the cache
+        self.objective_updated = False
 
     def pass_final_dn_message(self, message: DdFinalDnMessage) -> None:
         solution = message.get_solution()
@@ -60,43 +72,71 @@ class DdAlgLeafPyomo(IAlgLeaf):
         else:
             return DdFinalUpMessage(None)
 
-    def _update_objective(self, coeffs: List[float]) -> None:
-        self.primal_coeffs = self.cm.dual_times_matrix(coeffs)
-        update_linear_terms_in_objective(
+    def pop_worker_stats(self) -> Tuple[List[float], Any]:
+        step_time = self.step_time[self.num_popped_steps :]
+        self.num_popped_steps = len(self.step_time)
+        return step_time, self.cache.pop_updates()
+
+    def add_worker_stats(self, stats: Tuple[List[float], Any]) -> None:
+        step_time, cache_updates = stats
+        self.step_time.extend(step_time)
+        self.cache.add_updates(cache_updates)
+
+    def get_final_state(self) -> Any:
+        if not self.received_final_dn_message:
+            return None
+        return self.coupling_values, self.solver.get_values()
+
+    def set_final_state(self, state: Any) -> None:
+        if state is None:
+            return
+        coupling_values, values = state
+        self.received_final_dn_message = True
+        self._fix_variables(coupling_values)
+        self.solver.set_values(values)
+
+    def _update_objective(self) -> None:
+        if self.objective_updated:
+            return
+        set_linear_coefficients_in_objective(
             self.solver, self.primal_coeffs, self.solver.vars
         )
+        self.objective_updated = True
 
     def get_up_message(self) -> DdUpMessage:
+        key = self.cache.get_key(self.primal_coeffs, self.solver.get_revision())
+        cut = self.cache.get(key)
+        if cut is None:
+            self._update_objective()
+            cut = self._get_cut()
+            self.cache.put(key, cut)
+        return DdUpMessage(cut)
+
+    def _get_cut(self) -> OptimalityCut | FeasibilityCut:
         is_optimal, solution, obj = self.get_solution_or_ray()
         if is_optimal:
             dual_coeffs = self.cm.matrix_times_primal(solution)
             product = self.cm.inner_product(self.primal_coeffs, solution)
             rhs = obj - product
-            sparse_coeff = {
-                j: val
-                for j, val in enumerate(dual_coeffs)
-                if abs(val) > DEC_CUT_ABS_TOL
-            }
-            cut = OptimalityCut(
-                coeffs=sparse_coeff,
+            indices, values = sparsify(dual_coeffs, DEC_CUT_ABS_TOL)
+            return OptimalityCut(
+                indices,
+                values,
                 rhs=rhs,
                 objective_value=obj,
-                info={"solution": solution},
+                info={"solution": np.asarray(solution, dtype=np.float64)},
             )
-            return DdUpMessage(cut)
         else:
             dual_coeffs = self.cm.matrix_times_primal(solution)
             product = self.cm.inner_product(self.primal_coeffs, solution)
             rhs = obj - product
-            sparse_coeff = {
-                j: val
-                for j, val in enumerate(dual_coeffs)
-                if abs(val) > DEC_CUT_ABS_TOL
-            }
-            cut = FeasibilityCut(
-                coeffs=sparse_coeff, rhs=rhs, info={"solution": solution}
+            indices, values = sparsify(dual_coeffs, DEC_CUT_ABS_TOL)
+            return FeasibilityCut(
+                indices,
+                values,
+                rhs=rhs,
+                info={"solution": np.asarray(solution, dtype=np.float64)},
             )
-            return DdUpMessage(cut)
 
     def get_solution_or_ray(self) -> Tuple[bool, List[float], float]:
         start = time.time()
@@ -131,14 +171,19 @@ class DdAlgLeafPyomo(IAlgLeaf):
         Args:
             values: The values to be set.
         """
+        self._fix_variables(values)
+        self.solver.solve()
+
+    def _fix_variables(self, values: List[float]) -> None:
         self.coupling_values: List[float] = values
         for i, var in enumerate(self.solver.vars):
             var.fix(values[i])
         self.solver.activate_original_objective()
-        self.solver.solve()
 
-    def save(self, dir: Path) -> None:
-        self.solver.save(dir)
-        path = dir / "step_time.csv"
-        df = pd.DataFrame(self.step_time, columns=["step_time"])
-        df.to_csv(path, index=False)
+    def save(self, results: NodeResults) -> None:
+        self.solver.save(results)
+        results.add(
+            "step_time",
+            {"step": list(range(len(self.step_time))), "step_time": self.step_time},
+        )
+        self.cache.save(results)
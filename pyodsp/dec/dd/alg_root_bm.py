@@ -1,7 +1,6 @@
-from typing import List, Dict, Tuple
-from pathlib import Path
+from typing import Any, List, Dict, Tuple
 import time
-import pandas as pd
+import numpy as np
 import logging
 
 from pyomo.environ import ConcreteModel, ScalarVar, Objective, Var
@@ -13,10 +12,13 @@ from .mip_heuristic_root import IMipHeuristicRoot, aggregate_final_up_messages
 from pyodsp.alg.bm.bm import BundleMethod
 from pyodsp.alg.bm.pbm import ProximalBundleMethod
 from pyodsp.alg.bm.cuts import CutList
-from pyodsp.alg.bm.cuts_manager import CutInfo
+from pyodsp.alg.bm.cuts_manager import CutInfo, SharedCutStore
+from pyodsp.alg.bm.cut_library import fingerprint
 from pyodsp.alg.params import BM_DUMMY_BOUND
 from pyodsp.solver.pyomo_solver import SolverConfig
 from pyodsp.dec.node._message import NodeIdx
+from pyodsp.results import NodeResults
+from pyodsp.trace import span
 
 
 class DdAlgRootBm(IAlgRoot):
@@ -29,6 +31,7 @@ class DdAlgRootBm(IAlgRoot):
         heuristic: IMipHeuristicRoot | None = None,
         max_iteration=1000,
         mode: str | None = None,
+        heuristic_frequency: int = 0,
     ) -> None:
         self.coupling_model = coupling_model
         self.vars_dn = vars_dn
@@ -39,7 +42,11 @@ class DdAlgRootBm(IAlgRoot):
         self.num_constrs = mc.num_constrs
         self._is_minimize = is_minimize
         self.heuristic = heuristic
+        # root steps between runs of the heuristic, 0 to only run it at the end
+        self.heuristic_frequency = heuristic_frequency
+        self.groups: List[List[NodeIdx]] | None = None
 
+        self.is_heuristic_built = False
         self.is_finalized = False
 
         self.mode = mode
@@ -50,8 +57,16 @@ class DdAlgRootBm(IAlgRoot):
         else:
             raise ValueError(f"Invalid mode {mode}")
         self.step_time: List[float] = []
+        self.num_popped_steps = 0
         self.lagrangian_solution: list[float] | None = None
 
+        # multiplier rows each child is coupled through, and their last sent values
+        self.child_rows: Dict[NodeIdx, np.ndarray] = {
+            child_id: np.flatnonzero(matrix.getnnz(axis=1) > 0)
+            for child_id, matrix in self.lagrangian_data.matrix.items()
+        }
+        self.sent_values: Dict[NodeIdx, np.ndarray] = {}
+
     def get_vars_dn(self) -> Dict[int, List[ScalarVar]]:
         return self.vars_dn
 
@@ -108,22 +123,76 @@ class DdAlgRootBm(IAlgRoot):
             assert type(self.bm) is ProximalBundleMethod
             self.bm.set_init_solution([0.0 for _ in range(self.num_constrs)])
             self.bm.build(num_cuts)
+        if self.heuristic is not None:
+            self.heuristic.set_master(self.solver, self.get_cuts())
 
     def run_step(self, cuts_list: List[CutList] | None) -> Tuple[int, DdDnMessage]:
         start = time.time()
         status, solution, objective = self.bm.run_step(cuts_list)
+        if self.heuristic is not None and cuts_list is not None:
+            self.heuristic.update(cuts_list)
+        if (
+            self.heuristic is not None
+            and self.heuristic_frequency > 0
+            and self.groups is not None
+            and cuts_list is not None
+            and (len(self.step_time) + 1) % self.heuristic_frequency == 0
+        ):
+            self._run_heuristic(self.groups)
         self.step_time.append(time.time() - start)
         self.lagrangian_solution = solution
         return status, DdDnMessage(solution)
 
+    def set_groups(self, groups: List[List[NodeIdx]]) -> None:
+        self.groups = groups
+
+    def set_cut_store(self, store: SharedCutStore | None) -> None:
+        self.bm.set_cut_store(store)
+
+    def pop_cut_changes(self) -> Dict[str, Any]:
+        return self.bm.pop_cut_changes()
+
+    def apply_cut_changes(self, changes: Dict[str, Any]) -> None:
+        self.bm.apply_cut_changes(changes)
+
+    def pop_worker_stats(self) -> List[float]:
+        step_time = self.step_time[self.num_popped_steps :]
+        self.num_popped_steps = len(self.step_time)
+        return step_time
+
+    def add_worker_stats(self, stats: List[float]) -> None:
+        self.step_time.extend(stats)
+
     def reset_iteration(self) -> None:
         self.bm.reset_iteration()
 
+    def get_checkpoint_state(self) -> Dict[str, Any]:
+        return {
+            "bm": self.bm.get_state(),
+            "step_time": list(self.step_time),
+            "lagrangian_solution": self.lagrangian_solution,
+            "sent_values": dict(self.sent_values),
+        }
+
+    def set_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        self.bm.set_state(state["bm"])
+        self.step_time = list(state["step_time"])
+        self.lagrangian_solution = state["lagrangian_solution"]
+        self.sent_values = dict(state["sent_values"])
+
     def get_final_dn_message(self, **kwargs) -> DdFinalDnMessage:
         if self.heuristic is None:
             return DdFinalDnMessage(None)
         if not self.is_finalized:
-            groups = kwargs["groups"]
+            # run once more with the columns added since the last run
+            self._run_heuristic(kwargs["groups"])
+            self.is_finalized = True
+        node_id = kwargs["node_id"]
+        return self.final_solutions[node_id]
+
+    def _run_heuristic(self, groups: List[List[NodeIdx]]) -> None:
+        assert self.heuristic is not None
+        if not self.is_heuristic_built:
             self.heuristic.build(
                 groups=groups,
                 coupling_model=self.coupling_model,
@@ -132,10 +201,9 @@ class DdAlgRootBm(IAlgRoot):
                 is_minimize=self.is_minimize(),
                 lagrangian=self.lagrangian_solution,
             )
+            self.is_heuristic_built = True
+        with span("heuristic"):
             self.final_solutions = self.heuristic.run_init()
-            self.is_finalized = True
-        node_id = kwargs["node_id"]
-        return self.final_solutions[node_id]
 
     def pass_final_up_message(
         self, messages: dict[NodeIdx, DdFinalUpMessage]
@@ -147,17 +215,51 @@ class DdAlgRootBm(IAlgRoot):
     def get_num_vars(self) -> int:
         return self.bm.get_num_vars()
 
+    def get_children_to_solve(
+        self, message: DdDnMessage, children: List[NodeIdx]
+    ) -> List[NodeIdx]:
+        solution = np.asarray(message.get_solution())
+        targets = []
+        for child_id in children:
+            values = solution[self.child_rows[child_id]]
+            sent = self.sent_values.get(child_id)
+            if sent is not None and np.array_equal(sent, values):
+                # none of the multipliers of the child changed
+                continue
+            self.sent_values[child_id] = values
+            targets.append(child_id)
+        return targets
+
     def add_cuts(self, cuts_list: List[CutList]) -> None:
         self.bm.add_cuts(cuts_list)
 
     def get_cuts(self) -> List[List[CutInfo]]:
         return self.bm.get_cuts()
 
-    def save(self, dir: Path) -> None:
-        self.bm.save(dir)
-        path = dir / "step_time.csv"
-        df = pd.DataFrame(self.step_time, columns=["step_time"])
-        df.to_csv(path, index=False)
+    def get_fingerprint(self) -> str:
+        # the cuts support the dual functions of the children, which depend on
+        # their coupling matrices but not on the right-hand sides
+        return fingerprint(
+            [constr.name for constr in self.lagrangian_data.constraints],
+            [
+                (
+                    child_id,
+                    [var.name for var in self.vars_dn[child_id]],
+                    matrix.shape,
+                    matrix.indptr.tobytes(),
+                    matrix.indices.tobytes(),
+                    matrix.data.tobytes(),
+                )
+                for child_id, matrix in self.lagrangian_data.matrix.items()
+            ],
+        )
+
+    def save(self, results: NodeResults) -> None:
+        self.bm.save(results)
+        results.add(
+            "step_time",
+            {"step": list(range(len(self.step_time))), "step_time": self.step_time},
+        )
 
     def set_logger(self, node_id: int, depth: int, level: int = logging.INFO) -> None:
         self.bm.set_logger(node_id, depth, level)
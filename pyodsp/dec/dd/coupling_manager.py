@@ -1,56 +1,36 @@
-from typing import List, Dict
+from typing import TYPE_CHECKING, List
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
 
 
 class CouplingManager:
     def __init__(
-        self, coupling_matrix: List[Dict[int, float]], len_vars: int, is_minimize: bool
+        self, coupling_matrix: "csr_matrix", len_vars: int, is_minimize: bool
     ) -> None:
+        from scipy.sparse import csr_matrix
+
         self.len_vars = len_vars
         self.is_minimize = is_minimize
-        self.row_major: List[Dict[int, float]] = coupling_matrix
-        self.len_constrs = len(coupling_matrix)
-        self.col_major: List[Dict[int, float]] = self._convert_to_col_major(
-            coupling_matrix
-        )
-
-    def _convert_to_col_major(
-        self, row_major: List[Dict[int, float]]
-    ) -> List[Dict[int, float]]:
-        cols: List[Dict[int, float]] = [{} for _ in range(self.len_vars)]
-        for i, row in enumerate(row_major):
-            for j, val in row.items():
-                cols[j][i] = val
-        return cols
-
-    def dual_times_matrix(self, dual_values: List[float]) -> List[float]:
+        self.len_constrs = coupling_matrix.shape[0]
+        self.row_major: csr_matrix = csr_matrix(coupling_matrix)
+        # csr of the transpose, i.e. the csc layout of the coupling matrix
+        self.col_major: csr_matrix = self.row_major.T.tocsr()
+        self.sign = 1.0 if is_minimize else -1.0
+
+    def dual_times_matrix(self, dual_values: List[float] | np.ndarray) -> np.ndarray:
         # multiply dual_values and coupling_matrix
-        coeffs = [0.0] * self.len_vars
-        for j, col in enumerate(self.col_major):
-            coeff = 0.0
-            for i, val in col.items():
-                coeff += dual_values[i] * val
-            if self.is_minimize:
-                coeffs[j] = coeff
-            else:
-                coeffs[j] = -coeff
-        return coeffs
-
-    def matrix_times_primal(self, primal_values: List[float]) -> List[float]:
+        return self.sign * (self.col_major @ np.asarray(dual_values, dtype=float))
+
+    def matrix_times_primal(
+        self, primal_values: List[float] | np.ndarray
+    ) -> np.ndarray:
         # multiply coupling_matrix and primal
-        coeffs = [0.0] * self.len_constrs
-        for i, row in enumerate(self.row_major):
-            coeff = 0.0
-            for j, val in row.items():
-                coeff += val * primal_values[j]
-            if self.is_minimize:
-                coeffs[i] = -coeff
-            else:
-                coeffs[i] = coeff
-        return coeffs
-
-    def inner_product(self, x: List[float], y: List[float]) -> float:
-        product = 0.0
-        for xval, yval in zip(x, y):
-            product += xval * yval
-
-        return product
+        return -self.sign * (self.row_major @ np.asarray(primal_values, dtype=float))
+
+    def inner_product(
+        self, x: List[float] | np.ndarray, y: List[float] | np.ndarray
+    ) -> float:
+        return float(np.dot(x, y))
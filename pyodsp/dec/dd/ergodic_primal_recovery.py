@@ -0,0 +1,133 @@
+from typing import List, Dict
+
+import numpy as np
+from pyomo.environ import ScalarVar, Suffix, Var
+
+from pyodsp.solver.pyomo_solver import PyomoSolver
+from pyodsp.alg.bm.cuts import CutList, OptimalityCut
+from pyodsp.alg.bm.cuts_manager import CutInfo
+from pyodsp.alg.params import BM_ABS_TOLERANCE, BM_LAMBDA_BOUND
+from .message import DdFinalDnMessage, DdFinalUpMessage
+from .mip_heuristic_root import IMipHeuristicRoot, aggregate_final_up_messages
+from pyodsp.dec.node._message import NodeIdx
+
+
+class ErgodicAverage:
+    """Running weighted average of the primal points of one group."""
+
+    def __init__(self) -> None:
+        self.weight = 0.0
+        self.solution = np.empty(0)
+
+    def push(self, solution: np.ndarray, weight: float) -> None:
+        self.weight += weight
+        if self.weight == weight:
+            self.solution = solution.copy()
+            return
+        self.solution += (weight / self.weight) * (solution - self.solution)
+
+
+class ErgodicPrimalRecovery(IMipHeuristicRoot):
+    """Primal recovery from running averages of dual-weighted leaf solutions.
+
+    After every solve of the master, the duals of the cuts of a group are the
+    weights of its leaf solutions in the convexified primal problem restricted to
+    the current cuts. The primal point they combine satisfies the coupling
+    constraints, unless the master is held by the artificial bounds on the
+    multipliers or on theta, in which case the step is skipped. The points of
+    the steps are averaged with weights k ** weight_power, k being the number of
+    averaged steps, so that later, more accurate steps count more. No restricted
+    master is solved.
+
+    Args:
+        weight_power: exponent of the step weights, 0 for the uniform average
+    """
+
+    def __init__(self, weight_power: float = 1.0) -> None:
+        self.weight_power = weight_power
+        self.master: PyomoSolver | None = None
+        self.cuts: List[List[CutInfo]] = []
+        self.averages: List[ErgodicAverage] = []
+        self.num_steps = 0
+
+    def set_master(self, master: PyomoSolver, cuts: List[List[CutInfo]]) -> None:
+        self.master = master
+        self.cuts = cuts
+        self.averages = [ErgodicAverage() for _ in cuts]
+        model = master.model
+        if model.component("dual") is None:
+            model.dual = Suffix(direction=Suffix.IMPORT)
+
+    def update(self, cuts_list: List[CutList]) -> None:
+        assert self.master is not None
+        if not self.master.is_optimal() or self._is_artificially_bounded():
+            return
+        points = [self._get_point(infos) for infos in self.cuts]
+        if any(point is None for point in points):
+            return
+        self.num_steps += 1
+        weight = float(self.num_steps) ** self.weight_power
+        for average, point in zip(self.averages, points):
+            assert point is not None
+            average.push(point, weight)
+
+    def _is_artificially_bounded(self) -> bool:
+        assert self.master is not None
+        # the dummy bounds on theta are larger than the bounds on the multipliers
+        for var in self.master.model.component_data_objects(Var, active=True):
+            if var.value is None:
+                continue
+            for bound in (var.lb, var.ub):
+                if (
+                    bound is not None
+                    and abs(bound) >= BM_LAMBDA_BOUND
+                    and abs(var.value - bound) <= BM_ABS_TOLERANCE
+                ):
+                    return True
+        return False
+
+    def _get_point(self, infos: List[CutInfo]) -> np.ndarray | None:
+        assert self.master is not None
+        dual = self.master.model.dual
+        point = None
+        mass = 0.0
+        for info in infos:
+            # dual values are the derivatives of the master objective by the right
+            # hand sides, which are nonnegative for the cuts in both senses
+            weight = dual.get(info.constraint, 0.0)
+            assert weight >= -BM_ABS_TOLERANCE, f"Negative cut dual {weight}"
+            if weight <= 0.0:
+                continue
+            # rays are directions, only the points carry the convexity weight
+            if isinstance(info.cut, OptimalityCut):
+                mass += weight
+            vector = weight * np.asarray(info.cut.info["solution"], dtype=float)
+            point = vector if point is None else point + vector
+        # theta has coefficient one, so the weights of the points sum up to one
+        # unless part of it is held by the bound on theta
+        if point is None or abs(mass - 1.0) > BM_ABS_TOLERANCE:
+            return None
+        return point
+
+    def build(self, **kwargs) -> None:
+        self.groups: List[List[int]] = kwargs["groups"]
+        self.vars_dn: Dict[int, List[ScalarVar]] = kwargs["vars_dn"]
+        for group in self.groups:
+            if len(group) != 1:
+                raise ValueError(
+                    "ErgodicPrimalRecovery requires one child per group, the cuts "
+                    f"of group {group} combine the solutions of several children"
+                )
+
+    def run_init(self) -> Dict[int, DdFinalDnMessage]:
+        solutions = {}
+        for g, group in enumerate(self.groups):
+            idx = group[0]
+            solution = None
+            if g < len(self.averages) and self.averages[g].weight > 0.0:
+                solution = self.averages[g].solution.tolist()
+            solutions[idx] = DdFinalDnMessage(solution)
+        return solutions
+
+    def run_final(self, messages: dict[NodeIdx, DdFinalUpMessage]) -> DdFinalUpMessage:
+        return aggregate_final_up_messages(messages)
@@ -1,5 +1,6 @@
 from typing import List, Dict
 
+import numpy as np
 from pyomo.environ import (
     ConcreteModel,
     Var,
@@ -9,9 +10,9 @@ from pyomo.environ import (
     minimize,
     maximize,
     NonNegativeReals,
-    Reals,
     ScalarVar,
 )
+from pyomo.core.expr.numeric_expr import LinearExpression
 
 from pyodsp.dec.utils import get_nonzero_coefficients_group
 from pyodsp.solver.pyomo_solver import PyomoSolver, SolverConfig
@@ -32,50 +33,75 @@ class MasterCreator:
         self.solver_config = solver_config
 
     def create(self) -> PyomoSolver:
+        """Create the master in reduced form.
+
+        A multiplier ld = ld_plus - ld_minus is bounded below by 0 if the
+        constraint has no lower bound and above by 0 if it has no upper bound.
+        The split into ld_plus and ld_minus is only kept for ranged constraints,
+        whose two bounds enter the objective with different coefficients.
+        """
+        lbs = self.lagrangian_data.lbs
+        ubs = self.lagrangian_data.ubs
+        has_lb = np.isfinite(lbs)
+        has_ub = np.isfinite(ubs)
+        ranged = has_lb & has_ub & (lbs != ubs)
+
+        ld_lb = np.where(has_lb, -BM_LAMBDA_BOUND, 0.0)
+        ld_ub = np.where(has_ub, BM_LAMBDA_BOUND, 0.0)
+        ld_lb[ranged] = -BM_LAMBDA_BOUND
+        ld_ub[ranged] = BM_LAMBDA_BOUND
+        # dual objective: -ub * ld_plus + lb * ld_minus
+        plus_coeffs = np.where(has_ub & (np.abs(ubs) > DEC_CUT_ABS_TOL), -ubs, 0.0)
+        minus_coeffs = np.where(has_lb & (np.abs(lbs) > DEC_CUT_ABS_TOL), lbs, 0.0)
+        # without a range, ld carries the term of the only (or equal) bound
+        ld_coeffs = np.where(has_ub, plus_coeffs, -minus_coeffs)
+        ld_coeffs[ranged] = 0.0
+        if not self.is_minimize:
+            ld_coeffs, plus_coeffs, minus_coeffs = (
+                -ld_coeffs,
+                -plus_coeffs,
+                -minus_coeffs,
+            )
+
         master: ConcreteModel = ConcreteModel()
+        ld_bounds = dict(enumerate(zip(ld_lb.tolist(), ld_ub.tolist())))
+        master.ld = Var(
+            RangeSet(0, self.num_constrs - 1),
+            bounds=lambda m, i: ld_bounds[i],
+            initialize=0,
+        )
 
+        ranged_idx = np.flatnonzero(ranged).tolist()
         master.ld_plus = Var(
-            RangeSet(0, self.num_constrs - 1),
+            ranged_idx,
             domain=NonNegativeReals,
             bounds=(0, BM_LAMBDA_BOUND),
             initialize=0,
         )
         master.ld_minus = Var(
-            RangeSet(0, self.num_constrs - 1),
+            ranged_idx,
             domain=NonNegativeReals,
             bounds=(0, BM_LAMBDA_BOUND),
             initialize=0,
         )
-        for i in range(self.num_constrs):
-            if self.lagrangian_data.lbs[i] is None:
-                master.ld_minus[i].fix(0)
-            if self.lagrangian_data.ubs[i] is None:
-                master.ld_plus[i].fix(0)
-        master.ld = Var(RangeSet(0, self.num_constrs - 1), domain=Reals, initialize=0)
 
         def constr_rule(m, i):
             return m.ld[i] == m.ld_plus[i] - m.ld_minus[i]
 
-        master.constr = Constraint(RangeSet(0, self.num_constrs - 1), rule=constr_rule)
-
-        def min_obj(m):
-            expr = 0.0
-            for i in range(self.num_constrs):
-                ub = self.lagrangian_data.ubs[i]
-                if ub is not None and abs(ub) > DEC_CUT_ABS_TOL:
-                    expr -= ub * m.ld_plus[i]
-                lb = self.lagrangian_data.lbs[i]
-                if lb is not None and abs(lb) > DEC_CUT_ABS_TOL:
-                    expr += lb * m.ld_minus[i]
-            return expr
+        master.constr = Constraint(ranged_idx, rule=constr_rule)
 
-        def max_obj(m):
-            return -min_obj(m)
-
-        if self.is_minimize:
-            master.objective = Objective(rule=min_obj, sense=maximize)
-        else:
-            master.objective = Objective(rule=max_obj, sense=minimize)
+        nonzero = np.flatnonzero(ld_coeffs).tolist()
+        coefs = ld_coeffs[nonzero].tolist()
+        variables = [master.ld[i] for i in nonzero]
+        for i in ranged_idx:
+            coefs.extend([plus_coeffs[i], minus_coeffs[i]])
+            variables.extend([master.ld_plus[i], master.ld_minus[i]])
+        expr = LinearExpression(
+            constant=0.0, linear_coefs=[float(c) for c in coefs], linear_vars=variables
+        )
+        master.objective = Objective(
+            expr=expr, sense=maximize if self.is_minimize else minimize
+        )
 
         lagrangian_duals: List[ScalarVar] = [
             master.ld[i] for i in range(self.num_constrs)
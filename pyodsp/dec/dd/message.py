@@ -1,4 +1,5 @@
-from typing import List, Dict
+from typing import TYPE_CHECKING, List
+
 from ..node._message import (
     InitDnMessage,
     InitUpMessage,
@@ -9,15 +10,19 @@ from ..node._message import (
 )
 from pyodsp.alg.bm.cuts import Cut
 
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
 
 class DdInitDnMessage(InitDnMessage):
-    def __init__(
-        self, coupling_matrix: List[Dict[int, float]], is_minimize: bool
-    ) -> None:
+    __slots__ = ("coupling_matrix", "is_minimize", "fingerprint_requested", "depth")
+
+    def __init__(self, coupling_matrix: "csr_matrix", is_minimize: bool) -> None:
         self.coupling_matrix = coupling_matrix
         self.is_minimize = is_minimize
+        self.fingerprint_requested = False
 
-    def get_coupling_matrix(self):
+    def get_coupling_matrix(self) -> "csr_matrix":
         return self.coupling_matrix
 
     def get_is_minimize(self) -> bool:
@@ -29,10 +34,19 @@ class DdInitDnMessage(InitDnMessage):
     def get_depth(self) -> int:
         return self.depth
 
+    def set_fingerprint_requested(self, requested: bool) -> None:
+        self.fingerprint_requested = requested
+
+    def is_fingerprint_requested(self) -> bool:
+        return self.fingerprint_requested
+
 
 class DdInitUpMessage(InitUpMessage):
+    __slots__ = ("bound", "fingerprint")
+
     def __init__(self) -> None:
         self.bound = None
+        self.fingerprint = None
 
     def set_bound(self, bound: float | None) -> None:
         self.bound = bound
@@ -40,8 +54,16 @@ class DdInitUpMessage(InitUpMessage):
     def get_bound(self) -> float | None:
         return self.bound
 
+    def set_fingerprint(self, fingerprint: str | None) -> None:
+        self.fingerprint = fingerprint
+
+    def get_fingerprint(self) -> str | None:
+        return self.fingerprint
+
 
 class DdUpMessage(UpMessage):
+    __slots__ = ("cut",)
+
     def __init__(self, cut: Cut) -> None:
         self.cut = cut
 
@@ -53,6 +75,8 @@ class DdUpMessage(UpMessage):
 
 
 class DdDnMessage(DnMessage):
+    __slots__ = ("solution",)
+
     def __init__(self, solution: List[float]) -> None:
         self.solution = solution
 
@@ -64,6 +88,8 @@ class DdDnMessage(DnMessage):
 
 
 class DdFinalDnMessage(FinalDnMessage):
+    __slots__ = ("solution",)
+
     def __init__(self, solution: List[float] | None) -> None:
         self.solution = solution
 
@@ -72,6 +98,8 @@ class DdFinalDnMessage(FinalDnMessage):
 
 
 class DdFinalUpMessage(FinalUpMessage):
+    __slots__ = ("objective", "solution")
+
     def __init__(
         self, objective: float | None, solution: list[float] | None = None
     ) -> None:
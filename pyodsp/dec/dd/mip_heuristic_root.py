@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Set, Tuple
 
+import numpy as np
 from pyomo.environ import (
     ConcreteModel,
     Var,
@@ -13,8 +14,10 @@ from pyomo.environ import (
     maximize,
     value,
 )
+from pyomo.core.expr.numeric_expr import LinearExpression
+
 from pyodsp.solver.pyomo_solver import PyomoSolver, SolverConfig
-from pyodsp.alg.bm.cuts import OptimalityCut
+from pyodsp.alg.bm.cuts import CutList, FeasibilityCut
 from pyodsp.alg.bm.cuts_manager import CutInfo
 from .message import DdFinalDnMessage, DdFinalUpMessage
 from pyodsp.dec.node._message import NodeIdx
@@ -25,6 +28,16 @@ class IMipHeuristicRoot(ABC):
     def build(self, **kwargs) -> None:
         pass
 
+    def set_master(self, master: PyomoSolver, cuts: List[List[CutInfo]]) -> None:
+        """Receives the master of the bundle method and its active cuts, which
+        are kept up to date, when the root is built; ignored by default."""
+        return
+
+    def update(self, cuts_list: List[CutList]) -> None:
+        """Receives the cuts of every root step after the master was solved with
+        them, ignored by default."""
+        return
+
     @abstractmethod
     def run_init(self) -> Dict[int, DdFinalDnMessage]:
         pass
@@ -46,9 +59,61 @@ def aggregate_final_up_messages(
     return DdFinalUpMessage(obj)
 
 
+class ColumnPool:
+    """Dense pool of the distinct leaf solutions (columns) of one group."""
+
+    def __init__(self) -> None:
+        self.num_columns = 0
+        self.columns = np.empty((0, 0))
+        self.costs = np.empty(0)
+        self.is_ray = np.empty(0, dtype=bool)
+        self._seen: Set[Tuple[bool, bytes]] = set()
+
+    def add(self, solution: List[float], cost: float, is_ray: bool) -> bool:
+        column = np.asarray(solution, dtype=float)
+        key = (is_ray, column.tobytes())
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        if self.num_columns == len(self.costs):
+            self._grow(len(column))
+        self.columns[self.num_columns] = column
+        self.costs[self.num_columns] = cost
+        self.is_ray[self.num_columns] = is_ray
+        self.num_columns += 1
+        return True
+
+    def _grow(self, width: int) -> None:
+        capacity = max(2 * len(self.costs), 8)
+        columns = np.empty((capacity, width))
+        if self.num_columns > 0:
+            columns[: self.num_columns] = self.columns[: self.num_columns]
+        costs = np.empty(capacity)
+        costs[: self.num_columns] = self.costs[: self.num_columns]
+        is_ray = np.empty(capacity, dtype=bool)
+        is_ray[: self.num_columns] = self.is_ray[: self.num_columns]
+        self.columns, self.costs, self.is_ray = columns, costs, is_ray
+
+    def get_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        n = self.num_columns
+        return self.columns[:n], self.costs[:n], self.is_ray[:n]
+
+
 class MipHeuristicRoot(IMipHeuristicRoot):
+    """Restricted master over the leaf solutions found by the bundle method.
+
+    Columns are collected from the cuts as they arrive (update), so that the
+    master also uses the leaf solutions of cuts purged from the bundle method.
+    The master is created once in build; every run_init adds the columns of
+    the groups whose pool grew since the last call and solves it, so that the
+    heuristic can be run repeatedly during the iterations.
+    """
+
     def __init__(self, solver_config: SolverConfig):
         self.solver_config = solver_config
+        self.pools: List[ColumnPool] = []
+        self.master: PyomoSolver | None = None
+        self.built_sizes: List[int] = []
 
     def _create_master(self, model: ConcreteModel, solver_config: SolverConfig):
         for obj in model.component_objects(Objective, active=True):
@@ -59,58 +124,78 @@ class MipHeuristicRoot(IMipHeuristicRoot):
             model._dd_obj = Objective(expr=0.0, sense=maximize)
         return PyomoSolver(model, solver_config, [])
 
+    def update(self, cuts_list: List[CutList]) -> None:
+        while len(self.pools) < len(cuts_list):
+            self.pools.append(ColumnPool())
+        for pool, cuts in zip(self.pools, cuts_list):
+            for cut in cuts:
+                # the cut constant is the original objective of the leaf solution
+                pool.add(cut.info["solution"], cut.rhs, isinstance(cut, FeasibilityCut))
+
     def build(self, **kwargs) -> None:
         self.groups: List[List[int]] = kwargs["groups"]
         coupling_model: ConcreteModel = kwargs["coupling_model"]
         self.cuts: List[List[CutInfo]] = kwargs["cuts"]
         self.vars_dn: Dict[int, List[ScalarVar]] = kwargs["vars_dn"]
         self.is_minimize: bool = kwargs["is_minimize"]
+        if len(self.pools) == 0:
+            self.update([CutList([info.cut for info in infos]) for infos in self.cuts])
         self.master = self._create_master(coupling_model, self.solver_config)
-        for cutlist, group in zip(self.cuts, self.groups):
+        self.built_sizes = [-1 for _ in self.groups]
+
+    def _build_master(self) -> None:
+        assert self.master is not None
+        model = self.master.model
+        coefs: List[float] = []
+        weights: List[ScalarVar] = []
+        for g, group in enumerate(self.groups):
             assert len(group) == 1
-            idx = group[0]
-            vars = self.vars_dn[idx]
-
-            num_cuts = len(cutlist)
-            minkowski_vars = Var(RangeSet(0, num_cuts - 1), domain=NonNegativeReals)
-            self.master.model.add_component(f"_vars_{idx}", minkowski_vars)
-
-            def equality_rule(m, i):
-                lhs = 0.0
-                for j, cutinfo in enumerate(cutlist):
-                    lhs += minkowski_vars[j] * cutinfo.cut.info["solution"][i]
-                return lhs == vars[i]
-
-            self.master.model.add_component(
-                f"_equality_{idx}",
-                Constraint(RangeSet(0, len(vars) - 1), rule=equality_rule),
-            )
-
-            self.master.model.add_component(
-                f"_convexity_{idx}",
-                Constraint(
-                    expr=sum(
-                        minkowski_vars[i]
-                        for i in range(num_cuts)
-                        if isinstance(cutlist[i].cut, OptimalityCut)
-                    )
-                    == 1
-                ),
+            if self.built_sizes[g] != self.pools[g].num_columns:
+                self._build_group(group[0], self.pools[g])
+                self.built_sizes[g] = self.pools[g].num_columns
+            costs = self.pools[g].get_columns()[1]
+            group_weights = model.component(f"_vars_{group[0]}")
+            coefs.extend(costs.tolist())
+            weights.extend(group_weights[j] for j in range(len(costs)))
+        model._dd_obj.expr = LinearExpression(
+            constant=0.0, linear_coefs=coefs, linear_vars=weights
+        )
+
+    def _build_group(self, idx: int, pool: ColumnPool) -> None:
+        assert self.master is not None
+        model = self.master.model
+        for name in (f"_vars_{idx}", f"_equality_{idx}", f"_convexity_{idx}"):
+            if model.component(name) is not None:
+                model.del_component(name)
+
+        vars = self.vars_dn[idx]
+        columns, _, is_ray = pool.get_columns()
+        weights = Var(RangeSet(0, pool.num_columns - 1), domain=NonNegativeReals)
+        model.add_component(f"_vars_{idx}", weights)
+
+        def equality_rule(m, i):
+            nonzero = np.flatnonzero(columns[:, i]).tolist()
+            lhs = LinearExpression(
+                constant=0.0,
+                linear_coefs=columns[nonzero, i].tolist(),
+                linear_vars=[weights[j] for j in nonzero],
             )
-
-            obj = 0.0
-            for j, cutinfo in enumerate(cutlist):
-                if self.is_minimize:
-                    rhs = cutinfo.constraint.upper
-                else:
-                    rhs = cutinfo.constraint.lower
-                assert rhs is not None
-
-                obj += rhs * minkowski_vars[j]
-
-            self.master.model._dd_obj.expr += obj
+            return lhs == vars[i]
+
+        model.add_component(
+            f"_equality_{idx}",
+            Constraint(RangeSet(0, len(vars) - 1), rule=equality_rule),
+        )
+        model.add_component(
+            f"_convexity_{idx}",
+            Constraint(
+                expr=sum(weights[j] for j in np.flatnonzero(~is_ray).tolist()) == 1
+            ),
+        )
 
     def run_init(self) -> Dict[int, DdFinalDnMessage]:
+        assert self.master is not None
+        self._build_master()
         self.master.solve()
         if self.master.is_optimal():
             solutions = {}
@@ -5,13 +5,29 @@ import logging
 from .logger import DdLogger
 from .message import DdDnMessage
 from ..node._node import INode
+from ..checkpoint import load_checkpoint
 from ..graph.hub_and_spoke import HubAndSpoke
 
 
 class DdRun:
-    def __init__(self, nodes: List[INode], filedir: Path, level: int = logging.INFO):
+    def __init__(
+        self,
+        nodes: List[INode],
+        filedir: Path,
+        level: int = logging.INFO,
+        num_workers: int = 1,
+        export_model: bool = False,
+        checkpoint_frequency: int = 0,
+    ):
         self.logger = DdLogger(level)
-        self.graph = HubAndSpoke(nodes, self.logger, filedir)
+        self.graph = HubAndSpoke(
+            nodes,
+            self.logger,
+            filedir,
+            num_workers=num_workers,
+            export_model=export_model,
+            checkpoint_frequency=checkpoint_frequency,
+        )
 
     def run(self, init_solution: List[float] | None = None) -> None:
         if init_solution is None:
@@ -22,3 +38,7 @@ class DdRun:
             dn_message = DdDnMessage(init_solution)
 
         self.graph.run(dn_message)
+
+    def resume(self, checkpoint_path: Path) -> None:
+        """Continues a run from a checkpoint written with checkpoint_frequency > 0."""
+        self.graph.run(checkpoint=load_checkpoint(checkpoint_path))
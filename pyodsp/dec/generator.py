@@ -0,0 +1,321 @@
+"""Random instances for stress testing the decomposition methods.
+
+The instances are feasible by construction and reproducible from the seed. The
+generators return the nodes ready to be passed to BdRun, DdRun and SddpRun.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.core.expr.numeric_expr import LinearExpression
+
+from pyodsp.solver.pyomo_solver import PyomoSolver, SolverConfig
+from .node._node import INode
+from .node.dec_node import DecNodeRoot, DecNodeLeaf, DecNodeInner
+from .bd.alg_root_bm import BdAlgRootBm
+from .bd.alg_leaf_pyomo import BdAlgLeafPyomo
+from .dd.alg_root_bm import DdAlgRootBm
+from .dd.alg_leaf_pyomo import DdAlgLeafPyomo
+from .dd.mip_heuristic_root import IMipHeuristicRoot
+
+RECOURSE_PENALTY = 1000.0
+
+
+def _sparse_rows(
+    rng: np.random.Generator,
+    num_rows: int,
+    num_cols: int,
+    density: float,
+    low: float,
+    high: float,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Column indices and values of a random matrix, at least one entry per row."""
+    rows = []
+    for _ in range(num_rows):
+        cols = np.flatnonzero(rng.random(num_cols) < density)
+        if len(cols) == 0:
+            cols = rng.integers(num_cols, size=1)
+        rows.append((cols, rng.uniform(low, high, size=len(cols))))
+    return rows
+
+
+def _linear(coefs: np.ndarray, vars: List[pyo.ScalarVar]) -> LinearExpression:
+    return LinearExpression(
+        constant=0.0, linear_coefs=coefs.tolist(), linear_vars=list(vars)
+    )
+
+
+def _indexed_vars(var: pyo.Var) -> List[pyo.ScalarVar]:
+    return [var[j] for j in var.index_set()]
+
+
+def generate_two_stage(
+    num_scenarios: int,
+    num_first: int = 10,
+    num_second: int = 20,
+    num_rows: int = 10,
+    density: float = 0.3,
+    integer: bool = False,
+    infeasibility_rate: float = 0.0,
+    upper: float = 10.0,
+    seed: int = 0,
+    solver: str = "appsi_highs",
+) -> List[INode]:
+    """Two-stage stochastic program for BdRun.
+
+    Each scenario covers its demand rows with its own variables and the first
+    stage variables. A scenario with incomplete recourse (at the given rate)
+    has no penalized shortage, so small first stage decisions are infeasible
+    for it and produce feasibility cuts.
+
+    Args:
+        num_scenarios: The number of second stage subproblems.
+        num_first: The number of first stage (coupling) variables.
+        num_second: The number of second stage variables of each scenario.
+        num_rows: The number of demand rows of each scenario.
+        density: The fraction of nonzero coefficients in the demand rows.
+        integer: Whether the first stage variables are integer.
+        infeasibility_rate: The fraction of scenarios without complete recourse.
+        upper: The upper bound of every variable.
+        seed: The random seed.
+        solver: The solver of every node.
+    """
+    rng = np.random.default_rng(seed)
+    config = SolverConfig(solver_name=solver)
+
+    model = pyo.ConcreteModel()
+    domain = pyo.NonNegativeIntegers if integer else pyo.NonNegativeReals
+    model.x = pyo.Var(range(num_first), domain=domain, bounds=(0, upper))
+    x = _indexed_vars(model.x)
+    model.obj = pyo.Objective(
+        expr=_linear(rng.uniform(1.0, 10.0, size=num_first), x), sense=pyo.minimize
+    )
+    root = DecNodeRoot(0, BdAlgRootBm(PyomoSolver(model, config, x)))
+
+    nodes: List[INode] = [root]
+    for s in range(1, num_scenarios + 1):
+        block = pyo.ConcreteModel()
+        block.x = pyo.Var(range(num_first), domain=pyo.Reals)
+        block.y = pyo.Var(range(num_second), domain=pyo.NonNegativeReals)
+        block.y.setub(upper)
+        x_up = _indexed_vars(block.x)
+        y = _indexed_vars(block.y)
+        recourse = rng.random() >= infeasibility_rate
+
+        w_rows = _sparse_rows(rng, num_rows, num_second, density, 1.0, 5.0)
+        t_rows = _sparse_rows(rng, num_rows, num_first, density, 1.0, 5.0)
+        block.shortage = pyo.Var(range(num_rows), domain=pyo.NonNegativeReals)
+        block.demand = pyo.ConstraintList()
+        for i, ((w_cols, w_vals), (t_cols, t_vals)) in enumerate(zip(w_rows, t_rows)):
+            # half of the demand is met by y at its bounds, the rest by x <= upper
+            demand = 0.5 * upper * w_vals.sum() + rng.uniform(0.0, upper * t_vals.sum())
+            lhs = _linear(
+                np.concatenate([w_vals, t_vals]),
+                [y[j] for j in w_cols] + [x_up[j] for j in t_cols],
+            )
+            if recourse:
+                lhs = lhs + block.shortage[i]
+            block.demand.add(lhs >= demand)
+
+        costs = rng.uniform(1.0, 10.0, size=num_second)
+        block.obj = pyo.Objective(
+            expr=_linear(costs, y)
+            + RECOURSE_PENALTY * pyo.quicksum(_indexed_vars(block.shortage)),
+            sense=pyo.minimize,
+        )
+        leaf = DecNodeLeaf(s, BdAlgLeafPyomo(PyomoSolver(block, config, x_up)))
+        leaf.set_bound(0.0)
+        root.add_child(s, multiplier=1 / num_scenarios)
+        nodes.append(leaf)
+    return nodes
+
+
+def generate_block_angular(
+    num_blocks: int,
+    num_vars: int = 10,
+    num_rows: int = 5,
+    num_linking: int = 5,
+    density: float = 0.3,
+    coupling_density: float = 0.5,
+    integer: bool = False,
+    upper: float = 10.0,
+    seed: int = 0,
+    solver: str = "appsi_highs",
+    heuristic: IMipHeuristicRoot | None = None,
+) -> List[INode]:
+    """Block-angular program with linking capacity rows for DdRun.
+
+    Args:
+        num_blocks: The number of subproblems.
+        num_vars: The number of variables of each block.
+        num_rows: The number of local rows of each block.
+        num_linking: The number of linking rows.
+        density: The fraction of nonzero coefficients in a row of a block.
+        coupling_density: The fraction of blocks taking part in each linking row.
+        integer: Whether the block variables are integer.
+        upper: The upper bound of every variable.
+        seed: The random seed.
+        solver: The solver of every node.
+        heuristic: The primal heuristic of the root.
+    """
+    rng = np.random.default_rng(seed)
+    config = SolverConfig(solver_name=solver)
+    domain = pyo.NonNegativeIntegers if integer else pyo.NonNegativeReals
+
+    coupling = pyo.ConcreteModel()
+    coupling.x = pyo.Var(
+        range(1, num_blocks + 1), range(num_vars), domain=domain, bounds=(0, upper)
+    )
+    vars_dn = {
+        k: [coupling.x[k, j] for j in range(num_vars)] for k in range(1, num_blocks + 1)
+    }
+    coupling.linking = pyo.ConstraintList()
+    for _ in range(num_linking):
+        blocks = np.flatnonzero(rng.random(num_blocks) < coupling_density) + 1
+        if len(blocks) == 0:
+            blocks = rng.integers(1, num_blocks + 1, size=1)
+        coefs: List[np.ndarray] = []
+        vars: List[pyo.ScalarVar] = []
+        for k in blocks.tolist():
+            ((cols, vals),) = _sparse_rows(rng, 1, num_vars, density, 1.0, 5.0)
+            coefs.append(vals)
+            vars.extend(vars_dn[k][j] for j in cols)
+        values = np.concatenate(coefs)
+        # x = 0 is feasible, and the capacity binds at about a quarter of the bounds
+        coupling.linking.add(_linear(values, vars) <= 0.25 * upper * values.sum())
+    root = DecNodeRoot(0, DdAlgRootBm(coupling, True, config, vars_dn, heuristic))
+
+    nodes: List[INode] = [root]
+    for k in range(1, num_blocks + 1):
+        block = pyo.ConcreteModel()
+        block.x = pyo.Var(range(num_vars), domain=domain, bounds=(0, upper))
+        x = _indexed_vars(block.x)
+        block.local = pyo.ConstraintList()
+        for cols, vals in _sparse_rows(rng, num_rows, num_vars, density, 1.0, 5.0):
+            lhs = _linear(vals, [x[j] for j in cols])
+            block.local.add(lhs <= 0.5 * upper * vals.sum())
+        block.obj = pyo.Objective(
+            expr=_linear(-rng.uniform(1.0, 10.0, size=num_vars), x),
+            sense=pyo.minimize,
+        )
+        leaf = DecNodeLeaf(k, DdAlgLeafPyomo(PyomoSolver(block, config, x)))
+        root.add_child(k)
+        nodes.append(leaf)
+    return nodes
+
+
+def _lattice_stage(
+    model: pyo.ConcreteModel,
+    prev_state: List[pyo.ScalarVar],
+    mixing: List[Tuple[np.ndarray, np.ndarray]],
+    demand: np.ndarray,
+    costs: np.ndarray,
+    capacity: float,
+    holding: float,
+) -> None:
+    num_states = len(prev_state)
+    model.produce = pyo.Var(range(num_states), domain=pyo.NonNegativeReals)
+    model.produce.setub(capacity)
+    model.overtime = pyo.Var(range(num_states), domain=pyo.NonNegativeReals)
+    model.state = pyo.Var(range(num_states), domain=pyo.NonNegativeReals)
+    produce = _indexed_vars(model.produce)
+    model.balance = pyo.ConstraintList()
+    for j, (cols, vals) in enumerate(mixing):
+        model.balance.add(
+            prev_state[j]
+            + _linear(vals, [produce[i] for i in cols])
+            + model.overtime[j]
+            - model.state[j]
+            == demand[j]
+        )
+    model.obj = pyo.Objective(
+        expr=_linear(costs, produce)
+        + _linear(3.0 * costs, _indexed_vars(model.overtime))
+        + _linear(np.full(num_states, holding), _indexed_vars(model.state)),
+        sense=pyo.minimize,
+    )
+
+
+def generate_lattice(
+    num_stages: int,
+    num_nodes: int,
+    num_states: int = 5,
+    density: float = 0.3,
+    capacity: float = 2.0,
+    holding: float = 0.5,
+    seed: int = 0,
+    solver: str = "appsi_highs",
+) -> List[List[INode]]:
+    """Stagewise independent production planning lattice for SddpRun.
+
+    Each stage carries the inventory of num_states products. Production
+    contributes to the products through a sparse mixing matrix, and the demand
+    of each node is random; overtime makes the recourse complete.
+
+    Args:
+        num_stages: The number of stages.
+        num_nodes: The number of nodes of each stage after the first.
+        num_states: The number of state (coupling) variables.
+        density: The fraction of nonzero off-diagonal mixing coefficients.
+        capacity: The production capacity of each product.
+        holding: The holding cost of the inventory.
+        seed: The random seed.
+        solver: The solver of every node.
+    """
+    rng = np.random.default_rng(seed)
+    config = SolverConfig(solver_name=solver)
+    mixing = []
+    for j, (cols, vals) in enumerate(
+        _sparse_rows(rng, num_states, num_states, density, 0.1, 0.5)
+    ):
+        # each product is produced by its own line, and partly by the others
+        keep = cols != j
+        mixing.append((np.append(cols[keep], j), np.append(vals[keep], 1.0)))
+    costs = rng.uniform(1.0, 2.0, size=num_states)
+
+    model = pyo.ConcreteModel()
+    model.prev_state = pyo.Var(range(num_states), domain=pyo.NonNegativeReals)
+    model.prev_state.fix(0.0)
+    demand = rng.uniform(0.0, 2 * capacity, size=num_states)
+    _lattice_stage(
+        model, _indexed_vars(model.prev_state), mixing, demand, costs, capacity, holding
+    )
+    root_solver = PyomoSolver(model, config, _indexed_vars(model.state))
+    root = DecNodeRoot(0, BdAlgRootBm(root_solver))
+
+    nodes: List[List[INode]] = [[root]]
+    parents: List[DecNodeRoot] = [root]
+    idx = 1
+    for stage in range(1, num_stages):
+        is_last = stage == num_stages - 1
+        stage_nodes: List[INode] = []
+        for _ in range(num_nodes):
+            model = pyo.ConcreteModel()
+            model.prev_state = pyo.Var(range(num_states), domain=pyo.Reals)
+            prev_state = _indexed_vars(model.prev_state)
+            demand = rng.uniform(0.0, 2 * capacity, size=num_states)
+            _lattice_stage(
+                model,
+                prev_state,
+                mixing,
+                demand,
+                costs,
+                capacity,
+                0.0 if is_last else holding,
+            )
+            alg_leaf = BdAlgLeafPyomo(PyomoSolver(model, config, prev_state))
+            if is_last:
+                node = DecNodeLeaf(idx, alg_leaf)
+            else:
+                solver_root = PyomoSolver(model, config, _indexed_vars(model.state))
+                alg_root = BdAlgRootBm(solver_root, max_iteration=1)
+                node = DecNodeInner(idx, alg_root, alg_leaf, log_level=0)
+            node.set_bound(0.0)
+            for parent in parents:
+                parent.add_child(idx, multiplier=1 / num_nodes)
+            stage_nodes.append(node)
+            idx += 1
+        nodes.append(stage_nodes)
+        parents = [node for node in stage_nodes if isinstance(node, DecNodeRoot)]
+    return nodes
@@ -1,7 +1,7 @@
-from typing import List, Dict, Tuple
+from typing import Any, List, Dict, Set, Tuple
 from pathlib import Path
 
-from pyodsp.alg.bm.cuts import OptimalityCut, FeasibilityCut
+from pyodsp.alg.bm.cuts import FeasibilityCut
 
 from ..node._logger import ILogger
 from ..node._node import INode, INodeRoot, INodeLeaf, INodeInner
@@ -15,16 +15,42 @@ from ..node._message import (
     NodeIdx,
 )
 from ..utils import create_directory
+from ..pool import IPoolTarget, WorkerPool
+from ..checkpoint import (
+    CHECKPOINT_FILE,
+    save_checkpoint,
+    get_node_states,
+    set_node_states,
+)
 
 from pyodsp.alg.const import STATUS_NOT_FINISHED
+from pyodsp.results import ResultsSink
+from pyodsp.trace import get_tracer
 
 
-class HubAndSpoke:
-    def __init__(self, nodes: List[INode], logger: ILogger, filedir: Path) -> None:
+class HubAndSpoke(IPoolTarget):
+    def __init__(
+        self,
+        nodes: List[INode],
+        logger: ILogger,
+        filedir: Path,
+        num_workers: int = 1,
+        export_model: bool = False,
+        checkpoint_frequency: int = 0,
+    ) -> None:
         self._verify_nodes(nodes)
         self.logger = logger
         self.filedir = filedir
+        self.num_workers = num_workers
+        self.pool = WorkerPool(self, num_workers)
         create_directory(self.filedir)
+        self.results = ResultsSink(self.filedir, export_model=export_model)
+        # root steps between checkpoints, 0 to disable
+        self.checkpoint_frequency = checkpoint_frequency
+        self.num_steps = 0
+
+        # latest up message of every leaf, reused for leaves that are not re-solved
+        self.up_messages: Dict[NodeIdx, UpMessage] = {}
 
     def _verify_nodes(self, nodes: List[INode]) -> None:
         self.root: INodeRoot | None = None
@@ -43,14 +69,21 @@ class HubAndSpoke:
 
             raise ValueError(f"Unknown object of type {type(node)} detected")
 
-    def run(self, init_solution: DnMessage | None = None):
+    def run(
+        self,
+        init_solution: DnMessage | None = None,
+        checkpoint: Dict[str, Any] | None = None,
+    ):
         self.logger.log_initialization()
         self._run_init_dn()
         self._run_init_up()
         up_messages = self._run_main_preprocess(init_solution)
+        if checkpoint is not None:
+            up_messages = self._restore_checkpoint(checkpoint)
         self._run_main(up_messages)
         self.logger.log_finaliziation()
         final_obj = self._run_final()
+        self.pool.close()
         self.logger.log_completion(final_obj)
         self._save()
 
@@ -112,27 +145,75 @@ class HubAndSpoke:
         self, up_messages: Dict[NodeIdx, UpMessage] | None
     ) -> Tuple[int, DnMessage]:
         assert self.root is not None
-        return self.root.run_step(up_messages)
+        status, dn_message = self.root.run_step(up_messages)
+        if status == STATUS_NOT_FINISHED:
+            self._checkpoint_step(dn_message)
+        return status, dn_message
+
+    def _checkpoint_step(self, dn_message: DnMessage) -> None:
+        assert self.root is not None
+        self.num_steps += 1
+        if (
+            self.checkpoint_frequency == 0
+            or self.num_steps % self.checkpoint_frequency != 0
+        ):
+            return
+        save_checkpoint(
+            self.filedir / CHECKPOINT_FILE,
+            {
+                "nodes": get_node_states([self.root]),
+                "num_steps": self.num_steps,
+                "dn_message": dn_message,
+                "up_messages": self.up_messages,
+            },
+        )
+
+    def _restore_checkpoint(
+        self, checkpoint: Dict[str, Any]
+    ) -> Dict[NodeIdx, UpMessage]:
+        assert self.root is not None
+        set_node_states({self.root.get_idx(): self.root}, checkpoint["nodes"])
+        self.num_steps = checkpoint["num_steps"]
+        self.up_messages = dict(checkpoint["up_messages"])
+        # the leaves keep no state between steps, re-solve the pending step
+        return self._run_leaf(checkpoint["dn_message"])
 
     def _run_leaf(self, message: DnMessage) -> Dict[NodeIdx, UpMessage]:
+        targets = self._get_targets(message)
+        return self._merge_up_messages(self._solve_leaves(message, targets))
+
+    def _get_targets(self, message: DnMessage) -> Set[NodeIdx]:
+        assert self.root is not None
+        return set(self.root.get_children_to_solve(message))
+
+    def _solve_leaves(
+        self, message: DnMessage, targets: Set[NodeIdx]
+    ) -> Dict[NodeIdx, UpMessage]:
         up_messages = {}
         for node in self.leaves:
+            if node.get_idx() not in targets:
+                continue
             up_message = self._get_up_message(node, message)
             up_messages[node.get_idx()] = up_message
         return up_messages
 
+    def _merge_up_messages(
+        self, up_messages: Dict[NodeIdx, UpMessage]
+    ) -> Dict[NodeIdx, UpMessage]:
+        self.up_messages.update(up_messages)
+        return dict(self.up_messages)
+
     def _get_up_message(self, node: INodeLeaf, message: DnMessage) -> UpMessage:
         node.build()
         up_message = node.solve(message)
         cut_dn = up_message.get_cut()
         assert cut_dn is not None
-        if isinstance(cut_dn, OptimalityCut):
+        if self.logger.is_debug_enabled():
+            cut_type = "Optimality"
+            if isinstance(cut_dn, FeasibilityCut):
+                cut_type = "Feasibility"
             self.logger.log_sub_problem(
-                node.get_idx(), "Optimality", cut_dn.coeffs, cut_dn.rhs
-            )
-        if isinstance(cut_dn, FeasibilityCut):
-            self.logger.log_sub_problem(
-                node.get_idx(), "Feasibility", cut_dn.coeffs, cut_dn.rhs
+                node.get_idx(), cut_type, cut_dn.coeffs, cut_dn.rhs
             )
         return up_message
 
@@ -149,33 +230,79 @@ class HubAndSpoke:
         if self.root is None:
             raise ValueError("root node not found")
         self._finalize_root()
-        up_messages = {}
+        dn_messages = {}
         for leaf in self.leaves:
-            dn_message = self.root.get_final_dn_message(
+            dn_messages[leaf.get_idx()] = self.root.get_final_dn_message(
                 node_id=leaf.get_idx(), groups=self.root.get_groups()
             )
-            up_message = self._finalize_leaf(leaf, dn_message)
-            up_messages[leaf.get_idx()] = up_message
-        return up_messages
+        return self._finalize_leaves(dn_messages)
 
     def _finalize_root(self) -> None:
         return
 
+    def _finalize_leaves(
+        self, dn_messages: Dict[NodeIdx, FinalDnMessage]
+    ) -> Dict[NodeIdx, FinalUpMessage]:
+        if not self.pool.is_parallel():
+            return {
+                leaf.get_idx(): self._finalize_leaf(leaf, dn_messages[leaf.get_idx()])
+                for leaf in self.leaves
+            }
+
+        # the leaves are solved on the copies of the workers, so the final states
+        # are sent back and restored for saving
+        items = [
+            (position, dn_messages[leaf.get_idx()])
+            for position, leaf in enumerate(self.leaves)
+        ]
+        results = self.pool.map("_finalize_leaf_states", items)
+        up_messages = {}
+        for leaf, (up_message, state) in zip(self.leaves, results):
+            leaf.set_final_state(state)
+            up_messages[leaf.get_idx()] = up_message
+        return up_messages
+
+    def _finalize_leaf_states(
+        self, items: List[Tuple[int, FinalDnMessage]]
+    ) -> List[Tuple[FinalUpMessage, Any]]:
+        results = []
+        for position, dn_message in items:
+            leaf = self.leaves[position]
+            up_message = self._finalize_leaf(leaf, dn_message)
+            results.append((up_message, leaf.get_final_state()))
+        return results
+
     def _finalize_leaf(
         self, node: INodeLeaf, final_message: FinalDnMessage
     ) -> FinalUpMessage:
         node.pass_final_dn_message(final_message)
         return node.get_final_up_message()
 
+    def sync_worker(self, sync: Any) -> None:
+        # the workers are forked for the final step, after the leaves last changed
+        return
+
+    def pop_worker_stats(self) -> Dict[NodeIdx, Any]:
+        return {leaf.get_idx(): leaf.pop_worker_stats() for leaf in self.leaves}
+
+    def add_worker_stats(self, stats: Dict[NodeIdx, Any]) -> None:
+        for leaf in self.leaves:
+            leaf.add_worker_stats(stats[leaf.get_idx()])
+
     def _save(self) -> None:
         self._save_root()
         for node in self.leaves:
             self._save_leaf(node)
+        self.results.write()
+        self._save_trace()
 
     def _save_root(self) -> None:
         if self.root is None:
             raise ValueError("root node not found")
-        self.root.save(self.filedir)
+        self.root.save(self.results)
 
     def _save_leaf(self, node: INodeLeaf) -> None:
-        node.save(self.filedir)
+        node.save(self.results)
+
+    def _save_trace(self) -> None:
+        get_tracer().save(self.filedir / "trace.json")
@@ -1,8 +1,10 @@
 from pathlib import Path
-from typing import List, Dict
+from typing import Any, List, Dict, Set, Tuple
+import pickle
 from mpi4py import MPI
 
 from .hub_and_spoke import HubAndSpoke
+from ..pool import WorkerPool
 from ..node._logger import ILogger
 from ..node._node import INode
 from ..node._message import (
@@ -16,13 +18,29 @@ from ..node._message import (
 )
 
 from pyodsp.alg.const import STATUS_NOT_FINISHED
+from pyodsp.trace import get_tracer, span
 
 
 class HubAndSpokeMpi(HubAndSpoke):
-    def __init__(self, nodes: List[INode], logger: ILogger, filedir: Path) -> None:
-        super().__init__(nodes, logger, filedir)
+    def __init__(
+        self,
+        nodes: List[INode],
+        logger: ILogger,
+        filedir: Path,
+        num_workers: int = 1,
+        export_model: bool = False,
+        checkpoint_frequency: int = 0,
+    ) -> None:
+        super().__init__(
+            nodes, logger, filedir, num_workers, export_model, checkpoint_frequency
+        )
+        # an MPI rank is not forked, the leaves of a rank are finalized serially
+        self.pool = WorkerPool(self, 1)
         self.comm = MPI.COMM_WORLD
         self.rank = self.comm.Get_rank()
+        get_tracer().set_process_name(f"rank {self.rank}")
+        # all ranks must agree on how the messages are serialized
+        self.trace_comm: bool = self.comm.bcast(get_tracer().is_enabled(), root=0)
 
         self._gather_node_rank_map()
 
@@ -41,12 +59,18 @@ class HubAndSpokeMpi(HubAndSpoke):
                     for idx in ids:
                         self.node_rank_map[idx] = rank
 
-    def run(self, init_solution: DnMessage | None = None):
+    def run(
+        self,
+        init_solution: DnMessage | None = None,
+        checkpoint: Dict[str, Any] | None = None,
+    ):
         if self.rank == 0:
             self.logger.log_initialization()
             self._run_init_dn()
             self._run_init_up()
             up_messages = self._run_main_preprocess(init_solution)
+            if checkpoint is not None:
+                up_messages = self._restore_checkpoint(checkpoint)
             self._run_main(up_messages)
             self.logger.log_finaliziation()
             final_obj = self._run_final()
@@ -64,13 +88,14 @@ class HubAndSpokeMpi(HubAndSpoke):
         super()._init_root()
         assert self.root is not None
 
-        init_messages: Dict[int, Dict[NodeIdx, InitDnMessage]] = {}
+        # ranks without leaves also wait for their (empty) init messages
+        init_messages: Dict[int, Dict[NodeIdx, InitDnMessage]] = {
+            target: {} for target in range(1, self.comm.Get_size())
+        }
         for child_id in self.root.get_children():
             target = self.node_rank_map[child_id]
             if target == 0:
                 continue
-            if target not in init_messages:
-                init_messages[target] = {}
             init_messages[target][child_id] = self.root.get_init_dn_message(
                 child_id=child_id
             )
@@ -103,59 +128,76 @@ class HubAndSpokeMpi(HubAndSpoke):
             up_messages[leaf.get_idx()] = init_message
         all_up_messages = self.comm.gather(up_messages, root=0)
 
-    def _run_main_preprocess(
-        self, init_solution: DnMessage | None
-    ) -> Dict[NodeIdx, UpMessage] | None:
-        # broadcast solution
-        self.comm.bcast(init_solution, root=0)
-        up_messages = super()._run_main_preprocess(init_solution)
+    def _bcast(self, obj: Any) -> Any:
+        if not self.trace_comm:
+            return self.comm.bcast(obj, root=0)
+        # messages are pickled explicitly to time serialization apart from the wait
+        with span("serialize", "comm"):
+            data = pickle.dumps(obj) if self.rank == 0 else None
+        with span("mpi_bcast", "comm"):
+            data = self.comm.bcast(data, root=0)
+        if self.rank == 0:
+            return obj
+        with span("deserialize", "comm"):
+            return pickle.loads(data)
 
-        # gather cuts
-        all_up_messages = self.comm.gather(up_messages, root=0)
-        if init_solution is None:
+    def _gather(self, obj: Any) -> List[Any] | None:
+        if not self.trace_comm:
+            return self.comm.gather(obj, root=0)
+        with span("serialize", "comm"):
+            data = pickle.dumps(obj)
+        with span("mpi_gather", "comm"):
+            all_data = self.comm.gather(data, root=0)
+        if all_data is None:
             return None
+        with span("deserialize", "comm"):
+            return [pickle.loads(d) for d in all_data]
+
+    def _run_leaf(self, message: DnMessage) -> Dict[NodeIdx, UpMessage]:
+        targets = self._get_targets(message)
+        # broadcast solution and the leaves to be solved
+        self._bcast((message, targets))
+        up_messages = self._solve_leaves(message, targets)
+
+        # gather cuts
+        all_up_messages = self._gather(up_messages)
+        assert all_up_messages is not None
         combined_up_messages = {}
         for d in all_up_messages:
-            if d is None:
-                continue
             combined_up_messages.update(d)
-        return combined_up_messages
+        return self._merge_up_messages(combined_up_messages)
+
+    def _run_main_preprocess(
+        self, init_solution: DnMessage | None
+    ) -> Dict[NodeIdx, UpMessage] | None:
+        if init_solution is None:
+            self._bcast(None)
+        return super()._run_main_preprocess(init_solution)
 
     def _run_main_preprocess_mpi(self) -> None:
-        message: DnMessage = None
-        message = self.comm.bcast(message, root=0)
-        if message is None:
-            up_messages = None
-        else:
-            up_messages = self._run_leaf(message)
-        all_up_messages = self.comm.gather(up_messages, root=0)
+        received: Tuple[DnMessage, Set[NodeIdx]] | None = self._bcast(None)
+        if received is not None:
+            self._run_leaf_mpi(*received)
 
     def _run_main(self, up_messages: Dict[NodeIdx, UpMessage] | None) -> None:
-        combined_up_messages = up_messages
         while True:
-            status, dn_message = self._run_root(combined_up_messages)
+            status, dn_message = self._run_root(up_messages)
             if status != STATUS_NOT_FINISHED:
-                self.comm.bcast(-1, root=0)
+                self._bcast(-1)
                 break
-            # broadcast solution
-            self.comm.bcast(dn_message, root=0)
-
             up_messages = self._run_leaf(dn_message)
 
-            # gather cuts
-            all_up_messages = self.comm.gather(up_messages, root=0)
-            combined_up_messages = {}
-            for d in all_up_messages:
-                combined_up_messages.update(d)
-
     def _run_main_mpi(self) -> None:
-        message: DnMessage = None
         while True:
-            message = self.comm.bcast(message, root=0)
-            if message == -1:
+            received: Tuple[DnMessage, Set[NodeIdx]] | int = self._bcast(None)
+            if received == -1:
                 break
-            up_messages = self._run_leaf(message)
-            all_up_messages = self.comm.gather(up_messages, root=0)
+            assert isinstance(received, tuple)
+            self._run_leaf_mpi(*received)
+
+    def _run_leaf_mpi(self, message: DnMessage, targets: Set[NodeIdx]) -> None:
+        up_messages = self._solve_leaves(message, targets)
+        self._gather(up_messages)
 
     def _run_final_core(self) -> Dict[NodeIdx, FinalUpMessage]:
         up_messages = super()._run_final_core()
@@ -172,13 +214,15 @@ class HubAndSpokeMpi(HubAndSpoke):
             raise ValueError("root node not found")
 
         # split solutions
-        solutions_dict: Dict[int, Dict[int, FinalDnMessage]] = {}
+        solutions_dict: Dict[int, Dict[int, FinalDnMessage]] = {
+            target: {} for target in range(1, self.comm.Get_size())
+        }
         for child_id in self.root.get_children():
             target = self.node_rank_map[child_id]
             if target not in solutions_dict:
                 solutions_dict[target] = {}
             message = self.root.get_final_dn_message(
-                node_id=target, groups=self.root.get_groups()
+                node_id=child_id, groups=self.root.get_groups()
             )
             solutions_dict[target][child_id] = message
 
@@ -187,13 +231,36 @@ class HubAndSpokeMpi(HubAndSpoke):
 
     def _run_final_mpi(self) -> None:
         messages = self.comm.recv(source=0, tag=1)
-        up_messages = {}
-        for leaf in self.leaves:
-            dn_message = messages[leaf.get_idx()]
-            up_message = self._finalize_leaf(leaf, dn_message)
-            up_messages[leaf.get_idx()] = up_message
+        up_messages = self._finalize_leaves(messages)
         all_objs = self.comm.gather(up_messages, root=0)
 
+    def _save(self) -> None:
+        self._save_root()
+        for node in self.leaves:
+            self._save_leaf(node)
+        self._gather_results()
+        self.results.write()
+        self._save_trace()
+
     def _save_mpi(self) -> None:
         for node in self.leaves:
             self._save_leaf(node)
+        self._gather_results()
+        self._save_trace()
+
+    def _gather_results(self) -> None:
+        # the root rank writes the results of all ranks
+        all_tables = self.comm.gather(self.results.get_tables(), root=0)
+        if self.rank == 0:
+            for rank, tables in enumerate(all_tables):
+                if rank != 0:
+                    self.results.merge(tables)
+
+    def _save_trace(self) -> None:
+        tracer = get_tracer()
+        if not tracer.is_enabled():
+            return
+        all_events = self.comm.gather(tracer.get_events(), root=0)
+        if self.rank == 0:
+            events = [event for rank_events in all_events for event in rank_events]
+            tracer.save(self.filedir / "trace.json", events)
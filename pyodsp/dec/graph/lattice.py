@@ -1,23 +1,34 @@
-from typing import List, Dict
+from typing import Any, List, Dict, Tuple
 from pathlib import Path
 
 import numpy as np
-import scipy.stats as st
-from pyodsp.alg.bm.cuts import OptimalityCut, FeasibilityCut
+from pyodsp.alg.bm.cuts import FeasibilityCut
+from pyodsp.alg.bm.cuts_manager import SharedCutStore
 
 from ..node._logger import ILogger
 from ..node._node import INode, INodeRoot, INodeLeaf, INodeInner
 from ..node._message import (
     DnMessage,
+    UpMessage,
     NodeIdx,
 )
 from ..utils import create_directory
+from ..pool import IPoolTarget, WorkerPool
+from ..checkpoint import (
+    CHECKPOINT_FILE,
+    save_checkpoint,
+    get_node_states,
+    set_node_states,
+)
+from .sampling import RunningStats, relative_gap, interval_gap
 
 
 from pyodsp.alg.params import SDDP_REL_TOLERANCE, SDDP_IMPROVE_TOLERANCE
+from pyodsp.results import ResultsSink
+from pyodsp.trace import get_tracer, span
 
 
-class Lattice:
+class Lattice(IPoolTarget):
     def __init__(
         self,
         nodes: List[List[INode]],
@@ -27,6 +38,12 @@ class Lattice:
         sample_frequency: int = 10,
         sample_size: int = 1000,
         confidence_level: float = 0.95,
+        num_workers: int = 1,
+        min_sample_size: int = 30,
+        share_cuts: bool = True,
+        seed: int = 42,
+        export_model: bool = False,
+        checkpoint_frequency: int = 0,
     ) -> None:
         self.num_stages = len(nodes)
         self._verify_nodes(nodes)
@@ -36,8 +53,24 @@ class Lattice:
         self.sample_frequency = sample_frequency
         self.sample_size = sample_size
         self.confidence_level = confidence_level
+        self.num_workers = num_workers
+        self.pool = WorkerPool(self, num_workers)
+        # trial points passed since the workers were last synchronized
+        self.pending_dn_messages: Dict[NodeIdx, DnMessage] = {}
+        self.min_sample_size = max(min_sample_size, 2)
+        self.share_cuts = share_cuts
+        self.cut_stores: Dict[int, SharedCutStore] = {}
         self.is_minimize = True
         create_directory(self.filedir)
+        self.results = ResultsSink(self.filedir, export_model=export_model)
+        # iterations between checkpoints, 0 to disable
+        self.checkpoint_frequency = checkpoint_frequency
+
+        # independent streams for the training and the evaluation paths
+        train_seed, eval_seed = np.random.SeedSequence(seed).spawn(2)
+        self.train_rng = np.random.default_rng(train_seed)
+        self.eval_rng = np.random.default_rng(eval_seed)
+        self.eval_paths: np.ndarray | None = None
 
         self.prev_samples = None
 
@@ -73,10 +106,15 @@ class Lattice:
                     if not isinstance(node, INodeInner):
                         raise ValueError(f"Stage {stage} must be inner node.")
 
-    def run(self, init_solution: DnMessage | None = None):
+    def run(
+        self,
+        init_solution: DnMessage | None = None,
+        checkpoint: Dict[str, Any] | None = None,
+    ):
         self.logger.log_initialization()
         self._run_init()
-        self._run_main()
+        self._run_main(checkpoint)
+        self.pool.close()
         self._save()
 
     def _run_init(self) -> None:
@@ -89,6 +127,63 @@ class Lattice:
         for stage in range(self.num_stages - 1, 0, -1):
             self._run_init_backward(stage)
 
+        if self.share_cuts:
+            for stage in range(1, self.num_stages - 1):
+                self._share_stage_cuts(stage)
+
+        self._build_transitions()
+
+    def _build_transitions(self) -> None:
+        """Cumulative transition probabilities between consecutive stage positions."""
+        self.transitions: List[np.ndarray] = []
+        for stage in range(self.num_stages - 1):
+            positions = {
+                node_idx: pos for pos, node_idx in enumerate(self.stages[stage + 1])
+            }
+            prob = np.zeros((len(self.stages[stage]), len(positions)))
+            for row, node_idx in enumerate(self.stages[stage]):
+                node = self.nodes[node_idx]
+                assert isinstance(node, INodeRoot)
+                for child_idx in node.get_children():
+                    prob[row, positions[child_idx]] = node.get_multiplier(child_idx)
+            cum_prob = np.cumsum(prob, axis=1)
+            self.transitions.append(cum_prob / cum_prob[:, -1:])
+
+    def _sample_paths(self, rng: np.random.Generator, num_paths: int) -> np.ndarray:
+        """Sample paths as node positions within each stage, one row per path."""
+        paths = np.zeros((num_paths, self.num_stages), dtype=np.intp)
+        for stage, cum_prob in enumerate(self.transitions):
+            draws = rng.random(num_paths)
+            # position of the first child whose cumulative probability exceeds the draw
+            paths[:, stage + 1] = np.minimum(
+                (cum_prob[paths[:, stage]] <= draws[:, None]).sum(axis=1),
+                cum_prob.shape[1] - 1,
+            )
+        return paths
+
+    def _share_stage_cuts(self, stage: int) -> None:
+        """Let the nodes of a stagewise-independent stage share one cut store."""
+        nodes = [self.nodes[node_idx] for node_idx in self.stages[stage]]
+        if len(nodes) < 2:
+            return
+        first = nodes[0]
+        assert isinstance(first, INodeRoot)
+        children = first.get_children()
+        multipliers = [first.get_multiplier(child) for child in children]
+        groups = first.get_groups()
+        for node in nodes[1:]:
+            assert isinstance(node, INodeRoot)
+            if node.get_children() != children or node.get_groups() != groups:
+                return
+            if [node.get_multiplier(child) for child in children] != multipliers:
+                return
+
+        store = SharedCutStore()
+        for node in nodes:
+            assert isinstance(node, INodeRoot)
+            node.set_cut_store(store)
+        self.cut_stores[stage] = store
+
     def _run_init_forward(self, stage: int) -> None:
         assert stage < self.num_stages - 1
         for node_idx in self.stages[stage]:
@@ -127,96 +222,175 @@ class Lattice:
             node.build()
             node.reset()
 
-    def _run_main(self) -> None:
+    def _run_main(self, checkpoint: Dict[str, Any] | None = None) -> None:
         if self.root is None:
             raise ValueError("Root node not found")
         bound = -1e9
-        for iteration in range(self.max_iteration):
-            np.random.seed(42 + self.sample_size + iteration)
+        if checkpoint is None:
+            start = 0
+            train_paths = self._sample_paths(self.train_rng, self.max_iteration)
+        else:
+            start = checkpoint["iteration"]
+            train_paths = checkpoint["train_paths"]
+            self._restore_checkpoint(checkpoint)
+        if self.eval_paths is None:
+            # the same paths are evaluated every time so that samples can be paired,
+            # drawn up front so that workers started before the first check hold them
+            self.eval_paths = self._sample_paths(self.eval_rng, self.sample_size)
+        for iteration in range(start, self.max_iteration):
             bound = self._run_root()
             if iteration % self.sample_frequency == self.sample_frequency - 1:
-                if self._termination(bound):
-                    break
+                with span("evaluation", iteration=iteration):
+                    if self._termination(bound):
+                        break
             else:
-                self._run_forwards()
+                with span("forward_pass", iteration=iteration):
+                    self._run_forwards(train_paths[iteration])
+
+            with span("backward_pass", iteration=iteration):
+                bound = self._run_backwards()
+
+            next_iteration = iteration + 1
+            if (
+                self.checkpoint_frequency > 0
+                and next_iteration % self.checkpoint_frequency == 0
+            ):
+                self._save_checkpoint(next_iteration, train_paths)
+
+    def _save_checkpoint(self, iteration: int, train_paths: np.ndarray) -> None:
+        save_checkpoint(
+            self.filedir / CHECKPOINT_FILE,
+            {
+                "nodes": get_node_states(self.nodes.values()),
+                "iteration": iteration,
+                "train_paths": train_paths,
+                "train_rng": self.train_rng.bit_generator.state,
+                "eval_rng": self.eval_rng.bit_generator.state,
+                "eval_paths": self.eval_paths,
+                "prev_samples": self.prev_samples,
+            },
+        )
 
-            bound = self._run_backwards()
+    def _restore_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        set_node_states(self.nodes, checkpoint["nodes"])
+        self.train_rng.bit_generator.state = checkpoint["train_rng"]
+        self.eval_rng.bit_generator.state = checkpoint["eval_rng"]
+        self.eval_paths = checkpoint["eval_paths"]
+        self.prev_samples = checkpoint["prev_samples"]
 
     def _termination(self, bound: float) -> bool:
-        objectives = []
-        for _ in range(self.sample_size):
-            np.random.seed(42 + _)
-            objective = self._run_forwards()
-            objectives.append(objective)
-        ci_d, ci_u = st.t.interval(
-            confidence=self.confidence_level,
-            df=len(objectives) - 1,
-            loc=np.mean(objectives),
-            scale=st.sem(objectives),
-        )
+        objectives: List[float] = []
+        stats = RunningStats()
+        diff_stats = RunningStats()
+        num_pairs = 0 if self.prev_samples is None else len(self.prev_samples)
+        all_zero = True
+
+        converged = False
+        no_improve = False
+        for start in range(0, self.sample_size, self.min_sample_size):
+            stop = min(start + self.min_sample_size, self.sample_size)
+            samples = list(range(start, stop))
+            for sample, objective in zip(samples, self._run_samples(samples)):
+                objectives.append(objective)
+                stats.push(objective)
+                if sample < num_pairs:
+                    assert self.prev_samples is not None
+                    sample_diff = self.prev_samples[sample] - objective
+                    diff_stats.push(sample_diff)
+                    if sample_diff > 1e-9:
+                        all_zero = False
+            is_last = stats.count == self.sample_size
+
+            ci_d, ci_u = stats.interval(self.confidence_level)
+            if self.is_minimize:
+                converged = relative_gap(ci_u, bound) < SDDP_REL_TOLERANCE
+            else:
+                converged = relative_gap(ci_d, bound) < SDDP_REL_TOLERANCE
+            # no point of the interval is within the tolerance of the bound
+            diverged = interval_gap(ci_d, ci_u, bound) >= SDDP_REL_TOLERANCE
+
+            improved = False
+            all_paired = diff_stats.count == num_pairs
+            if diff_stats.count > 0:
+                diff_ci_d, diff_ci_u = diff_stats.interval(self.confidence_level)
+                if all_zero:
+                    # the interval of identical objectives has no width, they
+                    # only show no improvement once the full sample is paired
+                    no_improve = all_paired
+                else:
+                    no_improve = diff_ci_u < SDDP_IMPROVE_TOLERANCE
+                improved = not all_zero and diff_ci_d >= SDDP_IMPROVE_TOLERANCE
+            decided = improved or all_paired
+
+            if converged or no_improve or (diverged and decided) or is_last:
+                break
         self.logger.log_info(
-            f"lower: {ci_d}, upper: {ci_u}, confidence: {self.confidence_level}"
+            "lower: %s, upper: %s, confidence: %s, samples: %s",
+            ci_d,
+            ci_u,
+            self.confidence_level,
+            stats.count,
         )
-        converged = False
-        if self.is_minimize:
-            converged = (
-                abs(ci_u - bound) / max(abs(ci_u), abs(bound)) < SDDP_REL_TOLERANCE
-            )
-        else:
-            converged = (
-                abs(ci_d - bound) / max(abs(ci_d), abs(bound)) < SDDP_REL_TOLERANCE
-            )
+
+        if self.pool.is_parallel():
+            # replay the last sample so that the backward pass sees its trial points
+            self._run_sample_chunk([len(objectives) - 1])
 
         if converged:
             self.logger.log_info("SDDP termination with convergence.")
             return True
 
-        no_improve = False
-        if self.prev_samples is not None:
-            sample_diffs = [
-                self.prev_samples[i] - objectives[i] for i in range(len(objectives))
-            ]
-            all_zero = True
-            for sample_diff in sample_diffs:
-                if sample_diff > 1e-9:
-                    all_zero = False
-                    break
-
-            if all_zero:
-                no_improve = True
-            else:
-                diff_ci_d, diff_ci_u = st.t.interval(
-                    confidence=self.confidence_level,
-                    df=len(sample_diffs) - 1,
-                    loc=np.mean(sample_diffs),
-                    scale=st.sem(sample_diffs),
-                )
-                no_improve = diff_ci_u < SDDP_IMPROVE_TOLERANCE
-
         if no_improve:
             self.logger.log_info("SDDP termination with no improvement.")
             return True
 
+        # only the samples of this policy are kept, the next check pairs over the
+        # samples drawn by both
         self.prev_samples = objectives
 
         return False
 
+    def _run_samples(self, samples: List[int]) -> List[float]:
+        if not self.pool.is_parallel():
+            return self._run_sample_chunk(samples)
+        # each worker evaluates a contiguous chunk on its own copy of the lattice
+        return self.pool.map("_run_sample_chunk", samples, self._pop_sync())
+
+    def _run_sample_chunk(self, samples: List[int]) -> List[float]:
+        assert self.eval_paths is not None
+        # sorted distinct paths: consecutive paths share their longest prefixes
+        paths, inverse = np.unique(
+            self.eval_paths[samples], axis=0, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        # the path of the last sample goes last so that its trial points remain
+        last = inverse[-1]
+        order = [i for i in range(len(paths)) if i != last] + [last]
+
+        path_objectives: List[float] = [0.0] * len(paths)
+        prev_path = None
+        for i in order:
+            path = paths[i]
+            if prev_path is None:
+                start = 1
+            else:
+                # nodes before the first differing stage already hold their trial points
+                start = int(np.argmax(path != prev_path))
+            path_objectives[i] = self._run_forwards(path, start)
+            prev_path = path
+        return [path_objectives[i] for i in inverse]
+
     def _run_root(self) -> float:
         assert self.root is not None
         self._run_forward(self.root)
 
         return self.root.alg_root.bm.get_objective_value()  # FIXME: properly access
 
-    def _run_forwards(self) -> float:
+    def _run_forwards(self, path: np.ndarray, start: int = 1) -> float:
         node = self.root
         assert node is not None
-        path = [node.get_idx()]
-        for stage in range(1, self.num_stages):
-            # randomly sample node in the next stage
-            prob = [node.get_multiplier(node_idx) for node_idx in node.get_children()]
-            sampled_idx = np.random.choice(node.get_children(), p=prob)
-            node = self.nodes[sampled_idx]
-            path.append(node.get_idx())
+        for stage in range(start, self.num_stages):
+            node = self.nodes[self.stages[stage][path[stage]]]
 
             if stage < self.num_stages - 1:
                 assert isinstance(node, INodeRoot)
@@ -234,6 +408,7 @@ class Lattice:
             child = self.nodes[child_id]
             assert isinstance(child, INodeLeaf)
             child.pass_dn_message(dn_message)
+            self.pending_dn_messages[child_id] = dn_message
         return dn_message.get_objective()
 
     def _run_backwards(self) -> None:
@@ -242,28 +417,90 @@ class Lattice:
 
     def _run_backward(self, stage: int) -> None:
         assert stage > 0
+        child_ids = self.stages[stage]
         up_messages = {}
-        for child_id in self.stages[stage]:
+        if self.pool.is_parallel():
+            child_up_messages = self.pool.map(
+                "_get_up_messages", child_ids, self._pop_sync()
+            )
+        else:
+            child_up_messages = self._get_up_messages(child_ids)
+        for child_id, up_message in zip(child_ids, child_up_messages):
             child = self.nodes[child_id]
-            assert isinstance(child, INodeLeaf)
-            up_message = child.get_up_message()
             cut_dn = up_message.get_cut()
             assert cut_dn is not None
-            if isinstance(cut_dn, OptimalityCut):
-                self.logger.log_sub_problem(
-                    child.get_idx(), "Optimality", cut_dn.coeffs, cut_dn.rhs
-                )
-            if isinstance(cut_dn, FeasibilityCut):
+            if self.logger.is_debug_enabled():
+                cut_type = "Optimality"
+                if isinstance(cut_dn, FeasibilityCut):
+                    cut_type = "Feasibility"
                 self.logger.log_sub_problem(
-                    child.get_idx(), "Feasibility", cut_dn.coeffs, cut_dn.rhs
+                    child.get_idx(), cut_type, cut_dn.coeffs, cut_dn.rhs
                 )
             up_messages[child_id] = up_message
 
+        store = self.cut_stores.get(stage - 1)
+        if store is None:
+            for node_idx in self.stages[stage - 1]:
+                node = self.nodes[node_idx]
+                assert isinstance(node, INodeRoot)
+                node.add_cuts(up_messages)
+            return
+
+        # stagewise independent: aggregate and check the cuts once for the stage
+        first = self.nodes[self.stages[stage - 1][0]]
+        assert isinstance(first, INodeRoot)
+        cuts_list = first.get_aggregate_cuts(up_messages)
+        store.register(cuts_list)
         for node_idx in self.stages[stage - 1]:
             node = self.nodes[node_idx]
             assert isinstance(node, INodeRoot)
-            node.add_cuts(up_messages)
+            node.add_aggregate_cuts(cuts_list)
+
+    def _get_up_messages(self, child_ids: List[NodeIdx]) -> List[UpMessage]:
+        up_messages = []
+        for child_id in child_ids:
+            child = self.nodes[child_id]
+            assert isinstance(child, INodeLeaf)
+            up_messages.append(child.get_up_message())
+        return up_messages
+
+    def _pop_sync(self) -> Tuple[Dict[NodeIdx, Any], Dict[NodeIdx, DnMessage]]:
+        """Changes of the cuts and trial points since the last synchronization.
+
+        The first call precedes the start of the workers, which then hold the
+        current state, and only starts recording the changes.
+        """
+        cut_changes = {
+            idx: node.pop_cut_changes()
+            for idx, node in self.nodes.items()
+            if isinstance(node, INodeRoot)
+        }
+        dn_messages = self.pending_dn_messages
+        self.pending_dn_messages = {}
+        return cut_changes, dn_messages
+
+    def sync_worker(
+        self, sync: Tuple[Dict[NodeIdx, Any], Dict[NodeIdx, DnMessage]]
+    ) -> None:
+        cut_changes, dn_messages = sync
+        for idx, changes in cut_changes.items():
+            node = self.nodes[idx]
+            assert isinstance(node, INodeRoot)
+            node.apply_cut_changes(changes)
+        for idx, dn_message in dn_messages.items():
+            node = self.nodes[idx]
+            assert isinstance(node, INodeLeaf)
+            node.pass_dn_message(dn_message)
+
+    def pop_worker_stats(self) -> Dict[NodeIdx, Any]:
+        return {idx: node.pop_worker_stats() for idx, node in self.nodes.items()}
+
+    def add_worker_stats(self, stats: Dict[NodeIdx, Any]) -> None:
+        for idx, node_stats in stats.items():
+            self.nodes[idx].add_worker_stats(node_stats)
 
     def _save(self) -> None:
         for node in self.nodes.values():
-            node.save(self.filedir)
+            node.save(self.results)
+        self.results.write()
+        get_tracer().save(self.filedir / "trace.json")
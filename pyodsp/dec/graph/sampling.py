@@ -0,0 +1,48 @@
+from typing import Tuple
+import math
+
+
+class RunningStats:
+    """Running mean and variance of a stream of samples (Welford's method)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def variance(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+    def sem(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.variance() / self.count)
+
+    def interval(self, confidence: float) -> Tuple[float, float]:
+        """Student t confidence interval of the mean."""
+        if self.count < 2:
+            return self.mean, self.mean
+        import scipy.stats as st
+
+        half_width = st.t.ppf((1 + confidence) / 2, self.count - 1) * self.sem()
+        return self.mean - half_width, self.mean + half_width
+
+
+def relative_gap(value: float, bound: float) -> float:
+    scale = max(abs(value), abs(bound))
+    if scale == 0.0:
+        return 0.0
+    return abs(value - bound) / scale
+
+
+def interval_gap(ci_d: float, ci_u: float, bound: float) -> float:
+    """Smallest relative gap between the bound and any point of the interval."""
+    return relative_gap(min(max(bound, ci_d), ci_u), bound)
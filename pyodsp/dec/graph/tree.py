@@ -1,7 +1,7 @@
-from typing import List, Dict
+from typing import Any, List, Dict, Tuple
 from pathlib import Path
 
-from pyodsp.alg.bm.cuts import OptimalityCut, FeasibilityCut
+from pyodsp.alg.bm.cuts import FeasibilityCut
 
 from ..node._logger import ILogger
 from ..node._node import INode, INodeRoot, INodeLeaf, INodeInner
@@ -14,7 +14,16 @@ from ..node._message import (
     NodeIdx,
 )
 from ..utils import create_directory
+from ..pool import IPoolTarget, WorkerPool
+from ..checkpoint import (
+    CHECKPOINT_FILE,
+    save_checkpoint,
+    get_node_states,
+    set_node_states,
+)
 
+from pyodsp.results import ResultsSink
+from pyodsp.trace import get_tracer
 from pyodsp.alg.const import (
     STATUS_NOT_FINISHED,
     STATUS_MAX_ITERATION,
@@ -22,19 +31,28 @@ from pyodsp.alg.const import (
 )
 
 
-class Tree:
+class Tree(IPoolTarget):
     def __init__(
         self,
         nodes: List[INode],
         logger: ILogger,
         filedir: Path,
         max_iteration: int = 1000,
+        num_workers: int = 1,
+        export_model: bool = False,
+        checkpoint_frequency: int = 0,
     ) -> None:
         self._verify_nodes(nodes)
         self.logger = logger
         self.filedir = filedir
         self.max_iteration = max_iteration
+        self.num_workers = num_workers
+        self.pool = WorkerPool(self, num_workers)
         create_directory(self.filedir)
+        self.results = ResultsSink(self.filedir, export_model=export_model)
+        # root steps between checkpoints, 0 to disable
+        self.checkpoint_frequency = checkpoint_frequency
+        self.num_steps = 0
 
     def _verify_nodes(self, nodes: List[INode]) -> None:
         self.root: INodeRoot | None = None
@@ -55,13 +73,18 @@ class Tree:
 
             raise ValueError(f"Unknown object of type {type(node)} detected")
 
-    def run(self, init_solution: DnMessage | None = None):
+    def run(
+        self,
+        init_solution: DnMessage | None = None,
+        checkpoint: Dict[str, Any] | None = None,
+    ):
         self.logger.log_initialization()
         self._run_init()
         up_messages = self._run_main_preprocess(init_solution)
-        self._run_main(up_messages)
+        self._run_main(up_messages, checkpoint)
         self.logger.log_finaliziation()
         final_obj = self._run_final()
+        self.pool.close()
         self.logger.log_completion(final_obj)
         self._save()
 
@@ -108,10 +131,20 @@ class Tree:
                 up_messages[child_id] = self._run_node(child, init_solution)
         return up_messages
 
-    def _run_main(self, up_messages: Dict[NodeIdx, UpMessage] | None) -> None:
+    def _run_main(
+        self,
+        up_messages: Dict[NodeIdx, UpMessage] | None,
+        checkpoint: Dict[str, Any] | None = None,
+    ) -> None:
         if self.root is None:
             raise ValueError("Root node not found")
-        self._run_node_core(self.root, up_messages)
+        self.root.reset()
+        if checkpoint is not None:
+            set_node_states(self.nodes, checkpoint["nodes"])
+            self.num_steps = checkpoint["num_steps"]
+            # the leaves keep no state between steps, re-solve the pending step
+            up_messages = self._get_up_messages(self.root, checkpoint["dn_message"])
+        self._run_node_core(self.root, up_messages, reset=False)
 
     def _run_node(
         self, node: INode, dn_message: DnMessage | None = None
@@ -129,11 +162,17 @@ class Tree:
             raise ValueError(f"Unknown object of type {type(node)} detected")
 
     def _run_node_core(
-        self, node: INodeRoot, up_messages: Dict[NodeIdx, UpMessage] | None
+        self,
+        node: INodeRoot,
+        up_messages: Dict[NodeIdx, UpMessage] | None,
+        reset: bool = True,
     ) -> UpMessage | None:
-        node.reset()
+        if reset:
+            node.reset()
         for _ in range(self.max_iteration):
             status, new_dn_message = node.run_step(up_messages)
+            if node is self.root and status == STATUS_NOT_FINISHED:
+                self._checkpoint_step(new_dn_message)
 
             if status != STATUS_NOT_FINISHED:
                 if isinstance(node, INodeInner):
@@ -162,13 +201,12 @@ class Tree:
         assert up_message is not None
         cut_dn = up_message.get_cut()
         assert cut_dn is not None
-        if isinstance(cut_dn, OptimalityCut):
-            self.logger.log_sub_problem(
-                node.get_idx(), "Optimality", cut_dn.coeffs, cut_dn.rhs
-            )
-        if isinstance(cut_dn, FeasibilityCut):
+        if self.logger.is_debug_enabled():
+            cut_type = "Optimality"
+            if isinstance(cut_dn, FeasibilityCut):
+                cut_type = "Feasibility"
             self.logger.log_sub_problem(
-                node.get_idx(), "Feasibility", cut_dn.coeffs, cut_dn.rhs
+                node.get_idx(), cut_type, cut_dn.coeffs, cut_dn.rhs
             )
         return up_message
 
@@ -187,18 +225,81 @@ class Tree:
             node.pass_final_dn_message(dn_message)
         if isinstance(node, INodeRoot):
             up_messages = {}
+            dn_messages = {}
             for child_id in node.get_children():
                 child = self.nodes[child_id]
                 new_dn_message = node.get_final_dn_message(
                     node_id=child_id, groups=node.get_groups()
                 )
+                if self.pool.is_parallel() and not isinstance(child, INodeRoot):
+                    dn_messages[child_id] = new_dn_message
+                    continue
                 up_messages[child_id] = self._run_final_core(child, new_dn_message)
+            up_messages.update(self._finalize_leaves(dn_messages))
             return node.pass_final_up_message(up_messages)
         elif isinstance(node, INodeLeaf):
             return node.get_final_up_message()
         else:
             raise ValueError(f"Unknown object of type {type(node)} detected")
 
+    def _finalize_leaves(
+        self, dn_messages: Dict[NodeIdx, FinalDnMessage]
+    ) -> Dict[NodeIdx, FinalUpMessage]:
+        if len(dn_messages) == 0:
+            return {}
+        # the leaves are solved on the copies of the workers, so the final states
+        # are sent back and restored for saving; the dn messages are only known
+        # to the parent, the workers may be forked for the leaves of another node
+        items = list(dn_messages.items())
+        results = self.pool.map("_finalize_leaf_states", items)
+        up_messages = {}
+        for (child_id, _), (up_message, state) in zip(items, results):
+            child = self.nodes[child_id]
+            assert isinstance(child, INodeLeaf)
+            child.set_final_state(state)
+            up_messages[child_id] = up_message
+        return up_messages
+
+    def _finalize_leaf_states(
+        self, items: List[Tuple[NodeIdx, FinalDnMessage]]
+    ) -> List[Tuple[FinalUpMessage, Any]]:
+        results = []
+        for child_id, dn_message in items:
+            child = self.nodes[child_id]
+            up_message = self._run_final_core(child, dn_message)
+            results.append((up_message, child.get_final_state()))
+        return results
+
+    def sync_worker(self, sync: Any) -> None:
+        # the leaves no longer change once the final step starts, and the final
+        # dn messages are passed with the leaves
+        return
+
+    def pop_worker_stats(self) -> Dict[NodeIdx, Any]:
+        return {idx: node.pop_worker_stats() for idx, node in self.nodes.items()}
+
+    def add_worker_stats(self, stats: Dict[NodeIdx, Any]) -> None:
+        for idx, node_stats in stats.items():
+            self.nodes[idx].add_worker_stats(node_stats)
+
+    def _checkpoint_step(self, dn_message: DnMessage) -> None:
+        self.num_steps += 1
+        if (
+            self.checkpoint_frequency == 0
+            or self.num_steps % self.checkpoint_frequency != 0
+        ):
+            return
+        save_checkpoint(
+            self.filedir / CHECKPOINT_FILE,
+            {
+                "nodes": get_node_states(self.nodes.values()),
+                "num_steps": self.num_steps,
+                "dn_message": dn_message,
+            },
+        )
+
     def _save(self) -> None:
         for node in self.nodes.values():
-            node.save(self.filedir)
+            node.save(self.results)
+        self.results.write()
+        get_tracer().save(self.filedir / "trace.json")
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
-from pathlib import Path
+from typing import Any, List, Tuple
 
 from pyodsp.alg.bm.cuts import CutList
+from pyodsp.alg.bm.cuts_manager import CutInfo, SharedCutStore
 
 from ._message import (
     NodeIdx,
@@ -13,17 +13,27 @@ from ._message import (
     DnMessage,
     UpMessage,
 )
+from pyodsp.results import NodeResults
 
 
 class IAlg(ABC):
     @abstractmethod
-    def save(self, dir: Path) -> None:
+    def save(self, results: NodeResults) -> None:
         pass
 
     @abstractmethod
     def is_minimize(self) -> bool:
         pass
 
+    @abstractmethod
+    def pop_worker_stats(self) -> Any:
+        """Statistics gathered since the last call, e.g. by a worker process."""
+        pass
+
+    @abstractmethod
+    def add_worker_stats(self, stats: Any) -> None:
+        pass
+
 
 class IAlgRoot(IAlg, ABC):
     @abstractmethod
@@ -38,18 +48,56 @@ class IAlgRoot(IAlg, ABC):
     def run_step(self, cuts_list: List[CutList] | None) -> Tuple[int, DnMessage]:
         pass
 
+    def set_groups(self, groups: List[List[NodeIdx]]) -> None:
+        """Groups of the children, in the order of the cuts; ignored by default."""
+        return
+
     @abstractmethod
     def get_init_dn_message(self, **kwargs) -> InitDnMessage:
         pass
 
+    @abstractmethod
+    def get_children_to_solve(
+        self, message: DnMessage, children: List[NodeIdx]
+    ) -> List[NodeIdx]:
+        pass
+
     @abstractmethod
     def add_cuts(self, cuts_list: List[CutList]) -> None:
         pass
 
+    @abstractmethod
+    def get_cuts(self) -> List[List[CutInfo]]:
+        pass
+
+    @abstractmethod
+    def get_fingerprint(self) -> str:
+        pass
+
+    @abstractmethod
+    def set_cut_store(self, store: SharedCutStore | None) -> None:
+        pass
+
+    @abstractmethod
+    def pop_cut_changes(self) -> Any:
+        pass
+
+    @abstractmethod
+    def apply_cut_changes(self, changes: Any) -> None:
+        pass
+
     @abstractmethod
     def reset_iteration(self) -> None:
         pass
 
+    @abstractmethod
+    def get_checkpoint_state(self) -> Any:
+        pass
+
+    @abstractmethod
+    def set_checkpoint_state(self, state: Any) -> None:
+        pass
+
     @abstractmethod
     def get_final_dn_message(self, **kwargs) -> FinalDnMessage:
         pass
@@ -78,6 +126,10 @@ class IAlgLeaf(IAlg, ABC):
     def get_init_up_message(self) -> InitUpMessage:
         pass
 
+    @abstractmethod
+    def get_fingerprint(self) -> str:
+        pass
+
     @abstractmethod
     def pass_dn_message(self, message: DnMessage) -> None:
         pass
@@ -90,6 +142,14 @@ class IAlgLeaf(IAlg, ABC):
     def get_final_up_message(self) -> FinalUpMessage:
         pass
 
+    @abstractmethod
+    def get_final_state(self) -> Any:
+        pass
+
+    @abstractmethod
+    def set_final_state(self, state: Any) -> None:
+        pass
+
     @abstractmethod
     def get_up_message(self) -> UpMessage:
         pass
@@ -4,11 +4,15 @@ from typing import Any
 
 class ILogger(ABC):
     @abstractmethod
-    def log_info(self, text: str):
+    def is_debug_enabled(self) -> bool:
         pass
 
     @abstractmethod
-    def log_debug(self, text: str):
+    def log_info(self, text: str, *args):
+        pass
+
+    @abstractmethod
+    def log_debug(self, text: str, *args):
         pass
 
     @abstractmethod
@@ -7,10 +7,12 @@ NodeIdx = Any
 
 
 class IMessage(ABC):
-    pass
+    __slots__ = ()
 
 
 class InitDnMessage(IMessage, ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_is_minimize(self) -> bool:
         pass
@@ -23,8 +25,18 @@ class InitDnMessage(IMessage, ABC):
     def get_depth(self) -> int:
         pass
 
+    @abstractmethod
+    def set_fingerprint_requested(self, requested: bool) -> None:
+        pass
+
+    @abstractmethod
+    def is_fingerprint_requested(self) -> bool:
+        pass
+
 
 class InitUpMessage(IMessage, ABC):
+    __slots__ = ()
+
     @abstractmethod
     def set_bound(self, bound: float | None) -> None:
         pass
@@ -33,8 +45,18 @@ class InitUpMessage(IMessage, ABC):
     def get_bound(self) -> float | None:
         pass
 
+    @abstractmethod
+    def set_fingerprint(self, fingerprint: str | None) -> None:
+        pass
+
+    @abstractmethod
+    def get_fingerprint(self) -> str | None:
+        pass
+
 
 class UpMessage(IMessage, ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_cut(self) -> Cut:
         pass
@@ -45,16 +67,20 @@ class UpMessage(IMessage, ABC):
 
 
 class DnMessage(IMessage, ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_objective(Self) -> float:
         pass
 
 
 class FinalDnMessage(IMessage, ABC):
-    pass
+    __slots__ = ()
 
 
 class FinalUpMessage(IMessage, ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_objective(self) -> float | None:
         pass
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Any, List, Dict, Tuple
+
+from pyodsp.alg.bm.cuts import CutList
+from pyodsp.alg.bm.cuts_manager import SharedCutStore
+from pyodsp.alg.bm.cut_library import CutLibrary
 
 from ._alg import IAlgRoot, IAlgLeaf
 from ._message import (
@@ -12,6 +15,7 @@ from ._message import (
     DnMessage,
     UpMessage,
 )
+from pyodsp.results import ResultsSink
 
 
 class INode(ABC):
@@ -36,7 +40,15 @@ class INode(ABC):
         pass
 
     @abstractmethod
-    def save(self, dir: Path) -> None:
+    def save(self, results: ResultsSink) -> None:
+        pass
+
+    @abstractmethod
+    def pop_worker_stats(self) -> Any:
+        pass
+
+    @abstractmethod
+    def add_worker_stats(self, stats: Any) -> None:
         pass
 
 
@@ -81,6 +93,14 @@ class INodeParent(INode, ABC):
     def reset(self) -> None:
         pass
 
+    @abstractmethod
+    def get_checkpoint_state(self) -> Any:
+        pass
+
+    @abstractmethod
+    def set_checkpoint_state(self, state: Any) -> None:
+        pass
+
     @abstractmethod
     def run_step(
         self, up_messages: Dict[NodeIdx, UpMessage] | None
@@ -95,10 +115,40 @@ class INodeParent(INode, ABC):
     def pass_init_up_messages(self, messages: Dict[NodeIdx, InitUpMessage]) -> None:
         pass
 
+    @abstractmethod
+    def get_children_to_solve(self, message: DnMessage) -> List[NodeIdx]:
+        pass
+
     @abstractmethod
     def add_cuts(self, cuts: Dict[int, UpMessage]) -> None:
         pass
 
+    @abstractmethod
+    def get_aggregate_cuts(
+        self, up_messages: Dict[NodeIdx, UpMessage]
+    ) -> List[CutList]:
+        pass
+
+    @abstractmethod
+    def add_aggregate_cuts(self, cuts_list: List[CutList]) -> None:
+        pass
+
+    @abstractmethod
+    def set_cut_store(self, store: SharedCutStore | None) -> None:
+        pass
+
+    @abstractmethod
+    def set_cut_library(self, library: CutLibrary | None) -> None:
+        pass
+
+    @abstractmethod
+    def pop_cut_changes(self) -> Any:
+        pass
+
+    @abstractmethod
+    def apply_cut_changes(self, changes: Any) -> None:
+        pass
+
     @abstractmethod
     def get_final_dn_message(self, **kwargs) -> FinalDnMessage:
         pass
@@ -154,6 +204,14 @@ class INodeChild(INode, ABC):
     def get_final_up_message(self) -> FinalUpMessage:
         pass
 
+    @abstractmethod
+    def get_final_state(self) -> Any:
+        pass
+
+    @abstractmethod
+    def set_final_state(self, state: Any) -> None:
+        pass
+
     @abstractmethod
     def solve(self, message: DnMessage) -> UpMessage:
         pass
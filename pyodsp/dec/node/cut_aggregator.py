@@ -1,4 +1,6 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
+
+import numpy as np
 
 from pyodsp.alg.bm.cuts import Cut, OptimalityCut, FeasibilityCut, CutList
 from ._node import NodeIdx, UpMessage
@@ -29,30 +31,44 @@ class CutAggregator:
         return aggregate_cuts
 
     def _get_aggregate_cut(self, multipliers: List[float], cuts: List[Cut]) -> CutList:
-        new_coeff = {}
-        new_constant = 0
-        new_objective = 0
-        new_info = {}
+        optimality_cuts: List[Tuple[float, OptimalityCut]] = []
         feasibility_cuts = []
         for multiplier, cut in zip(multipliers, cuts):
             if isinstance(cut, OptimalityCut):
                 if len(feasibility_cuts) == 0:
-                    for i, coeff in cut.coeffs.items():
-                        new_coeff[i] = new_coeff.get(i, 0) + multiplier * coeff
-                    new_constant += multiplier * cut.rhs
-                    new_objective += multiplier * cut.objective_value
-                    new_info = cut.info
+                    optimality_cuts.append((multiplier, cut))
             elif isinstance(cut, FeasibilityCut):
                 feasibility_cuts.append(cut)
         if len(feasibility_cuts) > 0:
             return CutList(feasibility_cuts)
+
+        if len(optimality_cuts) == 1:
+            multiplier, cut = optimality_cuts[0]
+            indices = cut.indices
+            values = multiplier * cut.values
+        else:
+            # sum of the coefficients of the cuts on the union of their indices
+            indices, inverse = np.unique(
+                np.concatenate([cut.indices for _, cut in optimality_cuts]),
+                return_inverse=True,
+            )
+            values = np.bincount(
+                inverse,
+                weights=np.concatenate(
+                    [multiplier * cut.values for multiplier, cut in optimality_cuts]
+                ),
+                minlength=len(indices),
+            )
         return CutList(
             [
                 OptimalityCut(
-                    coeffs=new_coeff,
-                    rhs=new_constant,
-                    objective_value=new_objective,
-                    info=new_info,
+                    indices,
+                    values,
+                    rhs=sum(m * cut.rhs for m, cut in optimality_cuts),
+                    objective_value=sum(
+                        m * cut.objective_value for m, cut in optimality_cuts
+                    ),
+                    info=optimality_cuts[-1][1].info,
                 )
             ]
         )
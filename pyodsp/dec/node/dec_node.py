@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
-from pathlib import Path
+from typing import Any, Dict, List, Tuple
 import logging
 
+from pyodsp.alg.bm.cuts import CutList
+from pyodsp.alg.bm.cuts_manager import SharedCutStore
+from pyodsp.alg.bm.cut_library import CutLibrary, fingerprint
+
 from ._node import NodeIdx, INode, INodeParent, INodeChild, INodeInner
 from ._alg import IAlgRoot, IAlgLeaf
 from .cut_aggregator import CutAggregator
@@ -14,7 +17,8 @@ from ._message import (
     DnMessage,
     UpMessage,
 )
-from ..utils import create_directory
+from pyodsp.results import ResultsSink
+from pyodsp.trace import span
 
 
 class DecNode(INode, ABC):
@@ -64,6 +68,8 @@ class DecNodeParent(INodeParent, DecNode):
     ) -> None:
         self.alg_root = alg_root
         self.log_level = log_level
+        self.cut_library: CutLibrary | None = None
+        self.children_fingerprints: Dict[NodeIdx, str] = {}
         super().__init__(idx, **kwargs)
 
     def get_alg_root(self) -> IAlgRoot:
@@ -120,11 +126,20 @@ class DecNodeParent(INodeParent, DecNode):
                     self.children_multipliers[member] * self.children_bounds[member]
                 )
             subobj_bounds.append(bound)
-        self.alg_root.build(subobj_bounds)
+        with span("master_build", node=self.idx):
+            self.alg_root.set_groups(self.groups)
+            self.alg_root.build(subobj_bounds)
+            self._load_library_cuts()
 
     def reset(self) -> None:
         self.alg_root.reset_iteration()
 
+    def get_checkpoint_state(self) -> Any:
+        return self.alg_root.get_checkpoint_state()
+
+    def set_checkpoint_state(self, state: Any) -> None:
+        self.alg_root.set_checkpoint_state(state)
+
     def set_logger(self) -> None:
         assert self.depth is not None
         self.alg_root.set_logger(self.idx, self.depth, self.log_level)
@@ -132,23 +147,84 @@ class DecNodeParent(INodeParent, DecNode):
     def run_step(
         self, up_messages: Dict[NodeIdx, UpMessage] | None
     ) -> Tuple[int, DnMessage]:
-        if up_messages is None:
-            return self.alg_root.run_step(None)
-        aggregate_cuts = self.cut_aggregator.get_aggregate_cuts(up_messages)
-        return self.alg_root.run_step(aggregate_cuts)
+        with span("root_step", node=self.idx):
+            if up_messages is None:
+                return self.alg_root.run_step(None)
+            aggregate_cuts = self.cut_aggregator.get_aggregate_cuts(up_messages)
+            return self.alg_root.run_step(aggregate_cuts)
 
     def get_init_dn_message(self, **kwargs) -> InitDnMessage:
         init_message = self.alg_root.get_init_dn_message(**kwargs)
         init_message.set_depth(self.get_depth())
+        init_message.set_fingerprint_requested(self._is_fingerprint_needed())
         return init_message
 
     def pass_init_up_messages(self, messages: Dict[NodeIdx, InitUpMessage]) -> None:
         for node_id, message in messages.items():
+            fp = message.get_fingerprint()
+            if fp is not None:
+                self.children_fingerprints[node_id] = fp
             bound = message.get_bound()
             if bound is None:
                 continue
             self.set_child_bound(node_id, bound)
 
+    def set_cut_library(self, library: CutLibrary | None) -> None:
+        """Warm-starts the master with the cuts of past runs, and stores its
+        cuts in the library at the end of the run."""
+        self.cut_library = library
+
+    def _is_fingerprint_needed(self) -> bool:
+        return self.cut_library is not None
+
+    def get_group_fingerprints(self) -> List[str] | None:
+        """Hash of the data of the children in each group, None if unknown."""
+        fingerprints = []
+        for group in self.groups:
+            if any(member not in self.children_fingerprints for member in group):
+                return None
+            fingerprints.append(
+                fingerprint(
+                    [
+                        (
+                            member,
+                            self.children_multipliers[member],
+                            self.children_fingerprints[member],
+                        )
+                        for member in group
+                    ]
+                )
+            )
+        return fingerprints
+
+    def _get_library_key(self) -> str:
+        return fingerprint(self.alg_root.get_fingerprint(), self.groups)
+
+    def _load_library_cuts(self) -> None:
+        if self.cut_library is None:
+            return
+        group_fingerprints = self.get_group_fingerprints()
+        if group_fingerprints is None:
+            return
+        cuts_list = self.cut_library.load(
+            self._get_library_key(), group_fingerprints, self.get_num_vars()
+        )
+        if any(len(cuts) > 0 for cuts in cuts_list):
+            self.alg_root.add_cuts(cuts_list)
+
+    def _store_library_cuts(self) -> None:
+        if self.cut_library is None:
+            return
+        group_fingerprints = self.get_group_fingerprints()
+        if group_fingerprints is None:
+            return
+        self.cut_library.store(
+            self._get_library_key(),
+            group_fingerprints,
+            self.alg_root.get_cuts(),
+            self.get_num_vars(),
+        )
+
     def get_final_dn_message(self, **kwargs) -> FinalDnMessage:
         return self.alg_root.get_final_dn_message(**kwargs)
 
@@ -165,14 +241,38 @@ class DecNodeParent(INodeParent, DecNode):
     def get_num_vars(self) -> int:
         return self.alg_root.get_num_vars()
 
+    def get_children_to_solve(self, message: DnMessage) -> List[NodeIdx]:
+        return self.alg_root.get_children_to_solve(message, self.children)
+
     def add_cuts(self, up_messages: Dict[int, UpMessage]) -> None:
-        aggregate_cuts = self.cut_aggregator.get_aggregate_cuts(up_messages)
-        self.alg_root.add_cuts(aggregate_cuts)
+        self.add_aggregate_cuts(self.get_aggregate_cuts(up_messages))
 
-    def save(self, dir: Path) -> None:
-        node_dir = dir / f"node{self.idx}"
-        create_directory(node_dir)
-        self.alg_root.save(node_dir)
+    def get_aggregate_cuts(
+        self, up_messages: Dict[NodeIdx, UpMessage]
+    ) -> List[CutList]:
+        return self.cut_aggregator.get_aggregate_cuts(up_messages)
+
+    def add_aggregate_cuts(self, cuts_list: List[CutList]) -> None:
+        self.alg_root.add_cuts(cuts_list)
+
+    def set_cut_store(self, store: SharedCutStore | None) -> None:
+        self.alg_root.set_cut_store(store)
+
+    def pop_cut_changes(self) -> Any:
+        return self.alg_root.pop_cut_changes()
+
+    def apply_cut_changes(self, changes: Any) -> None:
+        self.alg_root.apply_cut_changes(changes)
+
+    def pop_worker_stats(self) -> Any:
+        return self.alg_root.pop_worker_stats()
+
+    def add_worker_stats(self, stats: Any) -> None:
+        self.alg_root.add_worker_stats(stats)
+
+    def save(self, results: ResultsSink) -> None:
+        self.alg_root.save(results.for_node(self.idx))
+        self._store_library_cuts()
 
 
 DecNodeRoot = DecNodeParent
@@ -182,6 +282,7 @@ class DecNodeChild(INodeChild, DecNode):
     def __init__(self, idx: NodeIdx, alg_leaf: IAlgLeaf, **kwargs) -> None:
         self.alg_leaf = alg_leaf
         self.bound = None
+        self.fingerprint_requested = False
         super().__init__(idx, **kwargs)
 
     def get_alg_leaf(self) -> IAlgLeaf:
@@ -194,15 +295,19 @@ class DecNodeChild(INodeChild, DecNode):
         return self.bound
 
     def build_inner(self) -> None:
-        self.alg_leaf.build()
+        with span("leaf_build", node=self.idx):
+            self.alg_leaf.build()
 
     def pass_init_dn_message(self, message: InitDnMessage) -> None:
         self.set_depth(message.get_depth() + 1)
+        self.fingerprint_requested = message.is_fingerprint_requested()
         self.alg_leaf.pass_init_dn_message(message)
 
     def get_init_up_message(self) -> InitUpMessage:
         message = self.alg_leaf.get_init_up_message()
         message.set_bound(self.bound)
+        if self.fingerprint_requested:
+            message.set_fingerprint(self.alg_leaf.get_fingerprint())
         return message
 
     def pass_dn_message(self, message: DnMessage) -> None:
@@ -212,19 +317,31 @@ class DecNodeChild(INodeChild, DecNode):
         return self.alg_leaf.get_up_message()
 
     def pass_final_dn_message(self, message: FinalDnMessage) -> None:
-        return self.alg_leaf.pass_final_dn_message(message)
+        with span("leaf_final", node=self.idx):
+            self.alg_leaf.pass_final_dn_message(message)
 
     def get_final_up_message(self) -> FinalUpMessage:
         return self.alg_leaf.get_final_up_message()
 
+    def get_final_state(self) -> Any:
+        return self.alg_leaf.get_final_state()
+
+    def set_final_state(self, state: Any) -> None:
+        self.alg_leaf.set_final_state(state)
+
     def solve(self, message: DnMessage) -> UpMessage:
-        self.pass_dn_message(message)
-        return self.get_up_message()
+        with span("leaf_solve", node=self.idx):
+            self.pass_dn_message(message)
+            return self.get_up_message()
 
-    def save(self, dir: Path) -> None:
-        node_dir = dir / f"node{self.idx}"
-        create_directory(node_dir)
-        self.alg_leaf.save(node_dir)
+    def save(self, results: ResultsSink) -> None:
+        self.alg_leaf.save(results.for_node(self.idx))
+
+    def pop_worker_stats(self) -> Any:
+        return self.alg_leaf.pop_worker_stats()
+
+    def add_worker_stats(self, stats: Any) -> None:
+        self.alg_leaf.add_worker_stats(stats)
 
 
 DecNodeLeaf = DecNodeChild
@@ -246,5 +363,29 @@ class DecNodeInner(INodeInner, DecNodeParent, DecNodeChild):
         DecNodeParent.build_inner(self)
         DecNodeChild.build_inner(self)
 
-    def save(self, dir: Path):
-        DecNodeParent.save(self, dir)
+    def _is_fingerprint_needed(self) -> bool:
+        return self.cut_library is not None or self.fingerprint_requested
+
+    def get_init_up_message(self) -> InitUpMessage:
+        message = DecNodeChild.get_init_up_message(self)
+        leaf_fingerprint = message.get_fingerprint()
+        if leaf_fingerprint is not None:
+            # the cuts of the node also depend on the data of its descendants
+            group_fingerprints = self.get_group_fingerprints()
+            message.set_fingerprint(
+                None
+                if group_fingerprints is None
+                else fingerprint(leaf_fingerprint, group_fingerprints)
+            )
+        return message
+
+    def pop_worker_stats(self) -> Any:
+        return self.alg_root.pop_worker_stats(), self.alg_leaf.pop_worker_stats()
+
+    def add_worker_stats(self, stats: Any) -> None:
+        root_stats, leaf_stats = stats
+        self.alg_root.add_worker_stats(root_stats)
+        self.alg_leaf.add_worker_stats(leaf_stats)
+
+    def save(self, results: ResultsSink):
+        DecNodeParent.save(self, results)
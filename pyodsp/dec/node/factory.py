@@ -0,0 +1,85 @@
+from typing import Callable, Dict, List
+import heapq
+
+from ._node import INode
+from ._message import NodeIdx
+
+
+def assign_leaves(
+    leaf_ids: List[NodeIdx],
+    num_ranks: int,
+    cost: Callable[[NodeIdx], float] | None = None,
+) -> Dict[int, List[NodeIdx]]:
+    """Balances the leaves over the ranks, longest processing time first.
+
+    The most costly leaf is repeatedly given to the least loaded rank. Rank 0
+    holds the root and only receives leaves when it is the only rank. The
+    assignment is deterministic, so that every rank computes the same one.
+
+    Args:
+        leaf_ids: indices of the leaves
+        num_ranks: number of ranks
+        cost: estimated cost of the leaf of an index, by default 1 for all leaves
+    """
+    if num_ranks < 1:
+        raise ValueError(f"Invalid number of ranks: {num_ranks}")
+    ranks = list(range(1, num_ranks)) or [0]
+    costs = [1.0 if cost is None else float(cost(idx)) for idx in leaf_ids]
+    # sorted is stable, leaves of equal cost keep their order
+    order = sorted(range(len(leaf_ids)), key=lambda i: -costs[i])
+
+    loads = [(0.0, rank) for rank in ranks]
+    positions: Dict[int, List[int]] = {rank: [] for rank in ranks}
+    for i in order:
+        load, rank = heapq.heappop(loads)
+        positions[rank].append(i)
+        heapq.heappush(loads, (load + costs[i], rank))
+    return {rank: [leaf_ids[i] for i in sorted(pos)] for rank, pos in positions.items()}
+
+
+class NodeFactory:
+    """Builds on each rank only the nodes assigned to it.
+
+    Startup memory and time then scale with the leaves per rank rather than with
+    the total number of leaves, and the ranks build their models in parallel.
+
+    Args:
+        create_root: builds the root with all leaves as children, only called on
+            rank 0
+        create_leaf: builds the leaf of an index
+        leaf_ids: indices of the leaves
+        cost: estimated cost of the leaf of an index, by default 1 for all
+            leaves; it must give the same value on every rank
+    """
+
+    def __init__(
+        self,
+        create_root: Callable[[], INode],
+        create_leaf: Callable[[NodeIdx], INode],
+        leaf_ids: List[NodeIdx],
+        cost: Callable[[NodeIdx], float] | None = None,
+    ) -> None:
+        if len(set(leaf_ids)) != len(leaf_ids):
+            raise ValueError("Duplicate leaf ids")
+        self.create_root = create_root
+        self.create_leaf = create_leaf
+        self.leaf_ids = list(leaf_ids)
+        self.cost = cost
+
+    def get_assignment(self, num_ranks: int) -> Dict[int, List[NodeIdx]]:
+        return assign_leaves(self.leaf_ids, num_ranks, self.cost)
+
+    def create_nodes(self, rank: int, num_ranks: int) -> List[INode]:
+        """Nodes of a rank: the root on rank 0, followed by the assigned leaves."""
+        nodes: List[INode] = []
+        if rank == 0:
+            root = self.create_root()
+            if set(root.get_children()) != set(self.leaf_ids):
+                raise ValueError("Children of the root differ from the leaf ids")
+            nodes.append(root)
+        for idx in self.get_assignment(num_ranks).get(rank, []):
+            leaf = self.create_leaf(idx)
+            if leaf.get_idx() != idx:
+                raise ValueError(f"Leaf {idx} was built with index {leaf.get_idx()}")
+            nodes.append(leaf)
+        return nodes
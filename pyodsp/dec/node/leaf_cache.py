@@ -0,0 +1,91 @@
+from typing import Any, Hashable, List, Tuple
+from collections import OrderedDict
+
+import numpy as np
+
+from pyodsp.alg.params import LEAF_CACHE_SIZE, LEAF_CACHE_TOLERANCE
+from pyodsp.results import NodeResults
+
+
+class LeafCache:
+    """Bounded LRU cache of leaf results keyed by the quantized incoming values."""
+
+    def __init__(
+        self, max_size: int = LEAF_CACHE_SIZE, tolerance: float = LEAF_CACHE_TOLERANCE
+    ) -> None:
+        self.max_size = max_size
+        self.tolerance = tolerance
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # entries and counts not yet returned by pop_updates
+        self._updates: OrderedDict[Hashable, Any] = OrderedDict()
+        self._popped_hits = 0
+        self._popped_misses = 0
+
+    def get_key(self, values: List[float], revision: int) -> Tuple:
+        quantized = np.rint(np.asarray(values, dtype=float) / self.tolerance)
+        # adding 0.0 maps -0.0 to 0.0 so that both share a key
+        return revision, (quantized + 0.0).tobytes()
+
+    def get(self, key: Hashable) -> Any | None:
+        if self.max_size <= 0:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, entry: Any) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        self._updates[key] = entry
+        self._updates.move_to_end(key)
+        if len(self._updates) > self.max_size:
+            self._updates.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._updates.clear()
+
+    def pop_updates(self) -> Tuple[int, int, List[Tuple[Hashable, Any]]]:
+        """Hits, misses and new entries since the last call, e.g. of a worker."""
+        updates = (
+            self.hits - self._popped_hits,
+            self.misses - self._popped_misses,
+            list(self._updates.items()),
+        )
+        self._popped_hits = self.hits
+        self._popped_misses = self.misses
+        self._updates.clear()
+        return updates
+
+    def add_updates(self, updates: Tuple[int, int, List[Tuple[Hashable, Any]]]) -> None:
+        hits, misses, entries = updates
+        self.hits += hits
+        self.misses += misses
+        for key, entry in entries:
+            self.put(key, entry)
+
+    def get_hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def save(self, results: NodeResults) -> None:
+        results.add(
+            "cache",
+            {
+                "hits": [self.hits],
+                "misses": [self.misses],
+                "hit_rate": [self.get_hit_rate()],
+            },
+        )
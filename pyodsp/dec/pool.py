@@ -0,0 +1,154 @@
+from abc import ABC, abstractmethod
+from typing import Any, List
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+import multiprocessing as mp
+import os
+import traceback
+
+import numpy as np
+
+from pyodsp.log import (
+    is_background_logging,
+    enable_background_logging,
+    disable_background_logging,
+)
+from pyodsp.trace import get_tracer
+
+
+class IPoolTarget(ABC):
+    """Object whose copies in the worker processes of a pool run its tasks."""
+
+    @abstractmethod
+    def sync_worker(self, sync: Any) -> None:
+        """Applies the changes of the parent to the copy of a worker."""
+        pass
+
+    @abstractmethod
+    def pop_worker_stats(self) -> Any:
+        """Statistics gathered by this copy since the last call."""
+        pass
+
+    @abstractmethod
+    def add_worker_stats(self, stats: Any) -> None:
+        """Adds the statistics gathered by the copy of a worker."""
+        pass
+
+
+def _work(conn: Connection, target: IPoolTarget, rank: int) -> None:
+    tracer = get_tracer()
+    tracer.pid = os.getpid()
+    tracer.clear()
+    tracer.set_process_name(f"worker {rank}")
+    # statistics inherited from the parent are not sent back
+    target.pop_worker_stats()
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        sync, name, items = request
+        try:
+            target.sync_worker(sync)
+            result = None if name is None else getattr(target, name)(items)
+            conn.send((True, result, target.pop_worker_stats(), tracer.get_events()))
+        except Exception:
+            conn.send((False, traceback.format_exc(), None, []))
+        tracer.clear()
+    conn.close()
+
+
+class WorkerPool:
+    """Worker processes forked once and kept for the rest of a run.
+
+    The workers are forked on the first call to map(), each with a copy of the
+    target as it is at that time. Later changes of the parent reach the copies
+    through the sync argument of map(), and the statistics the copies gather,
+    together with their trace events, are sent back after every call.
+
+    Args:
+        target: object whose methods the workers call
+        num_workers: number of worker processes
+    """
+
+    def __init__(self, target: IPoolTarget, num_workers: int) -> None:
+        self.target = target
+        self.num_workers = num_workers
+        self.conns: List[Connection] = []
+        self.processes: List[BaseProcess] = []
+
+    def is_parallel(self) -> bool:
+        return self.num_workers > 1 and "fork" in mp.get_all_start_methods()
+
+    def map(self, name: str, items: List[Any], sync: Any = None) -> List[Any]:
+        """Calls a method of the target on contiguous chunks of items.
+
+        Args:
+            name: name of the method, which takes a list of items and returns
+                one result per item
+            items: the items, split into one chunk per worker
+            sync: argument of sync_worker, passed to every worker before the call
+
+        Returns:
+            The results in the order of items.
+        """
+        if not self.is_parallel():
+            return getattr(self.target, name)(items)
+        self._start()
+        bounds = np.linspace(0, len(items), self.num_workers + 1).astype(int)
+        for conn, start, stop in zip(self.conns, bounds[:-1], bounds[1:]):
+            # workers without items are still synchronized
+            chunk_name = name if stop > start else None
+            conn.send((sync, chunk_name, items[start:stop]))
+
+        tracer = get_tracer()
+        results: List[Any] = []
+        error = None
+        for conn in self.conns:
+            ok, result, stats, events = conn.recv()
+            if not ok:
+                error = result
+                continue
+            self.target.add_worker_stats(stats)
+            tracer.add_events(events)
+            if result is not None:
+                results.extend(result)
+        if error is not None:
+            raise RuntimeError(f"Worker process failed:\n{error}")
+        return results
+
+    def _start(self) -> None:
+        if len(self.processes) > 0:
+            return
+        # no thread of the parent may hold the logging locks while forking
+        background = is_background_logging()
+        if background:
+            disable_background_logging()
+        try:
+            ctx = mp.get_context("fork")
+            for rank in range(self.num_workers):
+                parent_conn, child_conn = ctx.Pipe()
+                process = ctx.Process(
+                    target=_work,
+                    args=(child_conn, self.target, rank),
+                    name=f"pyodsp-worker-{rank}",
+                    daemon=True,
+                )
+                process.start()
+                child_conn.close()
+                self.conns.append(parent_conn)
+                self.processes.append(process)
+        finally:
+            if background:
+                enable_background_logging()
+
+    def close(self) -> None:
+        for conn in self.conns:
+            conn.send(None)
+            conn.close()
+        for process in self.processes:
+            process.join()
+        self.conns = []
+        self.processes = []
@@ -1,46 +1,37 @@
 import logging
 
 from ..node._logger import ILogger
+from pyodsp.log import get_logger
 
 
 class SddpLogger(ILogger):
     def __init__(self, level: int = logging.INFO):
-        # Create a logger object
-        self.logger = logging.getLogger("SDDP")
-        self.logger.setLevel(level)
+        self.logger = get_logger("sddp", level)
 
-        # Create a console handler and set its level to debug
-        ch = logging.StreamHandler()
-        ch.setLevel(logging.DEBUG)
+    def is_debug_enabled(self) -> bool:
+        return self.logger.isEnabledFor(logging.DEBUG)
 
-        # Create a formatter and set the format
-        formatter = logging.Formatter("%(levelname)s - %(message)s")
-        ch.setFormatter(formatter)
+    def log_info(self, text: str, *args):
+        self.logger.info(text, *args)
 
-        # Add the handler to the logger
-        self.logger.addHandler(ch)
-
-    def log_info(self, text: str):
-        self.logger.info(text)
-
-    def log_debug(self, text: str):
-        self.logger.debug(text)
+    def log_debug(self, text: str, *args):
+        self.logger.debug(text, *args)
 
     def log_initialization(self, **kwargs):
         self.logger.info("Starting SDDP")
         for key, var in kwargs.items():
-            self.logger.info(f"{key}: {var}")
+            self.logger.info("%s: %s", key, var)
 
     def log_master_problem(self, iteration, objective_value, x):
-        self.logger.info(f"Iteration {iteration}: {objective_value}")
-        self.logger.debug(f"\t{x}")
+        self.logger.info("Iteration %s: %s", iteration, objective_value)
+        self.logger.debug("\t%s", x)
 
     def log_sub_problem(self, idx, cut_type: str, coefficients, constant):
-        self.logger.debug(f"\t{idx}\t{cut_type}\t{coefficients}\t{constant}")
+        self.logger.debug("\t%s\t%s\t%s\t%s", idx, cut_type, coefficients, constant)
 
     def log_finaliziation(self):
         self.logger.info("Finalizing SDDP")
 
     def log_completion(self, objective_value):
         self.logger.info("SDDP completed")
-        self.logger.info(f"Final objective value: {objective_value}")
+        self.logger.info("Final objective value: %s", objective_value)
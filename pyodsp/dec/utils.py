@@ -1,11 +1,15 @@
-from typing import List, Dict, Tuple
+from typing import TYPE_CHECKING, List, Dict, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 
+import numpy as np
 from pyomo.environ import ConcreteModel, Constraint, ScalarVar
 from pyomo.core.base.constraint import ScalarConstraint
 from pyomo.repn import generate_standard_repn
 
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
 
 def create_directory(filedir: Path) -> None:
     try:
@@ -16,16 +20,28 @@ def create_directory(filedir: Path) -> None:
 
 @dataclass
 class CouplingData:
-    """Coefficients of the variables in the constraint."""
+    """Coupling constraints and the coefficients of the variables in them.
+
+    The coefficients are kept in coordinate format, with one row per constraint
+    and one column per variable.
+    """
 
-    constraint: ScalarConstraint
-    coefficients: Dict[int, float]
+    constraints: List[ScalarConstraint]
+    rows: np.ndarray
+    cols: np.ndarray
+    vals: np.ndarray
     vars: List[ScalarVar]
 
+    def transpose_dot(self, values: np.ndarray) -> np.ndarray:
+        """Product of the transposed coefficient matrix and a vector of row values."""
+        return np.bincount(
+            self.cols, weights=self.vals * values[self.rows], minlength=len(self.vars)
+        )
+
 
 def get_nonzero_coefficients_from_model(
     model: ConcreteModel, vars: List[ScalarVar]
-) -> List[CouplingData]:
+) -> CouplingData:
     """Get the nonzero coefficients of the variables in the constraints.
 
     Args:
@@ -33,57 +49,43 @@ def get_nonzero_coefficients_from_model(
         vars: The variables to get the coefficients of.
 
     Returns:
-        A tuple of the constraints and the coefficients.
+        The constraints containing any of the variables, and their coefficients
+        as a matrix with one row per constraint and one column per variable.
     """
-    coupling_list: List[CouplingData] = []
-    for constraint in model.component_objects(ctype=Constraint):
-        if isinstance(constraint, ScalarConstraint):
-            coupling_data = get_nonzero_coefficients_from_constraint(constraint, vars)
-            if len(coupling_data.coefficients) > 0:
-                coupling_list.append(coupling_data)
-        else:
-            for index in constraint:
-                coupling_data = get_nonzero_coefficients_from_constraint(
-                    constraint[index], vars
-                )
-                if len(coupling_data.coefficients) > 0:
-                    coupling_list.append(coupling_data)
-    return coupling_list
-
-
-def get_nonzero_coefficients_from_constraint(
-    constraint: ScalarConstraint, vars: List[ScalarVar]
-) -> CouplingData:
-    """Get the nonzero coefficients of the variables in the constraint.
-
-    Args:
-        constraint: The constraint.
-        vars: The variables to get the coefficients of.
-
-    Returns:
-        A tuple of the constraint and the coefficients.
-    """
-    repn = generate_standard_repn(constraint.body)
-    all_coefficients = {
-        var.name: coef for var, coef in zip(repn.linear_vars, repn.linear_coefs)
-    }
-    coefficients: Dict[int, float] = {}
-    for i, var in enumerate(vars):
-        if var.name in all_coefficients:
-            coefficients[i] = all_coefficients[var.name]
-    return CouplingData(constraint, coefficients, vars)
-
-
-SparseMatrix = List[Dict[int, float]]
+    positions = {id(var): j for j, var in enumerate(vars)}
+    constraints: List[ScalarConstraint] = []
+    rows: List[int] = []
+    cols: List[int] = []
+    vals: List[float] = []
+    for constraint in model.component_data_objects(ctype=Constraint):
+        repn = generate_standard_repn(constraint.body)
+        found = False
+        for var, coef in zip(repn.linear_vars, repn.linear_coefs):
+            j = positions.get(id(var))
+            if j is None:
+                continue
+            rows.append(len(constraints))
+            cols.append(j)
+            vals.append(coef)
+            found = True
+        if found:
+            constraints.append(constraint)
+    return CouplingData(
+        constraints,
+        np.array(rows, dtype=np.int64),
+        np.array(cols, dtype=np.int64),
+        np.array(vals, dtype=float),
+        vars,
+    )
 
 
 @dataclass
 class LagrangianData:
     """Data for coupling constraints"""
 
-    lbs: List[float | None]
-    matrix: Dict[int, SparseMatrix]
-    ubs: List[float | None]
+    lbs: np.ndarray  # -inf where the constraint has no lower bound
+    matrix: Dict[int, "csr_matrix"]
+    ubs: np.ndarray  # inf where the constraint has no upper bound
     constraints: List[ScalarConstraint]
     vars_dict: Dict[int, List[ScalarVar]]
 
@@ -91,48 +93,59 @@ class LagrangianData:
 def get_nonzero_coefficients_group(
     model: ConcreteModel, vars_dict: Dict[int, List[ScalarVar]]
 ) -> LagrangianData:
-    matrix: Dict[int, SparseMatrix] = {}
-    lbs: List[float | None] = []
-    ubs: List[float | None] = []
-    constraints: List[ScalarConstraint] = []
-    for key in vars_dict.keys():
-        matrix[key] = []
-    for constraint in model.component_objects(ctype=Constraint):
-        if isinstance(constraint, ScalarConstraint):
-            lb, coupling_data, ub = get_nonzero_coefficients_group_from_constraint(
-                constraint, vars_dict
-            )
-            for key, var in coupling_data.items():
-                matrix[key].append(var.coefficients)
-            lbs.append(lb)
-            ubs.append(ub)
-            constraints.append(constraint)
-        else:
-            for index in constraint:
-                lb, coupling_data, ub = get_nonzero_coefficients_group_from_constraint(
-                    constraint[index], vars_dict
-                )
-                for key, var in coupling_data.items():
-                    matrix[key].append(var.coefficients)
-                lbs.append(lb)
-                ubs.append(ub)
-                constraints.append(constraint[index])
-    return LagrangianData(lbs, matrix, ubs, constraints, vars_dict)
-
-
-def get_nonzero_coefficients_group_from_constraint(
-    constraint: ScalarConstraint, vars_dict: Dict[int, List[ScalarVar]]
-) -> Tuple[float | None, Dict[int, CouplingData], float | None]:
-    repn = generate_standard_repn(constraint.body)
-    all_coefficients = {
-        var.name: coef for var, coef in zip(repn.linear_vars, repn.linear_coefs)
+    """Get the coefficients of each group of variables in the constraints.
+
+    Args:
+        model: The Pyomo model.
+        vars_dict: The variables of each group.
+
+    Returns:
+        The bounds of the constraints, and for each group a matrix with one row
+        per constraint and one column per variable of the group.
+    """
+    from scipy.sparse import coo_matrix
+
+    positions: Dict[int, Tuple[int, int]] = {
+        id(var): (key, j)
+        for key, vars in vars_dict.items()
+        for j, var in enumerate(vars)
+    }
+    entries: Dict[int, Tuple[List[int], List[int], List[float]]] = {
+        key: ([], [], []) for key in vars_dict.keys()
     }
-    coupling_data: Dict[int, CouplingData] = {}
-    for key, vars in vars_dict.items():
-        coefficients: Dict[int, float] = {}
-        for i, var in enumerate(vars):
-            if var.name in all_coefficients:
-                coefficients[i] = all_coefficients[var.name]
-        coupling_data[key] = CouplingData(constraint, coefficients, vars)
-
-    return constraint.lb, coupling_data, constraint.ub
+    lbs: List[float] = []
+    ubs: List[float] = []
+    constraints: List[ScalarConstraint] = []
+    for i, constraint in enumerate(model.component_data_objects(ctype=Constraint)):
+        repn = generate_standard_repn(constraint.body)
+        for var, coef in zip(repn.linear_vars, repn.linear_coefs):
+            position = positions.get(id(var))
+            if position is None:
+                continue
+            key, j = position
+            rows, cols, vals = entries[key]
+            rows.append(i)
+            cols.append(j)
+            vals.append(coef)
+        lbs.append(-np.inf if constraint.lb is None else constraint.lb)
+        ubs.append(np.inf if constraint.ub is None else constraint.ub)
+        constraints.append(constraint)
+
+    matrix: Dict[int, "csr_matrix"] = {}
+    for key, (rows, cols, vals) in entries.items():
+        matrix[key] = coo_matrix(
+            (vals, (rows, cols)), shape=(len(constraints), len(vars_dict[key]))
+        ).tocsr()
+    return LagrangianData(
+        np.array(lbs, dtype=float),
+        matrix,
+        np.array(ubs, dtype=float),
+        constraints,
+        vars_dict,
+    )
+
+
+def sparsify(values: np.ndarray, tol: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions and values of the entries whose magnitude exceeds tol."""
+    nonzero = np.flatnonzero(np.abs(values) > tol)
+    return nonzero, values[nonzero]
@@ -0,0 +1,95 @@
+from typing import List
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+ROOT_LOGGER = "pyodsp"
+LOG_FORMAT = "%(levelname)s - %(message)s"
+
+_handler: logging.Handler | None = None
+_listener: logging.handlers.QueueListener | None = None
+
+
+def _stream_handler() -> logging.Handler:
+    handler = logging.StreamHandler()
+    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+def _install(handler: logging.Handler) -> None:
+    global _handler
+    root = logging.getLogger(ROOT_LOGGER)
+    if _handler is not None:
+        root.removeHandler(_handler)
+    root.addHandler(handler)
+    # records stop at the package logger, so that they are emitted exactly once
+    root.propagate = False
+    _handler = handler
+
+
+def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
+    """Returns a logger below the package logger, which owns the single handler.
+
+    Args:
+        name: name of the logger, relative to the package logger
+        level: logging level of this logger
+    """
+    if _handler is None:
+        if os.getenv("PYODSP_LOG_QUEUE"):
+            enable_background_logging()
+        else:
+            _install(_stream_handler())
+    logger = logging.getLogger(f"{ROOT_LOGGER}.{name}")
+    logger.setLevel(level)
+    return logger
+
+
+def enable_background_logging() -> None:
+    """Formats and writes the records on a background thread.
+
+    The logging calls only put the records on a queue, which takes the terminal
+    I/O off the solving threads. Also enabled by the PYODSP_LOG_QUEUE environment
+    variable.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    records: queue.Queue = queue.Queue(-1)
+    _listener = logging.handlers.QueueListener(records, _stream_handler())
+    _install(logging.handlers.QueueHandler(records))
+    _listener.start()
+    # the listener thread is a daemon, drain the queue before the interpreter exits
+    atexit.register(disable_background_logging)
+
+
+def is_background_logging() -> bool:
+    return _listener is not None
+
+
+def disable_background_logging() -> None:
+    """Flushes the queued records and writes the following ones directly."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    _install(_stream_handler())
+
+
+def _after_fork_in_child() -> None:
+    # the listener thread is not inherited by forked workers, write directly
+    global _listener
+    if _listener is not None:
+        _listener = None
+        _install(_stream_handler())
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_handlers() -> List[logging.Handler]:
+    return list(logging.getLogger(ROOT_LOGGER).handlers)
@@ -0,0 +1,104 @@
+from typing import Any, Dict, List
+from pathlib import Path
+import importlib.util
+import threading
+
+Columns = Dict[str, List[Any]]
+
+
+def default_format() -> str:
+    """Parquet when pyarrow is available, CSV otherwise."""
+    if importlib.util.find_spec("pyarrow") is not None:
+        return "parquet"
+    return "csv"
+
+
+class NodeResults:
+    """View of a results sink that tags every row with the id of one node."""
+
+    def __init__(self, sink: "ResultsSink", node_id: Any) -> None:
+        self.sink = sink
+        self.node_id = node_id
+
+    def add(self, table: str, columns: Columns) -> None:
+        self.sink.add(table, self.node_id, columns)
+
+    def is_model_export(self) -> bool:
+        return self.sink.export_model
+
+    def get_model_dir(self) -> Path:
+        return self.sink.filedir / "models" / f"node{self.node_id}"
+
+
+class ResultsSink:
+    """Collects the results of all nodes into one long-format file per table.
+
+    Rows are buffered in memory as columns, and written by write() on a
+    background thread, one file per table with the node id as a column.
+
+    Args:
+        filedir: directory of the result files
+        export_model: whether the solvers also write their models
+        format: 'parquet' or 'csv', by default parquet when pyarrow is available
+    """
+
+    def __init__(
+        self, filedir: Path, export_model: bool = False, format: str | None = None
+    ) -> None:
+        self.filedir = filedir
+        self.export_model = export_model
+        self.format = default_format() if format is None else format
+        if self.format not in ("parquet", "csv"):
+            raise ValueError(f"Unsupported format: {self.format}")
+        self.tables: Dict[str, List[Columns]] = {}
+        self.thread: threading.Thread | None = None
+
+    def for_node(self, node_id: Any) -> NodeResults:
+        return NodeResults(self, node_id)
+
+    def add(self, table: str, node_id: Any, columns: Columns) -> None:
+        num_rows = max((len(values) for values in columns.values()), default=0)
+        if num_rows == 0:
+            return
+        self.tables.setdefault(table, []).append(
+            {"node": [node_id] * num_rows, **columns}
+        )
+
+    def get_tables(self) -> Dict[str, List[Columns]]:
+        return self.tables
+
+    def merge(self, tables: Dict[str, List[Columns]]) -> None:
+        """Appends the rows collected by another sink, e.g. on another rank."""
+        for table, chunks in tables.items():
+            self.tables.setdefault(table, []).extend(chunks)
+
+    def write(self) -> None:
+        """Starts writing the collected tables on a background thread."""
+        # imported here, as the thread may still run while the interpreter exits
+        import pandas as pd
+
+        if self.format == "parquet":
+            import pyarrow  # noqa: F401
+
+        self.wait()
+        tables = self.tables
+        self.tables = {}
+        self.thread = threading.Thread(
+            target=self._write_tables, args=(pd, tables), name="pyodsp-results"
+        )
+        self.thread.start()
+
+    def wait(self) -> None:
+        """Blocks until the last write has finished."""
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _write_tables(self, pd: Any, tables: Dict[str, List[Columns]]) -> None:
+        self.filedir.mkdir(parents=True, exist_ok=True)
+        for table, chunks in tables.items():
+            df = pd.concat([pd.DataFrame(chunk) for chunk in chunks], ignore_index=True)
+            if self.format == "parquet":
+                df.to_parquet(self.filedir / f"{table}.parquet", index=False)
+            else:
+                df.to_csv(self.filedir / f"{table}.csv", index=False)
@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any
 from pathlib import Path
 
-import pandas as pd
+import hashlib
 import pickle
 
 import pyomo.environ as pyo
@@ -11,6 +11,7 @@ from pyomo.repn.standard_repn import generate_standard_repn
 from pyomo.opt import TerminationCondition
 
 from .solver import Solver
+from pyodsp.results import NodeResults
 
 
 @dataclass
@@ -47,6 +48,8 @@ class PyomoSolver(Solver):
         self._infeasible_model = None
         self._unbounded_model = None
         self.model._parent_objective = 0.0
+        if not hasattr(self.model, "_revision"):
+            self.model._revision = 0
 
     def solve(self) -> None:
         """Solve the model."""
@@ -80,6 +83,40 @@ class PyomoSolver(Solver):
     def get_vars(self) -> List[pyo.ScalarVar]:
         return self.vars
 
+    def get_fingerprint(self) -> str:
+        """Hash of the data of the model, as given by the user.
+
+        Covers the original objective, the active constraints, the variable
+        domains and the values of the parameters. Components whose name starts
+        with an underscore are added by the algorithms and are skipped, as are
+        the values the coupling variables are fixed to.
+        """
+        digest = hashlib.sha256()
+
+        def update(*items: Any) -> None:
+            digest.update(repr(items).encode())
+
+        def is_internal(component: Any) -> bool:
+            return component.parent_component().local_name.startswith("_")
+
+        coupling = {id(var) for var in self.vars}
+        update([var.name for var in self.vars])
+        update(str(self.original_objective.expr), self.original_objective.sense)
+        for var in self.model.component_data_objects(pyo.Var, sort=True):
+            if is_internal(var):
+                continue
+            fixed = var.fixed and id(var) not in coupling
+            update(var.name, var.lb, var.ub, var.domain.name, fixed and var.value)
+        for param in self.model.component_data_objects(pyo.Param, sort=True):
+            if not is_internal(param):
+                update(param.name, pyo.value(param, exception=False))
+        for constr in self.model.component_data_objects(
+            pyo.Constraint, active=True, sort=True
+        ):
+            if not is_internal(constr):
+                update(constr.name, str(constr.body), constr.lb, constr.ub)
+        return digest.hexdigest()
+
     def activate_original_objective(self) -> None:
         """Activate the original objective"""
         current_obj = self._get_objective()
@@ -98,6 +135,24 @@ class PyomoSolver(Solver):
         """Get the solution of the model."""
         return [var.value for var in self.vars]
 
+    def get_values(self) -> List[float | None]:
+        """Get the values of all variables of the model."""
+        return [var.value for var in self.model.component_data_objects(pyo.Var)]
+
+    def set_values(self, values: List[float | None]) -> None:
+        """Set the values of all variables of the model, as given by get_values."""
+        for var, value in zip(self.model.component_data_objects(pyo.Var), values):
+            var.set_value(value, skip_validation=True)
+
+    def get_state(self) -> Dict[str, Any]:
+        """Values of all variables and the results of the last solve."""
+        return {"values": self.get_values(), "results": self._results}
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Restores the last solution of a model built the same way."""
+        self.set_values(state["values"])
+        self._results = state["results"]
+
     def is_optimal(self) -> bool:
         """Returns whether the model is optimal."""
         return (
@@ -289,24 +344,32 @@ class PyomoSolver(Solver):
     def get_parent_objective_value(self) -> float:
         return self.model._parent_objective
 
-    def save(self, dir: Path) -> None:
-        """outputs solution to dir"""
-        path = dir / "sol.csv"
-        solution = {}
+    def get_revision(self) -> int:
+        """Counter of structural changes made to the model by other algorithms."""
+        return self.model._revision
+
+    def bump_revision(self) -> None:
+        self.model._revision += 1
+
+    def set_revision(self, revision: int) -> None:
+        """Aligns the counter of a copy of the model with that of the original."""
+        self.model._revision = revision
+
+    def save(self, results: NodeResults) -> None:
+        """outputs solution to results"""
+        names: List[str] = []
+        values: List[float | None] = []
         for v in self.model.component_objects(pyo.Var, active=True):
             for index in v:
                 if index is None:
-                    varname = str(v)
+                    names.append(str(v))
                 else:
-                    varname = f"{v}_{index}"
-                solution[varname] = v[index].value
-
-        # Convert the solution to a DataFrame
-        sol = pd.DataFrame(list(solution.items()), columns=["var", "val"])
-
-        sol.to_csv(path, sep="\t", index=False)
+                    names.append(f"{v}_{index}")
+                values.append(v[index].value)
+        results.add("solution", {"var": names, "val": values})
 
-        self.save_model(dir, format="lp")
+        if results.is_model_export():
+            self.save_model(results.get_model_dir(), format="lp")
 
     def save_model(self, dir: Path, format: str = "lp") -> None:
         """Save the Pyomo concrete model to a directory.
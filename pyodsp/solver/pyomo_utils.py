@@ -1,6 +1,7 @@
 from typing import List
 
-from pyomo.environ import Var, Objective, ScalarVar
+import numpy as np
+from pyomo.environ import Var, Objective, ScalarVar, Param, RangeSet
 
 from pyodsp.solver.pyomo_solver import PyomoSolver
 
@@ -10,6 +11,7 @@ def add_linear_terms_to_objective(
 ) -> None:
     solver.original_objective.deactivate()
     update_linear_terms_in_objective(solver, coeffs, vars)
+    solver.bump_revision()
 
 
 def update_linear_terms_in_objective(
@@ -27,6 +29,33 @@ def update_linear_terms_in_objective(
     )
 
 
+def set_linear_coefficients_in_objective(
+    solver: PyomoSolver, coeffs: List[float] | np.ndarray, vars: Var | List[ScalarVar]
+) -> None:
+    """Set the coefficients of linear terms added to the original objective.
+
+    The terms are built once with mutable coefficients; later calls only
+    change the values of the coefficients that differ.
+    """
+    model = solver.model
+    values = np.asarray(coeffs, dtype=float)
+    if model.component("_mod_coeffs") is None:
+        model._mod_coeffs = Param(
+            RangeSet(0, len(values) - 1), mutable=True, initialize=0.0
+        )
+        model._mod_coeff_values = np.zeros(len(values))
+        modified_expr = solver.original_objective.expr + sum(
+            model._mod_coeffs[i] * vars[i] for i in range(len(values))
+        )
+        model._mod_obj = Objective(
+            expr=modified_expr, sense=solver.original_objective.sense
+        )
+
+    for i in np.flatnonzero(values != model._mod_coeff_values).tolist():
+        model._mod_coeffs[i] = values[i]
+    model._mod_coeff_values = values.copy()
+
+
 def add_terms_to_objective(solver: PyomoSolver, vars: Var) -> None:
     coeffs = [1.0 for _ in range(len(vars))]
     add_linear_terms_to_objective(solver, coeffs, vars)
@@ -53,6 +82,7 @@ def update_quad_terms_in_objective(
     solver.model._mod_quad_obj = Objective(
         expr=modified_expr, sense=solver.original_objective.sense
     )
+    solver.bump_revision()
 
 
 def add_quad_terms_to_objective(
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List
-from pathlib import Path
+
+from pyodsp.results import NodeResults
 
 
 class Solver(ABC):
@@ -70,6 +71,6 @@ class Solver(ABC):
         return []
 
     @abstractmethod
-    def save(self, dir: Path) -> None:
-        """outputs solution to dir"""
+    def save(self, results: NodeResults) -> None:
+        """outputs solution to results"""
         pass
@@ -0,0 +1,114 @@
+from typing import Any, Dict, List
+from pathlib import Path
+import json
+import os
+import threading
+import time
+
+
+class Span:
+    """Times the enclosed block and records it as a complete trace event."""
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: Dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self) -> "Span":
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = time.time()
+        self.tracer.add_event(
+            {
+                "name": self.name,
+                "cat": self.cat,
+                "ph": "X",
+                "ts": self.start * 1e6,
+                "dur": (end - self.start) * 1e6,
+                "pid": self.tracer.pid,
+                "tid": threading.get_ident(),
+                "args": self.args,
+            }
+        )
+
+
+class _NullSpan:
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects timed spans in the Chrome trace event format.
+
+    Tracing is off unless enabled, or the PYODSP_TRACE environment variable is set.
+    While it is off, span() costs a single attribute check.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = bool(os.getenv("PYODSP_TRACE"))
+        self.pid = os.getpid()
+        self.events: List[Dict[str, Any]] = []
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def is_enabled(self) -> bool:
+        return self.enabled
+
+    def span(self, name: str, cat: str = "pyodsp", **args) -> Span | _NullSpan:
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, cat, args)
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+
+    def add_events(self, events: List[Dict[str, Any]]) -> None:
+        """Adds the events recorded by another process, e.g. a worker."""
+        self.events.extend(events)
+
+    def set_process_name(self, name: str) -> None:
+        if not self.enabled:
+            return
+        self.add_event(
+            {"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": name}}
+        )
+
+    def get_events(self) -> List[Dict[str, Any]]:
+        return self.events
+
+    def clear(self) -> None:
+        self.events = []
+
+    def save(self, path: Path, events: List[Dict[str, Any]] | None = None) -> None:
+        """Writes the events (by default those of this process) as a trace file."""
+        if not self.enabled:
+            return
+        if events is None:
+            events = self.events
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def span(name: str, cat: str = "pyodsp", **args) -> Span | _NullSpan:
+    """Context manager timing a block on the process-wide tracer."""
+    return _tracer.span(name, cat, **args)
@@ -11,6 +11,7 @@ setup(
         "numpy",
         "pandas",
         "Pyomo",
+        "scipy",
         "pytest",
     ],
 )
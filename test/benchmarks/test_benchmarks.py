@@ -0,0 +1,54 @@
+import json
+import subprocess
+
+
+def test_farmer_small(tmp_path):
+    output = tmp_path / "results.json"
+    baseline = tmp_path / "baseline.json"
+    command = [
+        "python",
+        "benchmarks/run.py",
+        "--cases",
+        "farmer",
+        "--scales",
+        "small",
+        "--output",
+        str(output),
+        "--baseline",
+        str(baseline),
+    ]
+    result = subprocess.run(
+        command + ["--update-baseline"], capture_output=True, text=True
+    )
+    assert result.returncode == 0
+    with open(output) as f:
+        results = json.load(f)["results"]
+    assert results[0]["case"] == "farmer"
+    assert results[0]["iterations"] > 0
+
+    result = subprocess.run(
+        command + ["--tolerance", "1000"], capture_output=True, text=True
+    )
+    assert result.returncode == 0
+
+
+def test_generated_small(tmp_path):
+    result = subprocess.run(
+        [
+            "python",
+            "benchmarks/run.py",
+            "--cases",
+            "two_stage",
+            "block_angular",
+            "lattice",
+            "--scales",
+            "small",
+            "--output",
+            str(tmp_path / "results.json"),
+            "--baseline",
+            str(tmp_path / "baseline.json"),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0
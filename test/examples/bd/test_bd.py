@@ -41,6 +41,26 @@ def test_optimality_mpi():
         assert result.returncode == 0
 
 
+def test_optimality_parallel():
+    for solver in solvers:
+        result = subprocess.run(
+            ["python", "examples/bd/optimality_parallel.py", "--solver", solver],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+
+
+def test_aircon_parallel():
+    for solver in solvers:
+        result = subprocess.run(
+            ["python", "examples/aircon/bd_parallel.py", "--solver", solver],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+
+
 def test_aircon():
     for solver in solvers:
         result = subprocess.run(
@@ -59,3 +79,23 @@ def test_sddp():
             text=True,
         )
         assert result.returncode == 0
+
+
+def test_sddp_parallel():
+    for solver in solvers:
+        result = subprocess.run(
+            ["python", "examples/aircon/sddp_parallel.py", "--solver", solver],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+
+
+def test_optimality_resume():
+    for solver in solvers:
+        result = subprocess.run(
+            ["python", "examples/bd/optimality_resume.py", "--solver", solver],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
@@ -51,6 +51,24 @@ def test_equality_mpi():
         assert result.returncode == 0
 
 
+def test_equality_factory_mpi():
+    for solver in solvers:
+        result = subprocess.run(
+            [
+                "mpiexec",
+                "-n",
+                "2",
+                "python",
+                "examples/dd/equality_factory_mpi.py",
+                "--solver",
+                solver,
+            ],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+
+
 def test_equality_mip():
     for solver in solvers:
         result = subprocess.run(
@@ -61,6 +79,16 @@ def test_equality_mip():
         assert result.returncode == 0
 
 
+def test_equality_ergodic():
+    for solver in solvers:
+        result = subprocess.run(
+            ["python", "examples/dd/equality_ergodic.py", "--solver", solver],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+
+
 def test_equality_mip_mpi():
     for solver in solvers:
         result = subprocess.run(
@@ -77,3 +105,43 @@ def test_equality_mip_mpi():
             text=True,
         )
         assert result.returncode == 0
+
+
+def test_equality_mip_incremental():
+    for solver in solvers:
+        result = subprocess.run(
+            ["python", "examples/dd/equality_mip_incremental.py", "--solver", solver],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+
+
+def test_equality_mip_parallel():
+    for solver in solvers:
+        result = subprocess.run(
+            ["python", "examples/dd/equality_mip_parallel.py", "--solver", solver],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+
+
+def test_equality_resume():
+    for solver in solvers:
+        result = subprocess.run(
+            ["python", "examples/dd/equality_resume.py", "--solver", solver],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+
+
+def test_equality_library():
+    for solver in solvers:
+        result = subprocess.run(
+            ["python", "examples/dd/equality_library.py", "--solver", solver],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
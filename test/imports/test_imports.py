@@ -0,0 +1,55 @@
+import json
+import subprocess
+
+# seconds spent importing pyodsp on top of pyomo and numpy
+IMPORT_BUDGET = 0.5
+
+HEAVY_MODULES = ["pandas", "scipy.stats", "scipy.sparse"]
+
+SCRIPT = """
+import json, sys, time
+import numpy, pyomo.environ
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def import_module(module: str):
+    result = subprocess.run(
+        ["python", "-c", SCRIPT.format(module=module)],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_bd_import():
+    report = import_module("pyodsp.dec.bd.run")
+    for module in HEAVY_MODULES:
+        assert module not in report["modules"]
+    assert report["elapsed"] < IMPORT_BUDGET
+
+
+def test_sddp_import():
+    report = import_module("pyodsp.dec.sddp.run")
+    for module in HEAVY_MODULES:
+        assert module not in report["modules"]
+    assert report["elapsed"] < IMPORT_BUDGET
+
+
+def test_dd_import():
+    # the coupling matrices are built with scipy.sparse at run time
+    report = import_module("pyodsp.dec.dd.run")
+    for module in HEAVY_MODULES:
+        assert module not in report["modules"]
+    assert report["elapsed"] < IMPORT_BUDGET
+
+
+def test_dd_leaf_import():
+    report = import_module("pyodsp.dec.dd.alg_leaf_pyomo")
+    for module in HEAVY_MODULES:
+        assert module not in report["modules"]
+    assert report["elapsed"] < IMPORT_BUDGET